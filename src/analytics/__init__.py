@@ -0,0 +1,17 @@
+"""
+Analytical helpers built on top of the synced Oura database.
+"""
+
+from .duckdb_mirror import DuckDBMirror, update_mirror
+from .frames import iter_arrays, load_array, load_arrow, load_frame
+
+__all__ = [
+    # DuckDB
+    "DuckDBMirror",
+    "update_mirror",
+    # Frames
+    "iter_arrays",
+    "load_array",
+    "load_arrow",
+    "load_frame",
+]
@@ -0,0 +1,277 @@
+"""
+DuckDB analytical mirror of the Oura database.
+
+SQLite stays the system of record; this keeps a columnar copy of the synced
+model tables in an embedded DuckDB file for heavy cross-table aggregations.
+The mirror is updated incrementally from the keys a sync reports as
+inserted or updated, so refreshing it costs only the changed rows.
+
+DuckDB is optional: install it with ``pip install duckdb``.
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, Union
+
+from peewee import (
+    AutoField,
+    BooleanField,
+    DateField,
+    DateTimeField,
+    Field,
+    FloatField,
+    ForeignKeyField,
+    IntegerField,
+    chunked,
+)
+
+from src.models import (
+    BaseModel,
+    DailyActivity,
+    DailyReadiness,
+    DailySleep,
+    DailySpO2,
+    DailyStress,
+    SleepPeriod,
+    Workout,
+)
+from src.models.database import project_root
+from src.sync.writer import MAX_VARIABLES, WriteResult
+
+try:
+    import duckdb
+except ImportError:  # pragma: no cover - optional dependency
+    duckdb = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = project_root / "oura_analytics.duckdb"
+
+# Mirrored models and the key their sync results are reported by
+MIRRORED_MODELS: Dict[Type[BaseModel], Optional[Field]] = {
+    DailyActivity: DailyActivity.activity_summary_id,
+    DailySleep: DailySleep.sleep_summary_id,
+    DailyReadiness: None,
+    DailySpO2: None,
+    DailyStress: None,
+    SleepPeriod: None,
+    Workout: None,
+}
+
+
+def _column_type(field: Field) -> str:
+    """Map a peewee field to a DuckDB column type."""
+    if field.name == "day":
+        return "DATE"  # Some models store `day` as text; normalize it here
+    if isinstance(field, ForeignKeyField):
+        return _column_type(field.rel_field)
+    if isinstance(field, (AutoField, IntegerField)):
+        return "BIGINT"
+    if isinstance(field, BooleanField):
+        return "BOOLEAN"
+    if isinstance(field, FloatField):
+        return "DOUBLE"
+    if isinstance(field, DateTimeField):
+        return "TIMESTAMPTZ"
+    if isinstance(field, DateField):
+        return "DATE"
+    return "VARCHAR"
+
+
+class DuckDBMirror:
+    """Columnar copy of the synced tables with a small query API."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_PATH):
+        """Open (or create) the mirror.
+
+        Args:
+            path: DuckDB database file, or ``":memory:"``.
+        """
+        if duckdb is None:
+            raise ImportError(
+                "The DuckDB mirror requires the duckdb package: pip install duckdb"
+            )
+        self.conn = duckdb.connect(str(path))
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "DuckDBMirror":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def _ensure_table(self, model: Type[BaseModel]) -> bool:
+        """Create the mirror table for a model, or add columns it is missing.
+
+        Mirrors created before a model gained a field get the new column
+        added, and need a full copy to fill it.
+
+        Returns:
+            True if the table was created or altered by this call.
+        """
+        table = model._meta.table_name
+        existing = {
+            name
+            for (name,) in self.conn.execute(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_name = ?",
+                [table],
+            ).fetchall()
+        }
+        if not existing:
+            columns = ", ".join(
+                f'"{field.column_name}" {_column_type(field)}'
+                for field in model._meta.sorted_fields
+            )
+            self.conn.execute(f'CREATE TABLE "{table}" ({columns})')
+            return True
+
+        missing = [
+            field
+            for field in model._meta.sorted_fields
+            if field.column_name not in existing
+        ]
+        for field in missing:
+            logger.info(f"Adding column {field.column_name} to mirrored {table}")
+            self.conn.execute(
+                f'ALTER TABLE "{table}" ADD COLUMN '
+                f'"{field.column_name}" {_column_type(field)}'
+            )
+        return bool(missing)
+
+    def _insert(self, model: Type[BaseModel], rows: Sequence[Tuple]) -> None:
+        if not rows:
+            return
+        fields = model._meta.sorted_fields
+        columns = ", ".join(f'"{field.column_name}"' for field in fields)
+        placeholders = ", ".join("?" for _ in fields)
+        self.conn.executemany(
+            f'INSERT INTO "{model._meta.table_name}" ({columns}) '
+            f"VALUES ({placeholders})",
+            [list(row) for row in rows],
+        )
+
+    def _delete(
+        self, model: Type[BaseModel], key_field: Field, keys: List[Any]
+    ) -> None:
+        for batch in chunked(keys, MAX_VARIABLES):
+            self.conn.execute(
+                f'DELETE FROM "{model._meta.table_name}" '
+                f'WHERE "{key_field.column_name}" IN (SELECT unnest(?))',
+                [list(batch)],
+            )
+
+    def refresh(
+        self,
+        model: Type[BaseModel],
+        keys: Optional[List[Any]] = None,
+        deleted: Optional[List[Any]] = None,
+    ) -> int:
+        """Copy rows of a model from SQLite into the mirror.
+
+        Args:
+            model: Mirrored model.
+            keys: Values of the model's sync key to refresh. Refreshes the
+                whole table when omitted.
+            deleted: Values of the sync key to remove from the mirror, e.g.
+                of rows a sync deleted as gone upstream (`WriteResult.deleted`).
+
+        Returns:
+            Number of rows copied.
+        """
+        key_field = MIRRORED_MODELS.get(model) or model._meta.primary_key
+        table = model._meta.table_name
+        reshaped = self._ensure_table(model)
+        copied = 0
+
+        self.conn.execute("BEGIN TRANSACTION")
+        try:
+            if keys is None or reshaped:
+                self.conn.execute(f'DELETE FROM "{table}"')
+                rows = list(model.select().tuples())
+                self._insert(model, rows)
+                copied = len(rows)
+            else:
+                if deleted:
+                    self._delete(model, key_field, deleted)
+                for batch in chunked(keys, MAX_VARIABLES):
+                    self._delete(model, key_field, batch)
+                    rows = list(model.select().where(key_field.in_(batch)).tuples())
+                    self._insert(model, rows)
+                    copied += len(rows)
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        logger.info(f"Mirrored {copied} rows of {table} to DuckDB")
+        return copied
+
+    def apply(self, results: Dict[str, WriteResult]) -> int:
+        """Mirror the rows a sync inserted, updated or deleted.
+
+        Args:
+            results: Write results keyed by table name, as returned by
+                `copy_daily_data`.
+
+        Returns:
+            Number of rows copied.
+        """
+        copied = 0
+        for model in MIRRORED_MODELS:
+            result = results.get(model._meta.table_name)
+            if result is not None and (result.changed or result.deleted):
+                copied += self.refresh(model, result.changed, result.deleted)
+            elif self._ensure_table(model):
+                copied += self.refresh(model)
+        return copied
+
+    def query(self, sql: str, params: Optional[Sequence[Any]] = None) -> List[Tuple]:
+        """Run an arbitrary read query against the mirror."""
+        return self.conn.execute(sql, params or []).fetchall()
+
+    def daily_scores(
+        self, start_day: Optional[str] = None, end_day: Optional[str] = None
+    ) -> List[Tuple]:
+        """Sleep, activity and readiness scores per day.
+
+        Returns:
+            (day, sleep_score, activity_score, readiness_score) rows.
+        """
+        return self.query(
+            """
+            SELECT day, s.score, a.score, r.score
+            FROM daily_sleep s
+            FULL JOIN daily_activities a USING (day)
+            FULL JOIN daily_readiness r USING (day)
+            WHERE day BETWEEN coalesce(?::DATE, DATE '0001-01-01')
+                          AND coalesce(?::DATE, DATE '9999-12-31')
+            ORDER BY day
+            """,
+            [start_day, end_day],
+        )
+
+    def score_correlations(self) -> Dict[str, Optional[float]]:
+        """Pearson correlation between the daily scores over all history."""
+        row = self.query("""
+            SELECT corr(s.score, a.score), corr(s.score, r.score),
+                   corr(a.score, r.score)
+            FROM daily_sleep s
+            JOIN daily_activities a USING (day)
+            JOIN daily_readiness r USING (day)
+            """)[0]
+        return {
+            "sleep_activity": row[0],
+            "sleep_readiness": row[1],
+            "activity_readiness": row[2],
+        }
+
+
+def update_mirror(
+    results: Dict[str, WriteResult], path: Union[str, Path] = DEFAULT_PATH
+) -> int:
+    """Apply one sync's changes to the mirror at `path`."""
+    with DuckDBMirror(path) as mirror:
+        return mirror.apply(results)
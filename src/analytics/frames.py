@@ -0,0 +1,290 @@
+"""
+Column-chunked loaders from model tables into NumPy, Arrow and pandas.
+
+Rows are read straight from the SQLite cursor into NumPy structured arrays,
+one chunk at a time, without building model instances or dicts. Dates and
+timestamps are converted to integers by SQLite itself, so they land in
+``datetime64`` columns without parsing a Python `datetime` per value.
+Column projection and `where` filters are part of the SQL query.
+
+    steps = load_array(DailyActivity, "day", "steps", start=date(2020, 1, 1))
+    frame = load_frame(SleepHeartRate, "timestamp", "bpm", start=date(2024, 1, 1))
+
+Column types:
+
+- integers become ``int64``, or ``float64`` with NaN when the field is
+  nullable; booleans become ``bool`` likewise;
+- floats become ``float64`` with NaN for nulls;
+- dates (and the text ``day`` columns) become ``datetime64[D]`` and
+  timestamps ``datetime64[ms]`` in UTC, with NaT for nulls;
+- everything else is an object column of Python values.
+
+Sample models are read across their hot table and monthly partitions.
+NumPy is required (``pip install numpy``); Arrow tables need pyarrow and
+frames need pandas.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Iterator, List, Optional, Sequence, Tuple, Type
+
+from peewee import (
+    AutoField,
+    BooleanField,
+    DateField,
+    DateTimeField,
+    Expression,
+    Field,
+    FloatField,
+    ForeignKeyField,
+    IntegerField,
+    Model,
+    fn,
+)
+
+from src.models import BaseModel
+from src.sync.partitions import SAMPLE_MODELS, partition_model, partitions, retarget
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+try:
+    import pandas as pd
+except ImportError:  # pragma: no cover - optional dependency
+    pd = None
+
+# Rows per chunk read from the cursor
+CHUNK_ROWS = 65536
+
+# int64 value NumPy reads as NaT
+_NAT = -(2**63)
+
+# Days between the Julian day epoch and 1970-01-01
+_UNIX_EPOCH_JULIAN_DAY = 2440587.5
+
+
+def _require(module: Any, package: str) -> None:
+    if module is None:
+        raise ImportError(
+            f"This loader requires the {package} package: pip install {package}"
+        )
+
+
+def _target(field: Field) -> Field:
+    return field.rel_field if isinstance(field, ForeignKeyField) else field
+
+
+def _dtype(field: Field) -> str:
+    """NumPy dtype of a field's column."""
+    target = _target(field)
+    if isinstance(target, DateTimeField):
+        return "M8[ms]"
+    if field.name == "day" or isinstance(target, DateField):
+        return "M8[D]"
+    if isinstance(target, BooleanField):
+        return "f8" if field.null else "?"
+    if isinstance(target, (AutoField, IntegerField)):
+        return "f8" if field.null else "i8"
+    if isinstance(target, FloatField):
+        return "f8"
+    return "O"
+
+
+def _select(field: Field, column: Field) -> Any:
+    """Expression reading `column` (the field, or its partition copy) as its dtype."""
+    kind = _dtype(field)
+    if kind == "M8[D]":
+        days = (fn.julianday(column) - _UNIX_EPOCH_JULIAN_DAY).cast("INTEGER")
+        return fn.COALESCE(days, _NAT).alias(field.column_name)
+    if kind == "M8[ms]":
+        # Seconds and milliseconds since the epoch, after converting to UTC
+        millis = fn.strftime("%s", column).cast("INTEGER") * 1000 + fn.substr(
+            fn.strftime("%f", column), 4
+        ).cast("INTEGER")
+        return fn.COALESCE(millis, _NAT).alias(field.column_name)
+    return column.alias(field.column_name)
+
+
+def _fields(model: Type[Model], columns: Sequence[str]) -> List[Field]:
+    if not columns:
+        return list(model._meta.sorted_fields)
+    fields = []
+    for name in columns:
+        field = model._meta.fields.get(name) or model._meta.columns.get(name)
+        if field is None:
+            raise ValueError(f"{model.__name__} has no column {name!r}")
+        fields.append(field)
+    return fields
+
+
+def _time_field(model: Type[Model]) -> Field:
+    """Column a model's date range is applied to."""
+    for name in ("day", "timestamp", "start_datetime"):
+        if name in model._meta.fields:
+            return model._meta.fields[name]
+    raise ValueError(f"{model.__name__} has no date or time column")
+
+
+def _range(
+    field: Field, start: Optional[date], end: Optional[date]
+) -> Optional[Expression]:
+    """Filter for `start` to `end` inclusive, in UTC days for timestamps."""
+    bounds = []
+    if isinstance(field, DateTimeField):
+        if start:
+            bounds.append(
+                field >= datetime.combine(start, datetime.min.time(), timezone.utc)
+            )
+        if end:
+            bounds.append(
+                field
+                < datetime.combine(
+                    end + timedelta(days=1), datetime.min.time(), timezone.utc
+                )
+            )
+    else:
+        if start:
+            bounds.append(field >= start)
+        if end:
+            bounds.append(field <= end)
+    condition = None
+    for bound in bounds:
+        condition = bound if condition is None else condition & bound
+    return condition
+
+
+def _query(
+    model: Type[BaseModel],
+    fields: List[Field],
+    where: Optional[Expression],
+    start: Optional[date],
+    end: Optional[date],
+) -> Tuple[str, List[Any]]:
+    """SQL reading the fields of the rows selected by `where` and the range."""
+    time_field = _time_field(model) if start or end else None
+    condition = where
+    if time_field is not None:
+        span = _range(time_field, start, end)
+        condition = span if condition is None else condition & span
+
+    sources: List[Type[Model]] = [model]
+    if model in SAMPLE_MODELS:
+        sources = [
+            partition_model(model, p.month)
+            for p in partitions(
+                model,
+                start and datetime.combine(start, datetime.min.time()),
+                end and datetime.combine(end, datetime.min.time()),
+            )
+        ] + sources
+
+    query = None
+    for source in sources:
+        part = source.select(
+            *[
+                _select(field, source._meta.columns[field.column_name])
+                for field in fields
+            ]
+        )
+        if condition is not None:
+            part = part.where(
+                condition if source is model else retarget(condition, source)
+            )
+        query = part if query is None else query + part
+    return query.sql()
+
+
+def iter_arrays(
+    model: Type[BaseModel],
+    *columns: str,
+    where: Optional[Expression] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    chunk_rows: int = CHUNK_ROWS,
+) -> Iterator[Any]:
+    """Read a model table as NumPy structured arrays of up to `chunk_rows` rows.
+
+    Args:
+        model: Model to read.
+        columns: Field or column names to load, in order; all if omitted.
+        where: Peewee filter expression on the model's fields.
+        start: First day to load, matched against the model's ``day``,
+            ``timestamp`` or ``start_datetime`` column.
+        end: Last day to load, inclusive.
+        chunk_rows: Rows per array.
+    """
+    _require(np, "numpy")
+    fields = _fields(model, columns)
+    dtype = np.dtype([(field.column_name, _dtype(field)) for field in fields])
+    sql, params = _query(model, fields, where, start, end)
+    cursor = model._meta.database.execute_sql(sql, params)
+    while rows := cursor.fetchmany(chunk_rows):
+        yield np.array(rows, dtype=dtype)
+
+
+def load_array(model: Type[BaseModel], *columns: str, **kwargs: Any) -> Any:
+    """Read a model table into one NumPy structured array.
+
+    Takes the same arguments as `iter_arrays`.
+    """
+    _require(np, "numpy")
+    chunks = list(iter_arrays(model, *columns, **kwargs))
+    if not chunks:
+        fields = _fields(model, columns)
+        return np.empty(0, dtype=[(f.column_name, _dtype(f)) for f in fields])
+    return chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+
+
+def _arrow_column(values: Any) -> Any:
+    if values.dtype.kind == "M":
+        column = pa.array(values, mask=np.isnat(values))
+        if pa.types.is_timestamp(column.type):
+            column = column.cast(pa.timestamp(column.type.unit, tz="UTC"))
+        return column
+    return pa.array(values, from_pandas=values.dtype.kind == "f")
+
+
+def load_arrow(model: Type[BaseModel], *columns: str, **kwargs: Any) -> Any:
+    """Read a model table into a pyarrow Table, one record batch per chunk.
+
+    Takes the same arguments as `iter_arrays`. NaN and NaT become nulls,
+    dates are ``date32`` and timestamps are UTC.
+    """
+    _require(pa, "pyarrow")
+    batches = [
+        pa.RecordBatch.from_arrays(
+            [_arrow_column(chunk[name]) for name in chunk.dtype.names],
+            names=list(chunk.dtype.names),
+        )
+        for chunk in iter_arrays(model, *columns, **kwargs)
+    ]
+    if not batches:
+        empty = load_array(model, *columns, **kwargs)
+        return pa.table(
+            {name: _arrow_column(empty[name]) for name in empty.dtype.names}
+        )
+    return pa.Table.from_batches(batches)
+
+
+def load_frame(model: Type[BaseModel], *columns: str, **kwargs: Any) -> Any:
+    """Read a model table into a pandas DataFrame.
+
+    Takes the same arguments as `iter_arrays`. Goes through Arrow when
+    pyarrow is installed; otherwise the frame is built from the NumPy
+    columns, with timestamps localized to UTC.
+    """
+    _require(pd, "pandas")
+    if pa is not None:
+        return load_arrow(model, *columns, **kwargs).to_pandas()
+    array = load_array(model, *columns, **kwargs)
+    frame = pd.DataFrame({name: array[name] for name in array.dtype.names})
+    for name in array.dtype.names:
+        if array.dtype[name] == np.dtype("M8[ms]"):
+            frame[name] = frame[name].dt.tz_localize("UTC")
+    return frame
@@ -5,12 +5,52 @@ Oura Ring API wrapper that loads API key from .env file.
 import logging
 import os
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple, TypedDict, Union
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypedDict, Union
 
 import requests
 from dotenv import load_dotenv
 from oura_ring import OuraClient
 
+from .archive import ArchiveClient, ResponseArchive
+from .coalescing import RequestCoalescer
+from .normalizers import (
+    format_utc,
+    normalize_daily_activity,
+    normalize_daily_readiness,
+    normalize_daily_sleep,
+    normalize_daily_spo2,
+    normalize_daily_stress,
+    normalize_heart_rate,
+    normalize_hrv,
+    normalize_personal_info,
+    normalize_ring_configuration,
+    normalize_sleep_period,
+    normalize_workout,
+)
+from .parallel import PagePool, RawPage
+from .ratelimit import MAX_RATE_LIMIT_RETRIES, SharedRateLimiter
+from .timeseries import TimeSeries
+from .types import (
+    ActivityContributorDict,
+    ActivitySummaryDict,
+    DailySpO2Dict,
+    DailyStressDict,
+    HeartRateDict,
+    HRVDict,
+    PersonalInfoDict,
+    ReadinessContributorDict,
+    ReadinessSummaryDict,
+    SleepContributorDict,
+    SleepPeriodDict,
+    SleepPeriodDocumentDict,
+    SleepSeriesDict,
+    SleepSummaryDict,
+    SpO2SampleDict,
+    StressSampleDict,
+    WorkoutDict,
+)
+
 # Configure logging
 logging.basicConfig(
     level=logging.DEBUG,
@@ -20,208 +60,154 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-class PersonalInfoDict(TypedDict):
-    """Type definition for personal info response."""
-
-    personal_info_id: str
-    age: Optional[int]
-    weight: Optional[float]
-    height: Optional[float]
-    biological_sex: Optional[str]
-    email: Optional[str]
-
-
-class SleepContributorDict(TypedDict):
-    """Type definition for sleep contributor response."""
-
-    deep_sleep: Optional[int]
-    efficiency: Optional[int]
-    latency: Optional[int]
-    rem_sleep: Optional[int]
-    restfulness: Optional[int]
-    timing: Optional[int]
-    total_sleep: Optional[int]
-
-
-class SleepPeriodDict(TypedDict):
-    """Type definition for sleep period response."""
-
-    sleep_period_id: str
-    start_datetime: datetime
-    end_datetime: datetime
-    total_sleep_duration: Optional[int]
-    awake_time: Optional[int]
-    light_sleep_duration: Optional[int]
-    rem_sleep_duration: Optional[int]
-    deep_sleep_duration: Optional[int]
-    restless_periods: Optional[int]
-    average_heart_rate: Optional[int]
-    lowest_heart_rate: Optional[int]
-    average_hrv: Optional[int]
-    temperature_delta: Optional[float]
-    bedtime_start: Optional[datetime]
-    bedtime_end: Optional[datetime]
-    readiness_score_delta: Optional[int]
-
-
-class SleepSummaryDict(TypedDict):
-    """Type definition for sleep summary response."""
-
-    sleep_summary_id: str
-    day: str
-    score: Optional[int]
-    timestamp: datetime
-    contributors: Optional[SleepContributorDict]
-    periods: List[SleepPeriodDict]
-
-
-class ActivityContributorDict(TypedDict):
-    """Type definition for activity contributor response."""
-
-    meet_daily_targets: Optional[int]
-    move_every_hour: Optional[int]
-    recovery_time: Optional[int]
-    stay_active: Optional[int]
-    training_frequency: Optional[int]
-    training_volume: Optional[int]
-
-
-class ActivitySummaryDict(TypedDict):
-    """Type definition for activity summary response."""
-
-    activity_summary_id: str
-    day: str
-    score: Optional[int]
-    timestamp: datetime
-    active_calories: Optional[int]
-    total_calories: Optional[int]
-    steps: Optional[int]
-    equivalent_walking_distance: Optional[int]
-    inactivity_alerts: Optional[int]
-    non_wear_time: Optional[int]
-    resting_time: Optional[int]
-    meters_to_target: Optional[int]
-    target_calories: Optional[int]
-    target_meters: Optional[int]
-    sedentary_time: Optional[int]
-    contributors: Optional[ActivityContributorDict]
-
-
-class ReadinessContributorDict(TypedDict):
-    """Type definition for readiness contributor response."""
-
-    activity_balance: Optional[int]
-    body_temperature: Optional[int]
-    hrv_balance: Optional[int]
-    previous_day_activity: Optional[int]
-    previous_night: Optional[int]
-    recovery_index: Optional[int]
-    resting_heart_rate: Optional[int]
-    sleep_balance: Optional[int]
-
-
-class ReadinessSummaryDict(TypedDict):
-    """Type definition for readiness summary response."""
-
-    readiness_summary_id: str
-    day: str
-    score: Optional[int]
-    timestamp: datetime
-    contributors: Optional[ReadinessContributorDict]
-
-
-class HeartRateDict(TypedDict):
-    """Type definition for heart rate response."""
-
-    sleep_hr_id: int
-    timestamp: datetime
-    bpm: Optional[int]
-
-
-class HRVDict(TypedDict):
-    """Type definition for HRV response."""
-
-    sleep_hrv_id: int
-    timestamp: datetime
-    rmssd: Optional[int]
-
-
-class WorkoutDict(TypedDict):
-    """Type definition for workout response."""
-
-    workout_id: str
-    activity: str
-    calories: Optional[int]
-    day: str
-    distance: Optional[float]
-    start_datetime: datetime
-    end_datetime: datetime
-    intensity: Optional[str]
-    label: Optional[str]
-    source: str
-    average_heart_rate: Optional[int]
-    max_heart_rate: Optional[int]
-    movement_speed: Optional[float]
-    training_energy: Optional[int]
-    training_time: Optional[int]
-
-
-class DailySpO2Dict(TypedDict):
-    """Type definition for daily SpO2 response."""
-
-    daily_spo2_id: str
-    day: str
-    timestamp: datetime
-    average: Optional[float]
-    breathing_disturbance_index: Optional[int]
-
-
-class DailyStressDict(TypedDict):
-    """Type definition for daily stress response."""
-
-    daily_stress_id: str
-    day: str
-    timestamp: datetime
-    stress_high: Optional[int]
-    recovery_high: Optional[int]
-    day_summary: Optional[str]
+def _is_sleep_sample(hr: Dict[str, Any]) -> bool:
+    return hr.get("source") == "sleep" and bool(hr.get("timestamp"))
 
 
-class SpO2SampleDict(TypedDict):
-    """Type definition for SpO2 sample response."""
-
-    spo2_sample_id: str
-    daily_spo2_id: str
-    timestamp: datetime
-    value: float
-
-
-class StressSampleDict(TypedDict):
-    """Type definition for stress sample response."""
-
-    stress_sample_id: str
-    daily_stress_id: str
-    timestamp: datetime
-    value: Optional[int]
-    source: str
+def _has_day(daily_data: Dict[str, Any]) -> bool:
+    return bool(daily_data and daily_data.get("day"))
 
 
 class OuraAPI:
     """Wrapper for the Oura Ring API."""
 
-    def __init__(self):
-        """Initialize the API client."""
+    def __init__(
+        self,
+        archive: Optional[ResponseArchive] = None,
+        client: Optional[OuraClient] = None,
+        coalesce_ttl: Optional[float] = 300.0,
+        rate_limiter: Optional[SharedRateLimiter] = None,
+        normalize_workers: int = 0,
+        rate_limit_path: Optional[Union[str, Path]] = None,
+    ):
+        """Initialize the API client.
+
+        Args:
+            archive: If given, every raw response page is also written to
+                this archive.
+            client: Client to use instead of one built from OURA_API_TOKEN,
+                e.g. an `ArchiveClient` to replay archived responses.
+            coalesce_ttl: Seconds a fetched range may answer identical or
+                narrower requests, which also share in-flight requests.
+                None disables coalescing.
+            rate_limiter: Limiter every request acquires a token from.
+                Clients built from OURA_API_TOKEN default to the limiter
+                shared by all processes (see `SharedRateLimiter.from_env`).
+            normalize_workers: If positive, response pages of paginated
+                requests are decoded and normalized in a `PagePool` of this
+                many processes instead of in this one.
+            rate_limit_path: State file of the default limiter instead of
+                OURA_RATE_LIMIT_DB, e.g. one per account.
+        """
         logger.info("Initializing OuraAPI")
-        load_dotenv()
+        if client is not None:
+            self.client = client
+        else:
+            load_dotenv()
+
+            self.api_token = os.getenv("OURA_API_TOKEN")
+            if not self.api_token:
+                logger.error("OURA_API_TOKEN not found in environment variables")
+                raise ValueError("OURA_API_TOKEN not found in environment variables")
+
+            logger.info("Creating Oura client")
+            self.client = OuraClient(self.api_token)
+            if rate_limiter is None:
+                rate_limiter = SharedRateLimiter.from_env(
+                    self.api_token, rate_limit_path
+                )
+
+        # Raw pages must be requested below every other wrapper
+        self.page_pool = None
+        if normalize_workers > 0:
+            self.page_pool = PagePool(normalize_workers)
+            self.page_pool.install(self.client)
+
+        self.rate_limiter = rate_limiter
+        if rate_limiter is not None:
+            self._rate_limit_requests(rate_limiter)
+
+        if archive is not None:
+            self._archive_responses(archive)
+
+        self.coalescer = None
+        if coalesce_ttl:
+            self.coalescer = RequestCoalescer(ttl=coalesce_ttl)
+            self.client._make_paginated_request = self.coalescer.wrap(
+                self.client._make_paginated_request
+            )
+        logger.debug("OuraAPI initialized successfully")
 
-        self.api_token = os.getenv("OURA_API_TOKEN")
-        if not self.api_token:
-            logger.error("OURA_API_TOKEN not found in environment variables")
-            raise ValueError("OURA_API_TOKEN not found in environment variables")
+    def close(self) -> None:
+        """Stop the normalization workers, if any."""
+        if self.page_pool is not None:
+            self.page_pool.close()
 
-        logger.info("Creating Oura client")
-        self.client = OuraClient(self.api_token)
-        logger.debug("OuraAPI initialized successfully")
+    def _normalize(
+        self,
+        records: List[Any],
+        normalizer: Callable[..., Dict[str, Any]],
+        index_key: Optional[str] = None,
+        where: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Normalize fetched records, in the page pool if there is one.
+
+        See `PagePool.normalize` for the arguments.
+        """
+        if self.page_pool is not None:
+            return self.page_pool.normalize(records, normalizer, index_key, where)
+        return [
+            normalizer(record, i) if index_key else normalizer(record)
+            for i, record in enumerate(records)
+            if where is None or where(record)
+        ]
+
+    def _series(
+        self, records: List[Any], value_key: str, source: Optional[str] = None
+    ) -> TimeSeries:
+        """Build a `TimeSeries` of fetched records, in the page pool if any."""
+        if self.page_pool is not None:
+            return self.page_pool.series(records, value_key, source=source)
+        return TimeSeries.from_samples(records, value_key, source=source)
+
+    def _rate_limit_requests(
+        self, limiter: SharedRateLimiter, retries: int = MAX_RATE_LIMIT_RETRIES
+    ) -> None:
+        """Take a token from `limiter` before every request.
+
+        A 429 response empties the shared bucket for the Retry-After period
+        (so every process backs off) and the request is retried.
+        """
+        make_request = self.client._make_request
+
+        def limited_request(method, url_slug, **kwargs):
+            for attempt in range(retries + 1):
+                limiter.acquire()
+                try:
+                    return make_request(method=method, url_slug=url_slug, **kwargs)
+                except requests.HTTPError as e:
+                    response = e.response
+                    if response is None or response.status_code != 429:
+                        raise
+                    if attempt == retries:
+                        raise
+                    retry_after = response.headers.get("Retry-After", "")
+                    limiter.backoff(
+                        float(retry_after) if retry_after.isdigit() else 60.0
+                    )
+
+        self.client._make_request = limited_request
+
+    def _archive_responses(self, archive: ResponseArchive) -> None:
+        """Tee every raw response the client receives into `archive`."""
+        make_request = self.client._make_request
+
+        def archived_request(method, url_slug, **kwargs):
+            response = make_request(method=method, url_slug=url_slug, **kwargs)
+            archive.append(url_slug, dict(kwargs.get("params") or {}), response)
+            return response
+
+        self.client._make_request = archived_request
 
     def get_personal_info(self) -> PersonalInfoDict:
         """Get personal information from the API."""
@@ -234,14 +220,7 @@ class OuraAPI:
                 logger.error("Empty response from personal_info API call")
                 return None
 
-            return {
-                "personal_info_id": response.get("id", ""),
-                "age": response.get("age"),
-                "weight": response.get("weight"),
-                "height": response.get("height"),
-                "biological_sex": response.get("biological_sex"),
-                "email": response.get("email"),
-            }
+            return normalize_personal_info(response)
         except Exception as e:
             logger.error(f"Error fetching personal info: {str(e)}", exc_info=True)
             raise
@@ -253,21 +232,17 @@ class OuraAPI:
         sleep_data = self.client.get_daily_sleep(
             start_date=start_date, end_date=end_date
         )
-        return [
-            {
-                "sleep_summary_id": str(sleep.get("id", "")),
-                "day": sleep.get("day"),
-                "score": sleep.get("score"),
-                "timestamp": (
-                    datetime.fromisoformat(sleep["timestamp"])
-                    if sleep.get("timestamp")
-                    else None
-                ),
-                "contributors": sleep.get("contributors"),
-                "periods": sleep.get("sleep_periods", []),
-            }
-            for sleep in sleep_data
-        ]
+        return self._normalize(sleep_data, normalize_daily_sleep)
+
+    def get_sleep_periods(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> List[SleepPeriodDocumentDict]:
+        """Get sleep periods with their embedded 5-minute heart rate, HRV and
+        sleep phase series."""
+        periods = self.client.get_sleep_periods(
+            start_date=start_date, end_date=end_date
+        )
+        return self._normalize(periods, normalize_sleep_period)
 
     def get_daily_activity(
         self, start_date: Optional[str] = None, end_date: Optional[str] = None
@@ -276,33 +251,7 @@ class OuraAPI:
         activity_data = self.client.get_daily_activity(
             start_date=start_date, end_date=end_date
         )
-        return [
-            {
-                "activity_summary_id": str(activity.get("id", "")),
-                "day": activity.get("day"),
-                "score": activity.get("score"),
-                "timestamp": (
-                    datetime.fromisoformat(activity["timestamp"])
-                    if activity.get("timestamp")
-                    else None
-                ),
-                "active_calories": activity.get("active_calories"),
-                "total_calories": activity.get("total_calories"),
-                "steps": activity.get("steps"),
-                "equivalent_walking_distance": activity.get(
-                    "equivalent_walking_distance"
-                ),
-                "inactivity_alerts": activity.get("inactivity_alerts"),
-                "non_wear_time": activity.get("non_wear_time"),
-                "resting_time": activity.get("resting_time"),
-                "meters_to_target": activity.get("meters_to_target"),
-                "target_calories": activity.get("target_calories"),
-                "target_meters": activity.get("target_meters"),
-                "sedentary_time": activity.get("sedentary_time"),
-                "contributors": activity.get("contributors"),
-            }
-            for activity in activity_data
-        ]
+        return self._normalize(activity_data, normalize_daily_activity)
 
     def get_daily_readiness(
         self, start_date: Optional[str] = None, end_date: Optional[str] = None
@@ -311,60 +260,42 @@ class OuraAPI:
         readiness_data = self.client.get_daily_readiness(
             start_date=start_date, end_date=end_date
         )
-        return [
-            {
-                "readiness_summary_id": str(readiness.get("id", "")),
-                "day": readiness.get("day"),
-                "score": readiness.get("score"),
-                "timestamp": (
-                    datetime.fromisoformat(readiness["timestamp"])
-                    if readiness.get("timestamp")
-                    else None
-                ),
-                "contributors": readiness.get("contributors"),
-            }
-            for readiness in readiness_data
-        ]
+        return self._normalize(readiness_data, normalize_daily_readiness)
 
     def get_heart_rate(
-        self, start_date_time: str, end_date_time: str
-    ) -> List[HeartRateDict]:
-        """Get heart rate data."""
+        self, start_date_time: str, end_date_time: str, compact: bool = False
+    ) -> Union[List[HeartRateDict], TimeSeries]:
+        """Get heart rate data.
+
+        Args:
+            start_date_time: Start datetime in ISO 8601 format.
+            end_date_time: End datetime in ISO 8601 format.
+            compact: Return a `TimeSeries` of bpm instead of a list of dicts.
+        """
         hr_data = self.client.get_heart_rate(start_date_time, end_date_time)
-        return [
-            {
-                "sleep_hr_id": i,  # Auto-incrementing ID will be handled by SQLAlchemy
-                "timestamp": (
-                    datetime.fromisoformat(hr["timestamp"])
-                    if hr.get("timestamp")
-                    else None
-                ),
-                "bpm": hr.get("bpm"),
-            }
-            for i, hr in enumerate(hr_data)
-        ]
+        if compact:
+            return self._series(hr_data, "bpm")
+        return self._normalize(hr_data, normalize_heart_rate, index_key="sleep_hr_id")
 
     def get_hrv(
-        self, start_date: Optional[str] = None, end_date: Optional[str] = None
-    ) -> List[HRVDict]:
-        """Get HRV data."""
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        compact: bool = False,
+    ) -> Union[List[HRVDict], TimeSeries]:
+        """Get HRV data.
+
+        Args:
+            start_date: Start date in YYYY-MM-DD format.
+            end_date: End date in YYYY-MM-DD format.
+            compact: Return a `TimeSeries` of rmssd instead of a list of dicts.
+        """
         hrv_data = self.client.get_heart_rate(
-            start_date=start_date, end_date=end_date
+            start_datetime=start_date, end_datetime=end_date
         )  # Using heart_rate endpoint as example
-        return [
-            {
-                "sleep_hrv_id": i,  # Auto-incrementing ID will be handled by SQLAlchemy
-                "timestamp": (
-                    datetime.fromisoformat(hrv["timestamp"])
-                    if hrv.get("timestamp")
-                    else None
-                ),
-                "rmssd": hrv.get(
-                    "hrv"
-                ),  # Assuming HRV data is available in the response
-            }
-            for i, hrv in enumerate(hrv_data)
-        ]
+        if compact:
+            return self._series(hrv_data, "hrv")
+        return self._normalize(hrv_data, normalize_hrv, index_key="sleep_hrv_id")
 
     def get_workouts(
         self, start_date: Optional[str] = None, end_date: Optional[str] = None
@@ -389,26 +320,7 @@ class OuraAPI:
                 start_date=start_date, end_date=end_date
             )
 
-            return [
-                {
-                    "workout_id": workout["id"],
-                    "activity": workout["activity"],
-                    "calories": workout.get("calories"),
-                    "day": workout["day"],
-                    "distance": workout.get("distance"),
-                    "start_datetime": datetime.fromisoformat(workout["start_datetime"]),
-                    "end_datetime": datetime.fromisoformat(workout["end_datetime"]),
-                    "intensity": workout.get("intensity"),
-                    "label": workout.get("label"),
-                    "source": workout["source"],
-                    "average_heart_rate": workout.get("heart_rate", {}).get("average"),
-                    "max_heart_rate": workout.get("heart_rate", {}).get("max"),
-                    "movement_speed": workout.get("movement_speed", {}).get("average"),
-                    "training_energy": workout.get("training_energy"),
-                    "training_time": workout.get("training_time"),
-                }
-                for workout in workouts
-            ]
+            return self._normalize(workouts, normalize_workout)
         except Exception as e:
             logger.error(f"Error fetching workout data: {str(e)}", exc_info=True)
             raise
@@ -438,31 +350,15 @@ class OuraAPI:
 
             results = []
             seen_days = set()  # To handle duplicate days
-            print(f"Total days: {len(spo2_data)}")
-            for daily_data in spo2_data:
-                if not daily_data:  # Skip if no data
+            for daily in self._normalize(
+                spo2_data, normalize_daily_spo2, where=_has_day
+            ):
+                if daily["day"] in seen_days:
                     continue
+                seen_days.add(daily["day"])
+                results.append(daily)
 
-                day = daily_data.get("day")
-                if not day or day in seen_days:
-                    continue
-                seen_days.add(day)
-
-                daily_dict: DailySpO2Dict = {
-                    "daily_spo2_id": daily_data.get("id", ""),
-                    "day": day,
-                    "timestamp": datetime.fromisoformat(day + "T00:00:00+00:00"),
-                    "average": (
-                        daily_data.get("spo2_percentage", {}).get("average")
-                        if daily_data.get("spo2_percentage")
-                        else None
-                    ),
-                    "breathing_disturbance_index": daily_data.get(
-                        "breathing_disturbance_index"
-                    ),
-                }
-                results.append(daily_dict)
-
+            print(f"Total days: {len(results)}")
             return results
         except Exception as e:
             logger.error(f"Error fetching daily SpO2 data: {str(e)}", exc_info=True)
@@ -491,25 +387,8 @@ class OuraAPI:
                 start_date=start_date, end_date=end_date
             )
 
-            results = []
-
-            for daily_data in stress_data:
-                if not daily_data:  # Skip if no data
-                    continue
-
-                daily_dict: DailyStressDict = {
-                    "daily_stress_id": daily_data.get("id", ""),
-                    "day": daily_data.get("day"),
-                    "timestamp": datetime.fromisoformat(
-                        daily_data["day"] + "T00:00:00+00:00"
-                    ),
-                    "stress_high": daily_data.get("stress_high"),
-                    "recovery_high": daily_data.get("recovery_high"),
-                    "day_summary": daily_data.get("day_summary"),
-                }
-                results.append(daily_dict)
-
-            return results
+            # Skip records without data
+            return self._normalize(stress_data, normalize_daily_stress, where=bool)
         except Exception as e:
             logger.error(f"Error fetching daily stress data: {str(e)}", exc_info=True)
             raise
@@ -518,40 +397,49 @@ class OuraAPI:
         self,
         start_datetime: Optional[datetime] = None,
         end_datetime: Optional[datetime] = None,
-    ) -> List[HeartRateDict]:
+        windows: Optional[List[Tuple[datetime, datetime]]] = None,
+        compact: bool = False,
+    ) -> Union[List[HeartRateDict], TimeSeries]:
         """Get sleep heart rate data.
 
         Args:
             start_datetime: Start datetime in UTC. Expected in ISO 8601 format (YYYY-MM-DDThh:mm:ss).
             end_datetime: End datetime in UTC. Expected in ISO 8601 format (YYYY-MM-DDThh:mm:ss).
+            windows: Optional (start, end) intervals, e.g. known sleep periods.
+                When given, heart rate is only requested inside these windows
+                instead of for the whole range.
+            compact: Return a `TimeSeries` of bpm instead of a list of dicts.
         """
         logger.info("Fetching sleep heart rate data")
         try:
-            if not start_datetime:
-                start_datetime = datetime.now(timezone.utc) - timedelta(days=1)
-            if not end_datetime:
-                end_datetime = datetime.now(timezone.utc)
-
-            # Format datetimes in ISO 8601 format exactly as specified in docs
-            start_str = start_datetime.strftime("%Y-%m-%dT%H:%M:%S.000Z")
-            end_str = end_datetime.strftime("%Y-%m-%dT%H:%M:%S.000Z")
-
-            hr_data = self.client.get_heart_rate(
-                start_datetime=start_str, end_datetime=end_str
+            if windows is None:
+                if not start_datetime:
+                    start_datetime = datetime.now(timezone.utc) - timedelta(days=1)
+                if not end_datetime:
+                    end_datetime = datetime.now(timezone.utc)
+                windows = [(start_datetime, end_datetime)]
+
+            hr_data = []
+            for window_start, window_end in windows:
+                hr_data.extend(
+                    self.client.get_heart_rate(
+                        start_datetime=format_utc(window_start),
+                        end_datetime=format_utc(window_end),
+                    )
+                )
+
+            if compact:
+                return self._series(hr_data, "bpm", source="sleep")
+            return self._normalize(
+                hr_data,
+                normalize_heart_rate,
+                index_key="sleep_hr_id",
+                where=_is_sleep_sample,
             )
-
-            return [
-                {
-                    "sleep_hr_id": i,
-                    "timestamp": datetime.fromisoformat(hr["timestamp"]),
-                    "bpm": hr.get("bpm"),
-                }
-                for i, hr in enumerate(hr_data)
-                if hr.get("source") == "sleep" and hr.get("timestamp")
-            ]
         except Exception as e:
             logger.error(f"Error fetching sleep heart rate: {str(e)}", exc_info=True)
-            return []  # Return empty list instead of raising
+            # Return an empty result instead of raising
+            return TimeSeries() if compact else []
 
     def get_ring_configuration(self) -> List[Dict[str, Any]]:
         """Get ring configuration data."""
@@ -559,22 +447,7 @@ class OuraAPI:
         try:
             config_data = self.client.get_ring_configuration()
 
-            return [
-                {
-                    "ring_id": config.get("id", ""),
-                    "color": config.get("color"),
-                    "design": config.get("design"),
-                    "firmware_version": config.get("firmware_version"),
-                    "hardware_type": config.get("hardware_type"),
-                    "set_up_at": (
-                        datetime.fromisoformat(config["set_up_at"])
-                        if config.get("set_up_at")
-                        else None
-                    ),
-                    "size": config.get("size"),
-                }
-                for config in config_data
-            ]
+            return self._normalize(config_data, normalize_ring_configuration)
         except Exception as e:
             logger.error(f"Error fetching ring configuration: {str(e)}", exc_info=True)
             return []  # Return empty list instead of raising
@@ -0,0 +1,246 @@
+"""
+Append-only archive of raw Oura API responses.
+
+Every response page is stored as its own gzip member appended to a segment
+file, and a small SQLite index maps each page to its endpoint, the range of
+days it covers and its byte range in the segment. Pages can be read back
+individually, so tables can be rebuilt from the archive at disk speed
+instead of re-downloading everything.
+
+`ArchiveClient` serves archived pages through the `OuraClient` interface,
+so `OuraAPI` and its normalizers run unchanged on top of it.
+"""
+
+import gzip
+import json
+import sqlite3
+import threading
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from oura_ring import OuraClient
+
+from .parallel import RawPage
+
+# Rotate to a new segment file once the current one reaches this size
+SEGMENT_BYTES = 64 * 1024 * 1024
+
+
+def endpoint_name(url_slug: str) -> str:
+    """Map an API URL slug to an endpoint name, e.g. ``daily_activity``."""
+    return url_slug.rstrip("/").split("usercollection/", 1)[-1]
+
+
+def _record_day(record: Dict[str, Any]) -> Optional[str]:
+    """Best-effort day (YYYY-MM-DD) a raw record belongs to."""
+    for key in ("day", "timestamp", "start_datetime", "bedtime_start"):
+        value = record.get(key)
+        if value:
+            return str(value)[:10]
+    return None
+
+
+def _aware(value: str) -> datetime:
+    """Parse an ISO timestamp, treating naive values as UTC."""
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _page_days(params: Dict[str, Any], response: Dict[str, Any]) -> Tuple[str, str]:
+    """Range of days a page covers, from its records or else its params."""
+    days = [
+        day
+        for record in response.get("data") or []
+        if isinstance(record, dict) and (day := _record_day(record))
+    ]
+    if days:
+        return min(days), max(days)
+
+    start = params.get("start_date") or str(params.get("start_datetime") or "")[:10]
+    end = params.get("end_date") or str(params.get("end_datetime") or "")[:10]
+    today = date.today().isoformat()
+    return start or today, end or start or today
+
+
+class ResponseArchive:
+    """Compressed, append-only store of raw API pages indexed by endpoint and day."""
+
+    def __init__(self, root: Union[str, Path], segment_bytes: int = SEGMENT_BYTES):
+        """Open (or create) an archive directory.
+
+        Args:
+            root: Archive directory.
+            segment_bytes: Size at which a new segment file is started.
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self._lock = threading.Lock()
+        self._index = sqlite3.connect(
+            str(self.root / "index.db"), check_same_thread=False
+        )
+        self._index.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                page_id INTEGER PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                start_day TEXT NOT NULL,
+                end_day TEXT NOT NULL,
+                params TEXT NOT NULL,
+                fetched_at TEXT NOT NULL,
+                segment TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL
+            )
+            """)
+        self._index.execute(
+            "CREATE INDEX IF NOT EXISTS pages_endpoint_days "
+            "ON pages (endpoint, start_day, end_day)"
+        )
+        self._index.commit()
+
+    def close(self) -> None:
+        self._index.close()
+
+    def _segment_for(self, endpoint: str) -> Path:
+        """Current segment file for an endpoint, rotating when it is full."""
+        row = self._index.execute(
+            "SELECT segment FROM pages WHERE endpoint = ? "
+            "ORDER BY page_id DESC LIMIT 1",
+            (endpoint,),
+        ).fetchone()
+        if row:
+            segment = self.root / row[0]
+            if segment.stat().st_size < self.segment_bytes:
+                return segment
+            sequence = int(segment.stem.rsplit("-", 1)[1].split(".")[0]) + 1
+        else:
+            sequence = 0
+        return self.root / f"{endpoint}-{sequence:05d}.json.gz"
+
+    def append(
+        self,
+        url_slug: str,
+        params: Dict[str, Any],
+        response: Union[Dict[str, Any], RawPage],
+    ) -> None:
+        """Archive one raw response page.
+
+        Undecoded pages are stored as received and indexed by the days of
+        their request.
+        """
+        endpoint = endpoint_name(url_slug)
+        if isinstance(response, RawPage):
+            start_day, end_day = _page_days(params, {})
+            member = gzip.compress(response.content)
+        else:
+            start_day, end_day = _page_days(params, response)
+            member = gzip.compress(json.dumps(response, separators=(",", ":")).encode())
+        fetched_at = datetime.now(timezone.utc).isoformat()
+        stored_params = {k: v for k, v in params.items() if k != "next_token"}
+
+        with self._lock:
+            segment = self._segment_for(endpoint)
+            with open(segment, "ab") as f:
+                offset = f.tell()
+                f.write(member)
+            self._index.execute(
+                "INSERT INTO pages (endpoint, start_day, end_day, params, "
+                "fetched_at, segment, offset, length) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    endpoint,
+                    start_day,
+                    end_day,
+                    json.dumps(stored_params, sort_keys=True, default=str),
+                    fetched_at,
+                    segment.name,
+                    offset,
+                    len(member),
+                ),
+            )
+            self._index.commit()
+
+    def _read(self, segment: str, offset: int, length: int) -> Dict[str, Any]:
+        with open(self.root / segment, "rb") as f:
+            f.seek(offset)
+            return json.loads(gzip.decompress(f.read(length)))
+
+    def pages(
+        self,
+        endpoint: str,
+        start_day: Optional[str] = None,
+        end_day: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield archived responses overlapping a day range, oldest first."""
+        rows = self._index.execute(
+            "SELECT segment, offset, length FROM pages "
+            "WHERE endpoint = ? AND end_day >= ? AND start_day <= ? "
+            "ORDER BY fetched_at, page_id",
+            (endpoint, start_day or "0000-00-00", end_day or "9999-99-99"),
+        ).fetchall()
+        for segment, offset, length in rows:
+            yield self._read(segment, offset, length)
+
+    def records(
+        self,
+        endpoint: str,
+        start_day: Optional[str] = None,
+        end_day: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Latest archived version of each raw record in a day range."""
+        latest: Dict[Any, Dict[str, Any]] = {}
+        for page in self.pages(endpoint, start_day, end_day):
+            for record in page.get("data") or []:
+                day = _record_day(record)
+                if day and (
+                    (start_day and day < start_day) or (end_day and day > end_day)
+                ):
+                    continue
+                key = record.get("id") or (
+                    record.get("timestamp"),
+                    record.get("source"),
+                )
+                latest[key] = record
+        return list(latest.values())
+
+    def latest(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        """Most recently archived response of a non-paginated endpoint."""
+        row = self._index.execute(
+            "SELECT segment, offset, length FROM pages WHERE endpoint = ? "
+            "ORDER BY fetched_at DESC, page_id DESC LIMIT 1",
+            (endpoint,),
+        ).fetchone()
+        return self._read(*row) if row else None
+
+
+class ArchiveClient(OuraClient):
+    """`OuraClient` that answers from a `ResponseArchive` instead of the API."""
+
+    def __init__(self, archive: ResponseArchive):
+        self.archive = archive
+
+    def close(self) -> None:
+        pass
+
+    def _make_request(self, method, url_slug, **kwargs) -> Dict[str, Any]:
+        return self.archive.latest(endpoint_name(url_slug)) or {}
+
+    def _make_paginated_request(self, method, url_slug, **kwargs) -> List[Dict]:
+        params = kwargs.get("params", {})
+        start = params.get("start_date") or str(params.get("start_datetime", ""))
+        end = params.get("end_date") or str(params.get("end_datetime", ""))
+        records = self.archive.records(
+            endpoint_name(url_slug), start[:10] or None, end[:10] or None
+        )
+
+        if "start_datetime" in params:
+            # Heart rate is requested by time, so trim to the exact window
+            start_dt = _aware(params["start_datetime"])
+            end_dt = _aware(params["end_datetime"])
+            records = [
+                record
+                for record in records
+                if start_dt <= _aware(record["timestamp"]) <= end_dt
+            ]
+        return sorted(records, key=lambda record: _record_day(record) or "")
@@ -0,0 +1,353 @@
+"""
+Asyncio client for the Oura Ring API.
+
+`AsyncOuraAPI` mirrors `OuraAPI` but runs on a single event loop: all requests
+share one `httpx.AsyncClient` connection pool, and a semaphore caps how many
+are in flight at once. Paginated endpoints are exposed as async iterators so
+callers can start processing the first page before the last one arrives.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from dotenv import load_dotenv
+from oura_ring import API_URL
+
+from .normalizers import (
+    format_utc,
+    normalize_daily_activity,
+    normalize_daily_readiness,
+    normalize_daily_sleep,
+    normalize_daily_spo2,
+    normalize_daily_stress,
+    normalize_heart_rate,
+    normalize_personal_info,
+    normalize_ring_configuration,
+    normalize_sleep_period,
+    normalize_workout,
+)
+from .ratelimit import MAX_RATE_LIMIT_RETRIES, SharedRateLimiter
+from .types import (
+    ActivitySummaryDict,
+    DailySpO2Dict,
+    DailyStressDict,
+    HeartRateDict,
+    PersonalInfoDict,
+    ReadinessSummaryDict,
+    SleepPeriodDocumentDict,
+    SleepSummaryDict,
+    WorkoutDict,
+)
+
+logger = logging.getLogger(__name__)
+
+# Endpoint name -> (URL slug, record normalizer)
+ENDPOINTS: Dict[str, Tuple[str, Callable[[Dict[str, Any]], Any]]] = {
+    "daily_sleep": ("v2/usercollection/daily_sleep", normalize_daily_sleep),
+    "daily_activity": ("v2/usercollection/daily_activity", normalize_daily_activity),
+    "daily_readiness": (
+        "v2/usercollection/daily_readiness",
+        normalize_daily_readiness,
+    ),
+    "daily_spo2": ("v2/usercollection/daily_spo2", normalize_daily_spo2),
+    "daily_stress": ("v2/usercollection/daily_stress", normalize_daily_stress),
+    "sleep_periods": ("v2/usercollection/sleep", normalize_sleep_period),
+    "workout": ("v2/usercollection/workout", normalize_workout),
+    "ring_configuration": (
+        "v2/usercollection/ring_configuration",
+        normalize_ring_configuration,
+    ),
+}
+
+
+def _format_dates(
+    start_date: Optional[str], end_date: Optional[str]
+) -> Tuple[str, str]:
+    """Apply the same date defaults as `OuraClient`."""
+    end = date.fromisoformat(end_date) if end_date else date.today()
+    start = date.fromisoformat(start_date) if start_date else end - timedelta(days=1)
+
+    if start > end:
+        raise ValueError(f"Start date greater than end date: {start} > {end}")
+
+    return str(start), str(end)
+
+
+class AsyncOuraAPI:
+    """Asyncio wrapper for the Oura Ring API.
+
+    Use as an async context manager so the connection pool is closed:
+
+        async with AsyncOuraAPI() as api:
+            activity, sleep = await asyncio.gather(
+                api.get_daily_activity("2024-01-01"),
+                api.get_daily_sleep("2024-01-01"),
+            )
+    """
+
+    def __init__(
+        self,
+        api_token: Optional[str] = None,
+        base_url: str = API_URL,
+        max_concurrency: int = 10,
+        max_connections: int = 20,
+        timeout: float = 60.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        rate_limiter: Optional[SharedRateLimiter] = None,
+    ):
+        """Initialize the API client.
+
+        Args:
+            api_token: Personal access token. Defaults to `OURA_API_TOKEN`.
+            base_url: API root, overridable to point at a local stand-in server.
+            max_concurrency: Maximum number of requests in flight at once.
+            max_connections: Size of the shared connection pool.
+            timeout: Per-request timeout in seconds.
+            transport: Optional httpx transport, e.g. `httpx.MockTransport`.
+            rate_limiter: Limiter every request acquires a token from.
+                Defaults to the limiter shared by all processes unless a
+                transport is given.
+        """
+        logger.info("Initializing AsyncOuraAPI")
+        if api_token is None:
+            load_dotenv()
+            api_token = os.getenv("OURA_API_TOKEN")
+        if not api_token:
+            logger.error("OURA_API_TOKEN not found in environment variables")
+            raise ValueError("OURA_API_TOKEN not found in environment variables")
+
+        self.api_token = api_token
+        if rate_limiter is None and transport is None:
+            rate_limiter = SharedRateLimiter.from_env(api_token)
+        self.rate_limiter = rate_limiter
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_token}"},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=timeout,
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> "AsyncOuraAPI":
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the shared connection pool."""
+        await self.client.aclose()
+
+    async def _request(
+        self, url_slug: str, params: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """Make a single GET request under the concurrency and rate limits.
+
+        A 429 response empties the shared rate-limit bucket for the
+        Retry-After period and the request is retried.
+        """
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            if self.rate_limiter is not None:
+                await asyncio.to_thread(self.rate_limiter.acquire)
+            async with self._semaphore:
+                response = await self.client.get(f"/{url_slug}", params=params)
+            if (
+                response.status_code == 429
+                and self.rate_limiter is not None
+                and attempt < MAX_RATE_LIMIT_RETRIES
+            ):
+                retry_after = response.headers.get("Retry-After", "")
+                self.rate_limiter.backoff(
+                    float(retry_after) if retry_after.isdigit() else 60.0
+                )
+                continue
+            response.raise_for_status()
+            return response.json()
+
+    async def iter_pages(
+        self, url_slug: str, params: Dict[str, str]
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield the raw `data` list of each page of a paginated endpoint."""
+        params = dict(params)
+        while True:
+            response = await self._request(url_slug, params)
+            yield response["data"]
+
+            next_token = response.get("next_token")
+            if not next_token:
+                break
+            params["next_token"] = next_token
+
+    async def iter_records(
+        self,
+        endpoint: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> AsyncIterator[Any]:
+        """Yield normalized records of a date-ranged endpoint page by page.
+
+        Args:
+            endpoint: Key of `ENDPOINTS`, e.g. ``"daily_activity"``.
+            start_date: Start date in YYYY-MM-DD format.
+            end_date: End date in YYYY-MM-DD format.
+        """
+        url_slug, normalize = ENDPOINTS[endpoint]
+        start, end = _format_dates(start_date, end_date)
+        async for page in self.iter_pages(
+            url_slug, {"start_date": start, "end_date": end}
+        ):
+            for record in page:
+                if record:
+                    yield normalize(record)
+
+    async def _collect(
+        self,
+        endpoint: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> List[Any]:
+        return [
+            record async for record in self.iter_records(endpoint, start_date, end_date)
+        ]
+
+    async def iter_heart_rate(
+        self, start_datetime: datetime, end_datetime: datetime
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield raw heart rate samples between two datetimes."""
+        params = {
+            "start_datetime": format_utc(start_datetime),
+            "end_datetime": format_utc(end_datetime),
+        }
+        async for page in self.iter_pages("v2/usercollection/heartrate", params):
+            for sample in page:
+                yield sample
+
+    async def get_personal_info(self) -> Optional[PersonalInfoDict]:
+        """Get personal information from the API."""
+        logger.info("Fetching personal information")
+        response = await self._request("v2/usercollection/personal_info")
+        if not response:
+            logger.error("Empty response from personal_info API call")
+            return None
+        return normalize_personal_info(response)
+
+    async def get_daily_sleep(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> List[SleepSummaryDict]:
+        """Get daily sleep data with periods and contributors."""
+        return await self._collect("daily_sleep", start_date, end_date)
+
+    async def get_sleep_periods(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> List[SleepPeriodDocumentDict]:
+        """Get sleep periods with their embedded sample series."""
+        return await self._collect("sleep_periods", start_date, end_date)
+
+    async def get_daily_activity(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> List[ActivitySummaryDict]:
+        """Get daily activity data with contributors."""
+        return await self._collect("daily_activity", start_date, end_date)
+
+    async def get_daily_readiness(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> List[ReadinessSummaryDict]:
+        """Get daily readiness data with contributors."""
+        return await self._collect("daily_readiness", start_date, end_date)
+
+    async def get_workouts(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> List[WorkoutDict]:
+        """Get workout data. Dates default to yesterday through today."""
+        logger.info("Fetching workout data")
+        return await self._collect("workout", start_date, end_date)
+
+    async def get_daily_spo2(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> List[DailySpO2Dict]:
+        """Get daily SpO2 data, keeping the first record for each day."""
+        logger.info("Fetching daily SpO2 data")
+        url_slug, _ = ENDPOINTS["daily_spo2"]
+        start, end = _format_dates(start_date, end_date)
+
+        results: List[DailySpO2Dict] = []
+        seen_days = set()
+        async for page in self.iter_pages(
+            url_slug, {"start_date": start, "end_date": end}
+        ):
+            for daily_data in page:
+                day = daily_data.get("day") if daily_data else None
+                if not day or day in seen_days:
+                    continue
+                seen_days.add(day)
+                results.append(normalize_daily_spo2(daily_data))
+        return results
+
+    async def get_daily_stress(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> List[DailyStressDict]:
+        """Get daily stress data."""
+        logger.info("Fetching daily stress data")
+        return await self._collect("daily_stress", start_date, end_date)
+
+    async def get_heart_rate(
+        self, start_datetime: datetime, end_datetime: datetime
+    ) -> List[HeartRateDict]:
+        """Get heart rate data between two datetimes."""
+        return [
+            normalize_heart_rate(hr, i)
+            async for i, hr in _aenumerate(
+                self.iter_heart_rate(start_datetime, end_datetime)
+            )
+        ]
+
+    async def get_sleep_heart_rate(
+        self,
+        start_datetime: Optional[datetime] = None,
+        end_datetime: Optional[datetime] = None,
+    ) -> List[HeartRateDict]:
+        """Get heart rate samples recorded during sleep.
+
+        Args:
+            start_datetime: Start datetime in UTC. Defaults to 24 hours ago.
+            end_datetime: End datetime in UTC. Defaults to now.
+        """
+        logger.info("Fetching sleep heart rate data")
+        if not start_datetime:
+            start_datetime = datetime.now(timezone.utc) - timedelta(days=1)
+        if not end_datetime:
+            end_datetime = datetime.now(timezone.utc)
+
+        return [
+            normalize_heart_rate(hr, i)
+            async for i, hr in _aenumerate(
+                self.iter_heart_rate(start_datetime, end_datetime)
+            )
+            if hr.get("source") == "sleep" and hr.get("timestamp")
+        ]
+
+    async def get_ring_configuration(self) -> List[Dict[str, Any]]:
+        """Get ring configuration data."""
+        logger.info("Fetching ring configuration")
+        url_slug, normalize = ENDPOINTS["ring_configuration"]
+        return [
+            normalize(config)
+            async for page in self.iter_pages(url_slug, {})
+            for config in page
+        ]
+
+
+async def _aenumerate(iterable: AsyncIterator[Any]) -> AsyncIterator[Tuple[int, Any]]:
+    """Async counterpart of `enumerate`."""
+    i = 0
+    async for item in iterable:
+        yield i, item
+        i += 1
@@ -0,0 +1,216 @@
+"""
+Range-aware coalescing of Oura API requests.
+
+`RequestCoalescer` sits in front of `OuraClient._make_paginated_request`.
+Concurrent callers asking for a range that an in-flight request already
+covers wait for that request and share its result instead of issuing their
+own. Completed responses are kept for a short time, so a later request for
+the same range or any sub-range of it is answered from memory by filtering
+the records on their day or timestamp.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+RANGE_PARAMS = ("start_date", "end_date", "start_datetime", "end_datetime")
+
+# Range of a request: (kind, start, end), where kind is "date" or "datetime"
+Span = Tuple[str, Any, Any]
+
+
+def _parse_datetime(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _span(params: Dict[str, Any]) -> Optional[Span]:
+    """Requested range of a request, or None if it has no complete range."""
+    if params.get("start_date") and params.get("end_date"):
+        return "date", str(params["start_date"]), str(params["end_date"])
+    if params.get("start_datetime") and params.get("end_datetime"):
+        return (
+            "datetime",
+            _parse_datetime(str(params["start_datetime"])),
+            _parse_datetime(str(params["end_datetime"])),
+        )
+    return None
+
+
+def _covers(outer: Span, inner: Span) -> bool:
+    return outer[0] == inner[0] and outer[1] <= inner[1] and inner[2] <= outer[2]
+
+
+def _within(record: Dict[str, Any], span: Span) -> Optional[bool]:
+    """Whether a record falls in `span`, or None if it cannot be placed."""
+    kind, start, end = span
+    if kind == "date":
+        day = record.get("day")
+        return start <= day <= end if day else None
+    timestamp = record.get("timestamp")
+    return start <= _parse_datetime(timestamp) <= end if timestamp else None
+
+
+def _subset(records: List[Dict[str, Any]], outer: Span, inner: Span):
+    """Records of `outer` that fall in `inner`, or None if any can't be placed."""
+    if outer == inner:
+        return list(records)
+    subset = []
+    for record in records:
+        inside = _within(record, inner)
+        if inside is None:
+            return None
+        if inside:
+            subset.append(record)
+    return subset
+
+
+@dataclass
+class _Flight:
+    """A request in progress (or completed) and its outcome."""
+
+    span: Optional[Span]
+    done: threading.Event = field(default_factory=threading.Event)
+    records: Optional[List[Dict[str, Any]]] = None
+    error: Optional[BaseException] = None
+    fetched_at: float = 0.0
+
+
+class RequestCoalescer:
+    """Single-flight and short-lived super-range cache for paginated requests.
+
+    Example:
+        coalescer = RequestCoalescer(ttl=300)
+        client._make_paginated_request = coalescer.wrap(
+            client._make_paginated_request
+        )
+    """
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 64):
+        """Initialize the coalescer.
+
+        Args:
+            ttl: Seconds a completed response may answer later requests.
+            max_entries: Completed responses kept, least recently used first
+                out.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, List[_Flight]] = {}
+        self._entries: "OrderedDict[Tuple[Hashable, Optional[Span]], _Flight]" = (
+            OrderedDict()
+        )
+        self.stats = {"fetched": 0, "shared": 0, "cached": 0}
+
+    def wrap(self, fetch: Callable[..., List[Dict[str, Any]]]) -> Callable:
+        """Wrap a ``(method, url_slug, **kwargs)`` paginated fetch function."""
+
+        def coalesced(method, url_slug, **kwargs):
+            return self.fetch(fetch, method, url_slug, **kwargs)
+
+        return coalesced
+
+    def clear(self) -> None:
+        """Forget all completed responses."""
+        with self._lock:
+            self._entries.clear()
+
+    def _cached(self, scope: Hashable, span: Optional[Span]):
+        """Records for `span` from a fresh completed response, if any."""
+        now = time.monotonic()
+        for key, entry in list(self._entries.items()):
+            if now - entry.fetched_at > self.ttl:
+                del self._entries[key]
+                continue
+            if key[0] != scope:
+                continue
+            if entry.span == span or (
+                span and entry.span and _covers(entry.span, span)
+            ):
+                records = _subset(entry.records, entry.span, span)
+                if records is not None:
+                    self._entries.move_to_end(key)
+                    return records
+        return None
+
+    def fetch(
+        self, fetch: Callable[..., List[Dict[str, Any]]], method, url_slug, **kwargs
+    ) -> List[Dict[str, Any]]:
+        """Fetch through the coalescer; see the class docstring."""
+        params = dict(kwargs.get("params") or {})
+        span = _span(params)
+        scope = (
+            method,
+            url_slug,
+            tuple(
+                sorted(
+                    (name, str(value))
+                    for name, value in params.items()
+                    if name not in RANGE_PARAMS
+                )
+            ),
+            tuple(
+                sorted(
+                    (name, repr(v)) for name, v in kwargs.items() if name != "params"
+                )
+            ),
+        )
+
+        with self._lock:
+            records = self._cached(scope, span)
+            if records is not None:
+                self.stats["cached"] += 1
+                logger.debug(f"Answered {url_slug} {span} from a cached response")
+                return records
+
+            shared = next(
+                (
+                    flight
+                    for flight in self._flights.get(scope, [])
+                    if flight.span == span
+                    or (span and flight.span and _covers(flight.span, span))
+                ),
+                None,
+            )
+            if shared is None:
+                flight = _Flight(span)
+                self._flights.setdefault(scope, []).append(flight)
+            else:
+                self.stats["shared"] += 1
+
+        if shared is not None:
+            shared.done.wait()
+            if shared.error is not None:
+                raise shared.error
+            records = _subset(shared.records, shared.span, span)
+            if records is not None:
+                return records
+            # Records could not be placed in the sub-range; fetch it directly
+            return fetch(method, url_slug, **kwargs)
+
+        try:
+            flight.records = fetch(method, url_slug, **kwargs)
+            flight.fetched_at = time.monotonic()
+            with self._lock:
+                self.stats["fetched"] += 1
+                self._entries[(scope, span)] = flight
+                self._entries.move_to_end((scope, span))
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return list(flight.records)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights[scope].remove(flight)
+                if not self._flights[scope]:
+                    del self._flights[scope]
+            flight.done.set()
@@ -0,0 +1,197 @@
+"""
+Per-record normalizers shared by the sync and async Oura API clients.
+
+Each function takes one raw record as returned by the Oura API v2 and builds
+the normalized dictionary exposed by `OuraAPI`.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from .types import (
+    ActivitySummaryDict,
+    DailySpO2Dict,
+    DailyStressDict,
+    HeartRateDict,
+    HRVDict,
+    PersonalInfoDict,
+    ReadinessSummaryDict,
+    SleepPeriodDocumentDict,
+    SleepSummaryDict,
+    WorkoutDict,
+)
+
+
+def format_utc(value: datetime) -> str:
+    """Format a datetime in UTC ISO 8601 format exactly as specified in docs.
+
+    Naive datetimes are taken to be UTC already.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp, passing through missing values."""
+    return datetime.fromisoformat(value) if value else None
+
+
+def normalize_personal_info(response: Dict[str, Any]) -> PersonalInfoDict:
+    """Normalize a personal info response."""
+    return {
+        "personal_info_id": response.get("id", ""),
+        "age": response.get("age"),
+        "weight": response.get("weight"),
+        "height": response.get("height"),
+        "biological_sex": response.get("biological_sex"),
+        "email": response.get("email"),
+    }
+
+
+def normalize_daily_sleep(sleep: Dict[str, Any]) -> SleepSummaryDict:
+    """Normalize a daily sleep record."""
+    return {
+        "sleep_summary_id": str(sleep.get("id", "")),
+        "day": sleep.get("day"),
+        "score": sleep.get("score"),
+        "timestamp": _parse_datetime(sleep.get("timestamp")),
+        "contributors": sleep.get("contributors"),
+        "periods": sleep.get("sleep_periods", []),
+    }
+
+
+def normalize_sleep_period(period: Dict[str, Any]) -> SleepPeriodDocumentDict:
+    """Normalize a sleep periods endpoint document.
+
+    Timestamps stay ISO 8601 strings, as the embedded series and the
+    `SleepPeriod` row builder expect.
+    """
+    document = {
+        name: period.get(name) for name in SleepPeriodDocumentDict.__annotations__
+    }
+    document["id"] = str(period.get("id", ""))
+    return document
+
+
+def normalize_daily_activity(activity: Dict[str, Any]) -> ActivitySummaryDict:
+    """Normalize a daily activity record."""
+    return {
+        "activity_summary_id": str(activity.get("id", "")),
+        "day": activity.get("day"),
+        "score": activity.get("score"),
+        "timestamp": _parse_datetime(activity.get("timestamp")),
+        "active_calories": activity.get("active_calories"),
+        "total_calories": activity.get("total_calories"),
+        "steps": activity.get("steps"),
+        "equivalent_walking_distance": activity.get("equivalent_walking_distance"),
+        "inactivity_alerts": activity.get("inactivity_alerts"),
+        "non_wear_time": activity.get("non_wear_time"),
+        "resting_time": activity.get("resting_time"),
+        "meters_to_target": activity.get("meters_to_target"),
+        "target_calories": activity.get("target_calories"),
+        "target_meters": activity.get("target_meters"),
+        "sedentary_time": activity.get("sedentary_time"),
+        "contributors": activity.get("contributors"),
+    }
+
+
+def normalize_daily_readiness(readiness: Dict[str, Any]) -> ReadinessSummaryDict:
+    """Normalize a daily readiness record."""
+    return {
+        "readiness_summary_id": str(readiness.get("id", "")),
+        "day": readiness.get("day"),
+        "score": readiness.get("score"),
+        "timestamp": _parse_datetime(readiness.get("timestamp")),
+        "contributors": readiness.get("contributors"),
+    }
+
+
+def normalize_heart_rate(hr: Dict[str, Any], index: int) -> HeartRateDict:
+    """Normalize a heart rate sample.
+
+    Args:
+        hr: Raw heart rate sample.
+        index: Position of the sample in the response, used as its id.
+    """
+    return {
+        "sleep_hr_id": index,
+        "timestamp": _parse_datetime(hr.get("timestamp")),
+        "bpm": hr.get("bpm"),
+    }
+
+
+def normalize_hrv(hrv: Dict[str, Any], index: int) -> HRVDict:
+    """Normalize an HRV sample.
+
+    Args:
+        hrv: Raw HRV sample.
+        index: Position of the sample in the response, used as its id.
+    """
+    return {
+        "sleep_hrv_id": index,
+        "timestamp": _parse_datetime(hrv.get("timestamp")),
+        "rmssd": hrv.get("hrv"),
+    }
+
+
+def normalize_workout(workout: Dict[str, Any]) -> WorkoutDict:
+    """Normalize a workout record."""
+    return {
+        "workout_id": workout["id"],
+        "activity": workout["activity"],
+        "calories": workout.get("calories"),
+        "day": workout["day"],
+        "distance": workout.get("distance"),
+        "start_datetime": datetime.fromisoformat(workout["start_datetime"]),
+        "end_datetime": datetime.fromisoformat(workout["end_datetime"]),
+        "intensity": workout.get("intensity"),
+        "label": workout.get("label"),
+        "source": workout["source"],
+        "average_heart_rate": workout.get("heart_rate", {}).get("average"),
+        "max_heart_rate": workout.get("heart_rate", {}).get("max"),
+        "movement_speed": workout.get("movement_speed", {}).get("average"),
+        "training_energy": workout.get("training_energy"),
+        "training_time": workout.get("training_time"),
+    }
+
+
+def normalize_daily_spo2(daily_data: Dict[str, Any]) -> DailySpO2Dict:
+    """Normalize a daily SpO2 record."""
+    day = daily_data["day"]
+    return {
+        "daily_spo2_id": daily_data.get("id", ""),
+        "day": day,
+        "timestamp": datetime.fromisoformat(day + "T00:00:00+00:00"),
+        "average": (
+            daily_data.get("spo2_percentage", {}).get("average")
+            if daily_data.get("spo2_percentage")
+            else None
+        ),
+        "breathing_disturbance_index": daily_data.get("breathing_disturbance_index"),
+    }
+
+
+def normalize_daily_stress(daily_data: Dict[str, Any]) -> DailyStressDict:
+    """Normalize a daily stress record."""
+    return {
+        "daily_stress_id": daily_data.get("id", ""),
+        "day": daily_data.get("day"),
+        "timestamp": datetime.fromisoformat(daily_data["day"] + "T00:00:00+00:00"),
+        "stress_high": daily_data.get("stress_high"),
+        "recovery_high": daily_data.get("recovery_high"),
+        "day_summary": daily_data.get("day_summary"),
+    }
+
+
+def normalize_ring_configuration(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a ring configuration record."""
+    return {
+        "ring_id": config.get("id", ""),
+        "color": config.get("color"),
+        "design": config.get("design"),
+        "firmware_version": config.get("firmware_version"),
+        "hardware_type": config.get("hardware_type"),
+        "set_up_at": _parse_datetime(config.get("set_up_at")),
+        "size": config.get("size"),
+    }
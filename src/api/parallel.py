@@ -0,0 +1,263 @@
+"""
+Decoding and normalization of response pages in worker processes.
+
+Normally every response page is decoded with `response.json()` and each
+record normalized in the syncing process, which pins large backfills to one
+core. With a `PagePool`, paginated requests keep the undecoded body of each
+page as a `RawPage`. The pool then sends the pages to worker processes that
+decode and normalize them. Results come back as compact batches (column
+names once, then one tuple per record) and are expanded into the usual
+normalized dicts in page order.
+
+Only the ``next_token`` of a page is read in the syncing process, from the
+end of the body, so pagination does not wait for the workers.
+"""
+
+import json
+import logging
+import multiprocessing
+import re
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from oura_ring import API_URL, OuraClient
+
+from .timeseries import TimeSeries
+
+logger = logging.getLogger(__name__)
+
+# Bytes at the end of a page searched for its next_token
+TOKEN_TAIL_BYTES = 1024
+
+_NEXT_TOKEN = re.compile(rb'"next_token"\s*:\s*(null|"(?:[^"\\]|\\.)*")\s*[,}]')
+
+# Normalized records of one page: (records in the page, columns, rows)
+RecordBatch = Tuple[int, Tuple[str, ...], List[tuple]]
+
+
+def _next_token(content: bytes) -> Optional[str]:
+    """The ``next_token`` of a page, read from its tail if possible."""
+    matches = _NEXT_TOKEN.findall(content[-TOKEN_TAIL_BYTES:])
+    if not matches:
+        return json.loads(content).get("next_token")
+    return json.loads(matches[-1])
+
+
+class RawPage:
+    """An undecoded page of a paginated response.
+
+    Behaves enough like a decoded page for `OuraClient`'s pagination loop:
+    ``page["next_token"]`` is the page's token and ``page["data"]`` is a
+    list holding the page itself, so the loop collects one `RawPage` per
+    page instead of the records.
+    """
+
+    __slots__ = ("content", "next_token")
+
+    def __init__(self, content: bytes):
+        self.content = content
+        self.next_token = _next_token(content)
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "data":
+            return [self]
+        if key == "next_token":
+            return self.next_token
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Record fields are unknown until decoded, so only page keys resolve."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+def _normalize_records(
+    records: List[Dict[str, Any]],
+    normalizer: Callable[..., Dict[str, Any]],
+    indexed: bool,
+    where: Optional[Callable[[Dict[str, Any]], bool]],
+) -> RecordBatch:
+    """Normalize records into a batch.
+
+    Indexed normalizers get each record's position in `records`; the caller
+    shifts it by the records of earlier batches.
+    """
+    columns: Tuple[str, ...] = ()
+    rows = []
+    for index, record in enumerate(records):
+        if where is not None and not where(record):
+            continue
+        normalized = normalizer(record, index) if indexed else normalizer(record)
+        if not columns:
+            columns = tuple(normalized)
+        rows.append(tuple(normalized.values()))
+    return len(records), columns, rows
+
+
+def _normalize_page(
+    content: bytes,
+    normalizer: Callable[..., Dict[str, Any]],
+    indexed: bool,
+    where: Optional[Callable[[Dict[str, Any]], bool]],
+) -> RecordBatch:
+    """Decode and normalize one page in a worker process."""
+    return _normalize_records(json.loads(content)["data"], normalizer, indexed, where)
+
+
+def _series_page(
+    content: bytes, value_key: str, typecode: str, source: Optional[str]
+) -> TimeSeries:
+    """Decode one page into a `TimeSeries` in a worker process."""
+    return TimeSeries.from_samples(
+        json.loads(content)["data"], value_key, typecode, source
+    )
+
+
+class PagePool:
+    """Process pool that decodes and normalizes `RawPage`s.
+
+    Example:
+        pool = PagePool(workers=4)
+        pool.install(client)
+        records = pool.normalize(client.get_daily_activity(start, end),
+                                 normalize_daily_activity)
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        """Start the pool.
+
+        Args:
+            workers: Worker processes; defaults to the number of CPUs.
+        """
+        # Spawned workers do not inherit the syncing threads' locks
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self._lock = threading.Lock()
+        self.stats = {"pages": 0, "bytes": 0}
+
+    def close(self) -> None:
+        self.executor.shutdown()
+
+    def install(self, client: OuraClient) -> None:
+        """Make `client`'s paginated requests return `RawPage`s.
+
+        Must run before any other wrapper is installed on the client's
+        request methods, so rate limiting, archiving and coalescing apply
+        to the raw requests unchanged.
+        """
+        make_request = client._make_request
+
+        def request(method, url_slug, raw=False, **kwargs):
+            if not raw:
+                return make_request(method=method, url_slug=url_slug, **kwargs)
+            response = client.session.request(
+                method=method, url=f"{API_URL}/{url_slug}", timeout=60, **kwargs
+            )
+            response.raise_for_status()
+            return RawPage(response.content)
+
+        def paginated_request(method, url_slug, **kwargs):
+            return OuraClient._make_paginated_request(
+                client, method, url_slug, raw=True, **kwargs
+            )
+
+        client._make_request = request
+        client._make_paginated_request = paginated_request
+
+    def _submit(self, page: RawPage, function: Callable, *args: Any) -> Future:
+        with self._lock:
+            self.stats["pages"] += 1
+            self.stats["bytes"] += len(page.content)
+        return self.executor.submit(function, page.content, *args)
+
+    def normalize(
+        self,
+        records: List[Union[RawPage, Dict[str, Any]]],
+        normalizer: Callable[..., Dict[str, Any]],
+        index_key: Optional[str] = None,
+        where: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Normalize fetched records, decoding raw pages in the workers.
+
+        Args:
+            records: Records as returned by the client; raw pages and
+                decoded records may be mixed.
+            normalizer: Module-level normalizer function.
+            index_key: For normalizers that take the record's position in
+                the response, the key holding it.
+            where: Module-level predicate; records failing it are skipped
+                (after counting them for the position).
+
+        Returns:
+            Normalized records in response order.
+        """
+        indexed = index_key is not None
+        parts: List[Union[Future, RecordBatch]] = []
+        decoded: List[Dict[str, Any]] = []
+
+        def flush() -> None:
+            if decoded:
+                parts.append(
+                    _normalize_records(list(decoded), normalizer, indexed, where)
+                )
+                decoded.clear()
+
+        for record in records:
+            if isinstance(record, RawPage):
+                flush()
+                parts.append(
+                    self._submit(record, _normalize_page, normalizer, indexed, where)
+                )
+            else:
+                decoded.append(record)
+        flush()
+
+        normalized: List[Dict[str, Any]] = []
+        offset = 0
+        for part in parts:
+            count, columns, rows = part.result() if isinstance(part, Future) else part
+            for row in rows:
+                record = dict(zip(columns, row))
+                if indexed:
+                    record[index_key] += offset
+                normalized.append(record)
+            offset += count
+        return normalized
+
+    def series(
+        self,
+        records: List[Union[RawPage, Dict[str, Any]]],
+        value_key: str,
+        typecode: str = "H",
+        source: Optional[str] = None,
+    ) -> TimeSeries:
+        """Build a `TimeSeries` from fetched records, decoding in the workers.
+
+        Takes the arguments of `TimeSeries.from_samples`.
+        """
+        parts: List[Union[Future, TimeSeries]] = []
+        samples: List[Dict[str, Any]] = []
+        for record in records:
+            if isinstance(record, RawPage):
+                if samples:
+                    parts.append(
+                        TimeSeries.from_samples(samples, value_key, typecode, source)
+                    )
+                    samples = []
+                parts.append(
+                    self._submit(record, _series_page, value_key, typecode, source)
+                )
+            else:
+                samples.append(record)
+
+        series = TimeSeries.from_samples(samples, value_key, typecode, source)
+        if parts:
+            merged = TimeSeries(typecode)
+            for part in parts:
+                merged.extend(part.result() if isinstance(part, Future) else part)
+            series = merged.extend(series)
+        return series
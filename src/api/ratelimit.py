@@ -0,0 +1,186 @@
+"""
+Token-bucket rate limiting shared across processes.
+
+Oura enforces a request budget per access token (5000 requests per 5
+minutes at the time of writing). Cron jobs, notebooks and the sync script
+each create their own `OuraAPI`, so the bucket lives in a small SQLite file
+that every process updates under an immediate (write) transaction. Callers
+wait for a token before each request, which keeps the combined request rate
+just under the budget instead of bouncing off 429 responses.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = Path.home() / ".cache" / "oura" / "rate_limit.db"
+DEFAULT_LIMIT = "4500/300"  # 90% of Oura's 5000 requests per 5 minutes
+# Retries of a request answered with 429 despite the limiter
+MAX_RATE_LIMIT_RETRIES = 3
+
+
+def parse_limit(limit: str) -> Tuple[int, float]:
+    """Parse ``"<requests>/<seconds>"`` into (requests, seconds)."""
+    try:
+        requests, seconds = limit.split("/")
+        return int(requests), float(seconds)
+    except ValueError as e:
+        raise ValueError(f"Invalid rate limit {limit!r}, expected e.g. 4500/300") from e
+
+
+def bucket_key(token: str) -> str:
+    """Bucket name for an access token, without storing the token itself."""
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+class SharedRateLimiter:
+    """Token bucket whose state is shared through a SQLite file.
+
+    The bucket holds up to `requests` tokens and refills at
+    ``requests / seconds`` tokens per second. Waiting happens outside the
+    database transaction, so waiting processes never hold the lock.
+
+    Example:
+        limiter = SharedRateLimiter(requests=4500, seconds=300)
+        waited = limiter.acquire()
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = DEFAULT_PATH,
+        requests: int = 4500,
+        seconds: float = 300.0,
+        key: str = "default",
+    ):
+        """Initialize the limiter.
+
+        Args:
+            path: Shared state file; created if missing.
+            requests: Requests allowed per `seconds`, which is also the
+                largest burst.
+            seconds: Length of the budget window.
+            key: Bucket name, so tokens with separate budgets can share one
+                file.
+        """
+        self.path = Path(path)
+        self.capacity = float(requests)
+        self.rate = requests / seconds
+        self.key = key
+        self.stats: Dict[str, float] = {
+            "acquired": 0,
+            "throttled": 0,
+            "wait_seconds": 0.0,
+            "backoffs": 0,
+        }
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets "
+            "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    @classmethod
+    def from_env(
+        cls, token: Optional[str] = None, path: Optional[Union[str, Path]] = None
+    ) -> Optional["SharedRateLimiter"]:
+        """Limiter configured by OURA_RATE_LIMIT and OURA_RATE_LIMIT_DB.
+
+        OURA_RATE_LIMIT is ``"<requests>/<seconds>"`` (default 4500/300) or
+        ``off`` to disable limiting. `path`, if given, replaces
+        OURA_RATE_LIMIT_DB, e.g. for a per-account state file.
+
+        Returns:
+            The limiter, or None if limiting is disabled.
+        """
+        limit = os.getenv("OURA_RATE_LIMIT", DEFAULT_LIMIT)
+        if limit.lower() in ("off", "0", "none"):
+            return None
+        requests, seconds = parse_limit(limit)
+        return cls(
+            path or os.getenv("OURA_RATE_LIMIT_DB", str(DEFAULT_PATH)),
+            requests,
+            seconds,
+            key=bucket_key(token) if token else "default",
+        )
+
+    def _take(self, amount: float = 1.0) -> float:
+        """Take tokens if available; otherwise return seconds to wait."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = self._conn.execute(
+                    "SELECT tokens, updated_at FROM buckets WHERE key = ?",
+                    (self.key,),
+                ).fetchone()
+                tokens, updated_at = row if row else (self.capacity, now)
+                tokens = min(
+                    self.capacity, tokens + max(0.0, now - updated_at) * self.rate
+                )
+                wait = 0.0
+                if tokens >= amount:
+                    tokens -= amount
+                else:
+                    wait = (amount - tokens) / self.rate
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO buckets (key, tokens, updated_at) "
+                    "VALUES (?, ?, ?)",
+                    (self.key, tokens, now),
+                )
+                self._conn.execute("COMMIT")
+                return wait
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def acquire(self) -> float:
+        """Wait until a request may be made and take its token.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            wait = self._take()
+            if not wait:
+                break
+            time.sleep(wait)
+            waited += wait
+
+        with self._lock:
+            self.stats["acquired"] += 1
+            if waited:
+                self.stats["throttled"] += 1
+                self.stats["wait_seconds"] += waited
+        if waited > 1:
+            logger.info(f"Waited {waited:.1f}s for the shared API rate limit")
+        return waited
+
+    def backoff(self, seconds: float) -> None:
+        """Empty the bucket so no process makes a request for `seconds`.
+
+        Call this when the API answers 429 anyway, e.g. because another
+        client of the same token does not use the limiter.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO buckets (key, tokens, updated_at) "
+                "VALUES (?, ?, ?)",
+                (self.key, -seconds * self.rate, time.time()),
+            )
+            self.stats["backoffs"] += 1
+        logger.warning(f"Rate limited by the API; backing off for {seconds:.0f}s")
+
+    def close(self) -> None:
+        """Close the state database."""
+        self._conn.close()
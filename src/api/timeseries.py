@@ -0,0 +1,171 @@
+"""
+Compact columnar container for time-series samples.
+
+Heart rate and similar samples are stored as parallel typed arrays instead
+of one dict (with its own `datetime`) per sample: epoch seconds as doubles,
+values as unsigned shorts by default and the sample source as a one-byte
+code into a small lookup table. That is 11 bytes per sample, so a month of
+5-minute heart rate fits in well under a megabyte.
+
+When NumPy is installed the columns can be viewed as arrays without copying.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+Number = Union[int, float]
+
+
+class TimeSeries:
+    """Parallel timestamp, value and source columns for a series of samples.
+
+    Samples must be appended in timestamp order for `between` to work; the
+    API returns them that way.
+
+    Example:
+        series = api.get_heart_rate(start, end, compact=True)
+        timestamps, bpm = series.numpy()
+    """
+
+    __slots__ = ("timestamps", "values", "source_codes", "sources", "_codes")
+
+    def __init__(self, typecode: str = "H"):
+        """Create an empty series.
+
+        Args:
+            typecode: `array` typecode of the value column, e.g. ``"H"`` for
+                heart rate or ``"d"`` for fractional values.
+        """
+        self.timestamps = array("d")
+        self.values = array(typecode)
+        self.source_codes = array("B")
+        self.sources: List[Optional[str]] = []
+        self._codes: Dict[Optional[str], int] = {}
+
+    @classmethod
+    def from_samples(
+        cls,
+        samples: Iterable[Dict[str, Any]],
+        value_key: str,
+        typecode: str = "H",
+        source: Optional[str] = None,
+    ) -> "TimeSeries":
+        """Build a series from raw API samples.
+
+        Samples without a timestamp or value are skipped.
+
+        Args:
+            samples: Raw samples with ``timestamp``, `value_key` and
+                optionally ``source`` keys.
+            value_key: Key holding the sample value, e.g. ``"bpm"``.
+            typecode: `array` typecode of the value column.
+            source: If given, keep only samples from this source.
+        """
+        series = cls(typecode)
+        integral = typecode != "d" and typecode != "f"
+        for sample in samples:
+            if source is not None and sample.get("source") != source:
+                continue
+            timestamp, value = sample.get("timestamp"), sample.get(value_key)
+            if not timestamp or value is None:
+                continue
+            series.append(
+                datetime.fromisoformat(timestamp).timestamp(),
+                round(value) if integral else value,
+                sample.get("source"),
+            )
+        return series
+
+    def append(
+        self, timestamp: float, value: Number, source: Optional[str] = None
+    ) -> None:
+        """Append one sample given as epoch seconds."""
+        code = self._codes.get(source)
+        if code is None:
+            code = self._codes[source] = len(self.sources)
+            self.sources.append(source)
+        self.timestamps.append(timestamp)
+        self.values.append(value)
+        self.source_codes.append(code)
+
+    def extend(self, other: "TimeSeries") -> "TimeSeries":
+        """Append the samples of another series, which must follow this one."""
+        codes = array("B", [0] * len(other.sources))
+        for code, source in enumerate(other.sources):
+            mapped = self._codes.get(source)
+            if mapped is None:
+                mapped = self._codes[source] = len(self.sources)
+                self.sources.append(source)
+            codes[code] = mapped
+        self.timestamps.extend(other.timestamps)
+        self.values.extend(other.values)
+        self.source_codes.extend(codes[code] for code in other.source_codes)
+        return self
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __iter__(self) -> Iterator[Tuple[datetime, Number, Optional[str]]]:
+        """Yield (UTC datetime, value, source) per sample."""
+        for timestamp, value, code in zip(
+            self.timestamps, self.values, self.source_codes
+        ):
+            yield (
+                datetime.fromtimestamp(timestamp, timezone.utc),
+                value,
+                self.sources[code],
+            )
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the sample columns."""
+        return sum(
+            column.itemsize * len(column)
+            for column in (self.timestamps, self.values, self.source_codes)
+        )
+
+    def between(self, start: datetime, end: datetime) -> "TimeSeries":
+        """Samples with start <= timestamp <= end, as a new series."""
+        lo = bisect_left(self.timestamps, start.timestamp())
+        hi = bisect_right(self.timestamps, end.timestamp())
+        series = TimeSeries(self.values.typecode)
+        series.timestamps = self.timestamps[lo:hi]
+        series.values = self.values[lo:hi]
+        series.source_codes = self.source_codes[lo:hi]
+        series.sources = list(self.sources)
+        series._codes = dict(self._codes)
+        return series
+
+    def numpy(self) -> Tuple[Any, Any]:
+        """Zero-copy NumPy views of the timestamp and value columns.
+
+        The views share memory with the series, so appending to the series
+        afterwards invalidates them.
+        """
+        if np is None:
+            raise ImportError(
+                "NumPy views require the numpy package: pip install numpy"
+            )
+        return (
+            np.frombuffer(self.timestamps, dtype=np.float64),
+            np.frombuffer(self.values, dtype=self.values.typecode),
+        )
+
+    def source_mask(self, source: Optional[str]) -> Any:
+        """NumPy boolean mask of the samples from `source`."""
+        if np is None:
+            raise ImportError(
+                "NumPy views require the numpy package: pip install numpy"
+            )
+        codes = np.frombuffer(self.source_codes, dtype=np.uint8)
+        code = self._codes.get(source)
+        if code is None:
+            return np.zeros(len(codes), dtype=bool)
+        return codes == code
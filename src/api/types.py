@@ -0,0 +1,223 @@
+"""
+Type definitions for normalized Oura API records.
+"""
+
+from datetime import datetime
+from typing import List, Optional, TypedDict
+
+
+class PersonalInfoDict(TypedDict):
+    """Type definition for personal info response."""
+
+    personal_info_id: str
+    age: Optional[int]
+    weight: Optional[float]
+    height: Optional[float]
+    biological_sex: Optional[str]
+    email: Optional[str]
+
+
+class SleepContributorDict(TypedDict):
+    """Type definition for sleep contributor response."""
+
+    deep_sleep: Optional[int]
+    efficiency: Optional[int]
+    latency: Optional[int]
+    rem_sleep: Optional[int]
+    restfulness: Optional[int]
+    timing: Optional[int]
+    total_sleep: Optional[int]
+
+
+class SleepPeriodDict(TypedDict):
+    """Type definition for sleep period response."""
+
+    sleep_period_id: str
+    start_datetime: datetime
+    end_datetime: datetime
+    total_sleep_duration: Optional[int]
+    awake_time: Optional[int]
+    light_sleep_duration: Optional[int]
+    rem_sleep_duration: Optional[int]
+    deep_sleep_duration: Optional[int]
+    restless_periods: Optional[int]
+    average_heart_rate: Optional[int]
+    lowest_heart_rate: Optional[int]
+    average_hrv: Optional[int]
+    temperature_delta: Optional[float]
+    bedtime_start: Optional[datetime]
+    bedtime_end: Optional[datetime]
+    readiness_score_delta: Optional[int]
+
+
+class SleepSeriesDict(TypedDict):
+    """Type definition for a sample series embedded in a sleep period."""
+
+    interval: float  # seconds between items
+    items: List[Optional[float]]
+    timestamp: str  # time of the first item
+
+
+class SleepPeriodDocumentDict(TypedDict):
+    """Type definition for a sleep periods endpoint document."""
+
+    id: str
+    day: str
+    type: Optional[str]
+    bedtime_start: Optional[str]
+    bedtime_end: Optional[str]
+    total_sleep_duration: Optional[int]
+    awake_time: Optional[int]
+    light_sleep_duration: Optional[int]
+    rem_sleep_duration: Optional[int]
+    deep_sleep_duration: Optional[int]
+    restless_periods: Optional[int]
+    average_heart_rate: Optional[float]
+    lowest_heart_rate: Optional[int]
+    average_hrv: Optional[int]
+    readiness_score_delta: Optional[int]
+    heart_rate: Optional[SleepSeriesDict]
+    hrv: Optional[SleepSeriesDict]
+    sleep_phase_5_min: Optional[str]  # one digit per 5 minutes
+
+
+class SleepSummaryDict(TypedDict):
+    """Type definition for sleep summary response."""
+
+    sleep_summary_id: str
+    day: str
+    score: Optional[int]
+    timestamp: datetime
+    contributors: Optional[SleepContributorDict]
+    periods: List[SleepPeriodDict]
+
+
+class ActivityContributorDict(TypedDict):
+    """Type definition for activity contributor response."""
+
+    meet_daily_targets: Optional[int]
+    move_every_hour: Optional[int]
+    recovery_time: Optional[int]
+    stay_active: Optional[int]
+    training_frequency: Optional[int]
+    training_volume: Optional[int]
+
+
+class ActivitySummaryDict(TypedDict):
+    """Type definition for activity summary response."""
+
+    activity_summary_id: str
+    day: str
+    score: Optional[int]
+    timestamp: datetime
+    active_calories: Optional[int]
+    total_calories: Optional[int]
+    steps: Optional[int]
+    equivalent_walking_distance: Optional[int]
+    inactivity_alerts: Optional[int]
+    non_wear_time: Optional[int]
+    resting_time: Optional[int]
+    meters_to_target: Optional[int]
+    target_calories: Optional[int]
+    target_meters: Optional[int]
+    sedentary_time: Optional[int]
+    contributors: Optional[ActivityContributorDict]
+
+
+class ReadinessContributorDict(TypedDict):
+    """Type definition for readiness contributor response."""
+
+    activity_balance: Optional[int]
+    body_temperature: Optional[int]
+    hrv_balance: Optional[int]
+    previous_day_activity: Optional[int]
+    previous_night: Optional[int]
+    recovery_index: Optional[int]
+    resting_heart_rate: Optional[int]
+    sleep_balance: Optional[int]
+
+
+class ReadinessSummaryDict(TypedDict):
+    """Type definition for readiness summary response."""
+
+    readiness_summary_id: str
+    day: str
+    score: Optional[int]
+    timestamp: datetime
+    contributors: Optional[ReadinessContributorDict]
+
+
+class HeartRateDict(TypedDict):
+    """Type definition for heart rate response."""
+
+    sleep_hr_id: int
+    timestamp: datetime
+    bpm: Optional[int]
+
+
+class HRVDict(TypedDict):
+    """Type definition for HRV response."""
+
+    sleep_hrv_id: int
+    timestamp: datetime
+    rmssd: Optional[int]
+
+
+class WorkoutDict(TypedDict):
+    """Type definition for workout response."""
+
+    workout_id: str
+    activity: str
+    calories: Optional[int]
+    day: str
+    distance: Optional[float]
+    start_datetime: datetime
+    end_datetime: datetime
+    intensity: Optional[str]
+    label: Optional[str]
+    source: str
+    average_heart_rate: Optional[int]
+    max_heart_rate: Optional[int]
+    movement_speed: Optional[float]
+    training_energy: Optional[int]
+    training_time: Optional[int]
+
+
+class DailySpO2Dict(TypedDict):
+    """Type definition for daily SpO2 response."""
+
+    daily_spo2_id: str
+    day: str
+    timestamp: datetime
+    average: Optional[float]
+    breathing_disturbance_index: Optional[int]
+
+
+class DailyStressDict(TypedDict):
+    """Type definition for daily stress response."""
+
+    daily_stress_id: str
+    day: str
+    timestamp: datetime
+    stress_high: Optional[int]
+    recovery_high: Optional[int]
+    day_summary: Optional[str]
+
+
+class SpO2SampleDict(TypedDict):
+    """Type definition for SpO2 sample response."""
+
+    spo2_sample_id: str
+    daily_spo2_id: str
+    timestamp: datetime
+    value: float
+
+
+class StressSampleDict(TypedDict):
+    """Type definition for stress sample response."""
+
+    stress_sample_id: str
+    daily_stress_id: str
+    timestamp: datetime
+    value: Optional[int]
+    source: str
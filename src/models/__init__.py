@@ -1,5 +1,8 @@
 from .database import db
-from .base import BaseModel
+from .base import BaseModel, HashedModel
+from .migrations import add_missing_columns, drop_stale_not_null
+from .reads import read_columns, read_rows, read_sql, read_tuples
+from .shards import ShardCatalog, attach_shards, use_account
 
 # Activity related models
 from .activity import ActivitySummary, ActivityContributor
@@ -14,6 +17,7 @@ from .sleep import (
     SleepContributor,
     SleepHeartRate,
     SleepHRV,
+    SleepStageStats,
 )
 
 # Health metrics
@@ -24,10 +28,30 @@ from .stress import DailyStress, StressSample
 # User data
 from .personal_info import PersonalInfo
 
+# Derived metrics
+from .baseline import BaselineDay, BaselineState
+from .daily_fact import DailyFact
+from .sketch import MetricSketch
+
+# Sync metadata
+from .coverage import CoverageRange
+from .partition import SamplePartition
+
 __all__ = [
     # Base
     "BaseModel",
+    "HashedModel",
+    "MODELS",
     "db",
+    # Bulk reads
+    "read_columns",
+    "read_rows",
+    "read_sql",
+    "read_tuples",
+    # Shards
+    "ShardCatalog",
+    "attach_shards",
+    "use_account",
     # Activity
     "ActivitySummary",
     "ActivityContributor",
@@ -40,6 +64,7 @@ __all__ = [
     "SleepContributor",
     "SleepHeartRate",
     "SleepHRV",
+    "SleepStageStats",
     # Health metrics
     "DailyReadiness",
     "DailySpO2",
@@ -48,33 +73,54 @@ __all__ = [
     "StressSample",
     # User data
     "PersonalInfo",
+    # Derived metrics
+    "BaselineDay",
+    "BaselineState",
+    "DailyFact",
+    "MetricSketch",
+    # Sync metadata
+    "CoverageRange",
+    "SamplePartition",
+]
+
+
+# Every table `initialize_db` creates, in dependency order
+MODELS = [
+    # Activity
+    ActivitySummary,
+    ActivityContributor,
+    DailyActivity,
+    Workout,
+    # Sleep
+    DailySleep,
+    SleepPeriod,
+    SleepSummary,
+    SleepContributor,
+    SleepHeartRate,
+    SleepHRV,
+    SleepStageStats,
+    # Health metrics
+    DailyReadiness,
+    DailySpO2,
+    SpO2Sample,
+    DailyStress,
+    StressSample,
+    # User data
+    PersonalInfo,
+    # Derived metrics
+    BaselineDay,
+    BaselineState,
+    DailyFact,
+    MetricSketch,
+    # Sync metadata
+    CoverageRange,
+    SamplePartition,
 ]
 
 
 def initialize_db():
     """Create the database and tables."""
-    MODELS = [
-        # Activity
-        ActivitySummary,
-        ActivityContributor,
-        DailyActivity,
-        Workout,
-        # Sleep
-        DailySleep,
-        SleepPeriod,
-        SleepSummary,
-        SleepContributor,
-        SleepHeartRate,
-        SleepHRV,
-        # Health metrics
-        DailyReadiness,
-        DailySpO2,
-        SpO2Sample,
-        DailyStress,
-        StressSample,
-        # User data
-        PersonalInfo,
-    ]
-
     with db:
         db.create_tables(MODELS, safe=True)
+        add_missing_columns(MODELS)
+        drop_stale_not_null(MODELS)
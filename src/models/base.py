@@ -1,7 +1,17 @@
-from peewee import Model
+from peewee import CharField, Model
 from .database import db  # Make sure this points to your database instance
 
 
 class BaseModel(Model):
     class Meta:
         database = db
+
+
+class HashedModel(BaseModel):
+    """Base for synced records that keep a hash of their normalized content.
+
+    The sync writer compares `content_hash` against the incoming record and
+    skips the write when nothing changed upstream.
+    """
+
+    content_hash = CharField(null=True)
@@ -0,0 +1,52 @@
+"""
+Models holding rolling personal baselines of nightly metrics.
+"""
+
+from peewee import *
+from .base import BaseModel
+
+
+class BaselineState(BaseModel):
+    """Running window sums and EWMA of one metric, as of `last_day`."""
+
+    baseline_state_id = AutoField()
+    metric = CharField()
+    window = IntegerField()  # in days
+    last_day = DateField()
+    count = IntegerField()
+    total = FloatField()
+    total_sq = FloatField()
+    ewma = FloatField(null=True)
+
+    class Meta:
+        table_name = "baseline_states"
+        indexes = ((("metric", "window"), True),)
+
+
+class BaselineDay(BaseModel):
+    """A day's metric value and the baselines going into that day.
+
+    Means, standard deviations and EWMAs cover the days before `day`, so
+    the day's value can be compared against them directly.
+    """
+
+    baseline_day_id = AutoField()
+    metric = CharField()
+    day = DateField()
+    value = FloatField(null=True)
+    mean_7 = FloatField(null=True)
+    std_7 = FloatField(null=True)
+    ewma_7 = FloatField(null=True)
+    mean_14 = FloatField(null=True)
+    std_14 = FloatField(null=True)
+    ewma_14 = FloatField(null=True)
+    mean_30 = FloatField(null=True)
+    std_30 = FloatField(null=True)
+    ewma_30 = FloatField(null=True)
+    mean_60 = FloatField(null=True)
+    std_60 = FloatField(null=True)
+    ewma_60 = FloatField(null=True)
+
+    class Meta:
+        table_name = "baseline_days"
+        indexes = ((("metric", "day"), True),)
@@ -0,0 +1,19 @@
+"""
+Model recording which date ranges of each endpoint have been synced.
+"""
+
+from peewee import *
+from .base import BaseModel
+
+
+class CoverageRange(BaseModel):
+    """A contiguous range of days synced from one API endpoint."""
+
+    coverage_range_id = AutoField()
+    endpoint = CharField(index=True)
+    start_day = DateField()
+    end_day = DateField()
+    synced_at = DateTimeField()  # UTC
+
+    class Meta:
+        table_name = "coverage_ranges"
@@ -1,8 +1,8 @@
 from peewee import *
-from .base import BaseModel
+from .base import HashedModel
 
 
-class DailyActivity(BaseModel):
+class DailyActivity(HashedModel):
     """Daily activity data from Oura API."""
 
     daily_activity_id = AutoField()
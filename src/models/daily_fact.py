@@ -0,0 +1,40 @@
+"""
+Denormalized per-day table combining the key metrics of all daily models.
+"""
+
+from peewee import *
+from .base import BaseModel
+
+
+class DailyFact(BaseModel):
+    """One row per day with the headline metrics of every daily model."""
+
+    daily_fact_id = AutoField()
+    day = DateField(unique=True)
+    # Scores
+    sleep_score = IntegerField(null=True)
+    activity_score = IntegerField(null=True)
+    readiness_score = IntegerField(null=True)
+    # Activity
+    steps = IntegerField(null=True)
+    active_calories = IntegerField(null=True)
+    total_calories = IntegerField(null=True)
+    sedentary_time = IntegerField(null=True)  # in seconds
+    # Main sleep period of the day
+    total_sleep_duration = IntegerField(null=True)  # in seconds
+    average_hrv = IntegerField(null=True)
+    lowest_heart_rate = IntegerField(null=True)
+    temperature_delta = FloatField(null=True)
+    # SpO2 and stress
+    spo2_average = FloatField(null=True)
+    breathing_disturbance_index = IntegerField(null=True)
+    stress_high = IntegerField(null=True)
+    recovery_high = IntegerField(null=True)
+    stress_summary = CharField(null=True)
+    # Workouts
+    workout_count = IntegerField(default=0)
+    workout_calories = IntegerField(null=True)
+    workout_duration = IntegerField(null=True)  # in seconds
+
+    class Meta:
+        table_name = "daily_facts"
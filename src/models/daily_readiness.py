@@ -1,8 +1,8 @@
 from peewee import *
-from .base import BaseModel
+from .base import HashedModel
 
 
-class DailyReadiness(BaseModel):
+class DailyReadiness(HashedModel):
     """Daily readiness data from Oura API."""
 
     readiness_summary_id = CharField(primary_key=True)
@@ -1,8 +1,8 @@
 from peewee import *
-from .base import BaseModel
+from .base import HashedModel
 
 
-class DailySleep(BaseModel):
+class DailySleep(HashedModel):
     """Daily sleep data from Oura API."""
 
     daily_sleep_id = AutoField()
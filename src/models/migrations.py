@@ -0,0 +1,70 @@
+"""
+Lightweight schema migrations for existing databases.
+
+`create_tables(safe=True)` never alters a table that already exists, so
+columns added to a model after the table was created are added here, and
+columns a model has since made nullable lose their NOT NULL constraint.
+"""
+
+from typing import Iterable, List, Type
+
+from playhouse.migrate import SqliteMigrator, migrate
+
+from .base import BaseModel
+from .database import db
+
+
+def add_missing_columns(models: Iterable[Type[BaseModel]]) -> List[str]:
+    """Add model columns that are missing from their existing tables.
+
+    New columns must be nullable or have a default.
+
+    Returns:
+        Names of the added columns as ``table.column``.
+    """
+    migrator = SqliteMigrator(db)
+    operations = []
+    added = []
+
+    for model in models:
+        table = model._meta.table_name
+        if not db.table_exists(table):
+            continue
+
+        existing = {column.name for column in db.get_columns(table)}
+        for field in model._meta.sorted_fields:
+            if field.column_name not in existing:
+                operations.append(migrator.add_column(table, field.column_name, field))
+                added.append(f"{table}.{field.column_name}")
+
+    if operations:
+        migrate(*operations)
+    return added
+
+
+def drop_stale_not_null(models: Iterable[Type[BaseModel]]) -> List[str]:
+    """Drop NOT NULL from existing columns whose model field is now nullable.
+
+    SQLite cannot alter a column in place, so each affected table is rebuilt.
+
+    Returns:
+        Names of the altered columns as ``table.column``.
+    """
+    migrator = SqliteMigrator(db)
+    operations = []
+    altered = []
+
+    for model in models:
+        table = model._meta.table_name
+        if not db.table_exists(table):
+            continue
+
+        not_null = {column.name for column in db.get_columns(table) if not column.null}
+        for field in model._meta.sorted_fields:
+            if field.null and field.column_name in not_null:
+                operations.append(migrator.drop_not_null(table, field.column_name))
+                altered.append(f"{table}.{field.column_name}")
+
+    if operations:
+        migrate(*operations)
+    return altered
@@ -0,0 +1,22 @@
+"""
+Model registering the monthly partitions of the sample tables.
+"""
+
+from peewee import *
+from .base import BaseModel
+
+
+class SamplePartition(BaseModel):
+    """A month of one sample table, moved out of the hot table."""
+
+    sample_partition_id = AutoField()
+    source_table = CharField()
+    month = CharField()  # YYYY-MM
+    table_name = CharField(unique=True)
+    row_count = IntegerField(default=0)
+    resolution_seconds = IntegerField(null=True)  # None while raw
+    updated_at = DateTimeField()  # UTC
+
+    class Meta:
+        table_name = "sample_partitions"
+        indexes = ((("source_table", "month"), True),)
@@ -1,8 +1,8 @@
 from peewee import *
-from .base import BaseModel
+from .base import HashedModel
 
 
-class PersonalInfo(BaseModel):
+class PersonalInfo(HashedModel):
     """Personal information from Oura API."""
 
     personal_info_id = CharField(primary_key=True)
@@ -0,0 +1,198 @@
+"""
+Bulk read path that bypasses peewee model construction.
+
+Queries are built with the usual peewee field expressions, but executed
+directly on the sqlite3 cursor. Rows come back as plain tuples, lightweight
+named rows or per-column arrays. Values are returned as SQLite stores them
+(dates and datetimes as ISO text) unless conversion is requested for
+specific columns. Sample models are read across their hot table and
+monthly partitions.
+
+    nights = read_rows(DailySleep, "day", "score", convert=["day"])
+    series = read_columns(SleepHeartRate, "timestamp", "bpm")
+"""
+
+import math
+from array import array
+from collections import namedtuple
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from peewee import (
+    DateField,
+    DateTimeField,
+    Expression,
+    Field,
+    FloatField,
+    IntegerField,
+    Model,
+)
+
+
+def _to_date(value: Any) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(value[:10])
+
+
+def _to_datetime(value: Any) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def _converter(field: Field) -> Callable[[Any], Any]:
+    if isinstance(field, DateTimeField):
+        return _to_datetime
+    if isinstance(field, DateField):
+        return _to_date
+    return field.python_value
+
+
+def _fields(model: Type[Model], columns: Sequence[str]) -> List[Field]:
+    """Fields for column or field names; all fields if none are given."""
+    if not columns:
+        return list(model._meta.sorted_fields)
+    fields = []
+    for name in columns:
+        field = model._meta.fields.get(name) or model._meta.columns.get(name)
+        if field is None:
+            raise ValueError(f"{model.__name__} has no column {name!r}")
+        fields.append(field)
+    return fields
+
+
+def _select(
+    model: Type[Model], fields: List[Field], where: Optional[Expression]
+) -> Any:
+    """Query for the fields, as a UNION ALL over partitions for sample models."""
+    # Imported here: src.sync depends on this package
+    from src.sync.partitions import SAMPLE_MODELS, partition_model, partitions, retarget
+
+    sources: List[Type[Model]] = [model]
+    if model in SAMPLE_MODELS:
+        sources = [partition_model(model, p.month) for p in partitions(model)] + sources
+
+    query = None
+    for source in sources:
+        part = source.select(*[source._meta.columns[f.column_name] for f in fields])
+        if where is not None:
+            part = part.where(where if source is model else retarget(where, source))
+        query = part if query is None else query + part
+    return query
+
+
+def _execute(
+    model: Type[Model],
+    fields: List[Field],
+    where: Optional[Expression],
+    order_by: Optional[Iterable[Any]],
+    limit: Optional[int],
+    convert: Iterable[str],
+) -> List[tuple]:
+    query = _select(model, fields, where)
+    if order_by is not None:
+        query = query.order_by(*order_by)
+    if limit is not None:
+        query = query.limit(limit)
+    sql, params = query.sql()
+    rows = model._meta.database.execute_sql(sql, params).fetchall()
+
+    converters = [
+        (index, _converter(field))
+        for index, field in enumerate(fields)
+        if field.name in convert or field.column_name in convert
+    ]
+    if converters:
+        rows = [list(row) for row in rows]
+        for row in rows:
+            for index, conv in converters:
+                row[index] = conv(row[index])
+        rows = [tuple(row) for row in rows]
+    return rows
+
+
+def read_tuples(
+    model: Type[Model],
+    *columns: str,
+    where: Optional[Expression] = None,
+    order_by: Optional[Iterable[Any]] = None,
+    limit: Optional[int] = None,
+    convert: Iterable[str] = (),
+) -> List[tuple]:
+    """Read rows of a model as plain tuples.
+
+    Args:
+        model: Model to read.
+        columns: Field or column names to select, in order; all if omitted.
+        where: Peewee filter expression.
+        order_by: Peewee ordering expressions.
+        limit: Maximum number of rows.
+        convert: Columns to convert to Python values (dates and datetimes
+            are parsed from their ISO text); others are returned raw.
+    """
+    fields = _fields(model, columns)
+    return _execute(model, fields, where, order_by, limit, set(convert))
+
+
+@lru_cache(maxsize=None)
+def _row_class(model_name: str, names: Tuple[str, ...]):
+    return namedtuple(f"{model_name}Row", names)
+
+
+def read_rows(
+    model: Type[Model],
+    *columns: str,
+    where: Optional[Expression] = None,
+    order_by: Optional[Iterable[Any]] = None,
+    limit: Optional[int] = None,
+    convert: Iterable[str] = (),
+) -> List[tuple]:
+    """Read rows of a model as named tuples with attribute access.
+
+    Takes the same arguments as `read_tuples`. Foreign keys are named by
+    their column, e.g. ``sleep_period_id``.
+    """
+    fields = _fields(model, columns)
+    row_class = _row_class(model.__name__, tuple(field.column_name for field in fields))
+    rows = _execute(model, fields, where, order_by, limit, set(convert))
+    return list(map(row_class._make, rows))
+
+
+def read_columns(
+    model: Type[Model],
+    *columns: str,
+    where: Optional[Expression] = None,
+    order_by: Optional[Iterable[Any]] = None,
+    limit: Optional[int] = None,
+    convert: Iterable[str] = (),
+) -> Dict[str, Sequence[Any]]:
+    """Read a model column-wise.
+
+    Takes the same arguments as `read_tuples`. Integer columns without
+    nulls become ``array('q')`` and other numeric columns ``array('d')``
+    with NaN for nulls; the rest are lists.
+    """
+    fields = _fields(model, columns)
+    rows = _execute(model, fields, where, order_by, limit, set(convert))
+    values = list(zip(*rows)) if rows else [() for _ in fields]
+
+    result: Dict[str, Sequence[Any]] = {}
+    for field, column in zip(fields, values):
+        converted = field.name in convert or field.column_name in convert
+        if isinstance(field, (IntegerField, FloatField)) and not converted:
+            if isinstance(field, IntegerField) and None not in column:
+                result[field.column_name] = array("q", column)
+            else:
+                result[field.column_name] = array(
+                    "d", [math.nan if v is None else v for v in column]
+                )
+        else:
+            result[field.column_name] = list(column)
+    return result
+
+
+def read_sql(model: Type[Model], sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+    """Run parameterized SQL on a model's database and return raw tuples."""
+    return model._meta.database.execute_sql(sql, params).fetchall()
@@ -0,0 +1,249 @@
+"""
+One database file per account, with a catalog and cross-account queries.
+
+Each account's data lives in its own SQLite shard under `SHARD_DIR`, so
+syncs of different accounts (in separate processes) never wait on each
+other's writer lock. `ShardCatalog` keeps track of the shards. A process
+points the shared `db` at one account's shard with `use_account` before
+creating tables or syncing:
+
+    use_account("alice")
+    initialize_db()
+
+Cross-account queries attach the shards to one connection on demand. Each
+table becomes a temporary view over all attached shards with an extra
+``account`` column, so aggregates are plain SQL:
+
+    with attach_shards() as conn:
+        conn.execute("SELECT account, avg(score) FROM daily_sleeps GROUP BY account")
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+from urllib.request import pathname2url
+
+from .database import db, project_root
+
+SHARD_DIR = Path(os.getenv("OURA_SHARD_DIR", str(project_root / "accounts")))
+CATALOG_NAME = "catalog.db"
+
+
+def shard_filename(account: str) -> str:
+    """File name of an account's shard, e.g. ``alice-2bd806c9.db``.
+
+    The hash keeps names unique when accounts differ only in characters
+    that are not safe in file names.
+    """
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", account).strip("._") or "account"
+    digest = hashlib.sha256(account.encode()).hexdigest()[:8]
+    return f"{slug}-{digest}.db"
+
+
+class ShardCatalog:
+    """Registry of account shards in a directory."""
+
+    def __init__(self, root: Union[str, Path] = SHARD_DIR):
+        """Open (or create) the catalog of a shard directory.
+
+        Args:
+            root: Directory holding the shards and the catalog.
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.root / CATALOG_NAME), timeout=30, check_same_thread=False
+        )
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS shards (
+                account TEXT PRIMARY KEY,
+                filename TEXT NOT NULL UNIQUE,
+                created_at TEXT NOT NULL,
+                synced_at TEXT
+            )
+            """)
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "ShardCatalog":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def register(self, account: str) -> Path:
+        """Add an account if it is new and return its shard path."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO shards (account, filename, created_at) "
+                "VALUES (?, ?, ?)",
+                (
+                    account,
+                    shard_filename(account),
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+            self._conn.commit()
+        return self.path(account)
+
+    def path(self, account: str) -> Path:
+        """Shard path of a registered account."""
+        row = self._conn.execute(
+            "SELECT filename FROM shards WHERE account = ?", (account,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown account {account!r}")
+        return self.root / row[0]
+
+    def store(self, account: str, name: Union[str, Path]) -> Path:
+        """Path of a per-account store next to the account's shard.
+
+        Response archives, DuckDB mirrors and rate-limit state are shared
+        when no account is used; with one they live in a directory named
+        after the shard, e.g. ``alice-2bd806c9/oura_archive``.
+
+        Args:
+            account: Registered account.
+            name: Store path whose last component is kept.
+        """
+        directory = self.path(account).with_suffix("")
+        directory.mkdir(exist_ok=True)
+        return directory / Path(name).name
+
+    def accounts(self) -> List[str]:
+        """Registered accounts, sorted by name."""
+        return [
+            account
+            for (account,) in self._conn.execute(
+                "SELECT account FROM shards ORDER BY account"
+            )
+        ]
+
+    def record_sync(self, account: str) -> None:
+        """Stamp an account's shard as synced now."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE shards SET synced_at = ? WHERE account = ?",
+                (datetime.now(timezone.utc).isoformat(), account),
+            )
+            self._conn.commit()
+
+    def synced_at(self, account: str) -> Optional[datetime]:
+        row = self._conn.execute(
+            "SELECT synced_at FROM shards WHERE account = ?", (account,)
+        ).fetchone()
+        return datetime.fromisoformat(row[0]) if row and row[0] else None
+
+
+def use_account(account: str, catalog: Optional[ShardCatalog] = None) -> Path:
+    """Point the shared database at an account's shard, registering it if new.
+
+    Returns:
+        Path of the shard.
+    """
+    if catalog is None:
+        with ShardCatalog() as default:
+            path = default.register(account)
+    else:
+        path = catalog.register(account)
+    db.close()
+    db.init(str(path), timeout=db._timeout)
+    return path
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+@contextmanager
+def attach_shards(
+    accounts: Optional[Sequence[str]] = None,
+    catalog: Optional[ShardCatalog] = None,
+    tables: Optional[Sequence[str]] = None,
+) -> Iterator[sqlite3.Connection]:
+    """Connection with account shards attached read-only, for aggregates.
+
+    Every table becomes a temporary view of the same name over all attached
+    shards that have it, with the account in a leading ``account`` column.
+    Shards that are missing columns (from older schemas) only contribute
+    the columns all of them share.
+
+    Args:
+        accounts: Accounts to attach; defaults to all registered ones. At
+            most SQLite's attached-database limit (usually 10) can be
+            attached at once.
+        catalog: Catalog to resolve accounts in; defaults to `SHARD_DIR`.
+        tables: Tables to expose; defaults to every table in the shards.
+
+    Yields:
+        An in-memory connection with the views defined.
+    """
+    owned = catalog is None
+    catalog = catalog or ShardCatalog()
+    conn = sqlite3.connect(":memory:", uri=True, check_same_thread=False)
+    try:
+        accounts = list(accounts if accounts is not None else catalog.accounts())
+        limit = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+        if len(accounts) > limit:
+            raise ValueError(
+                f"Cannot attach {len(accounts)} shards at once; SQLite allows "
+                f"{limit}. Query the accounts in smaller groups."
+            )
+
+        # Table -> {schema: [columns]} over the attached shards
+        layout: Dict[str, Dict[str, List[str]]] = {}
+        schemas: Dict[str, str] = {}
+        for index, account in enumerate(accounts):
+            path = catalog.path(account)
+            if not path.exists():
+                continue
+            schema = f"shard_{index}"
+            conn.execute(
+                f"ATTACH DATABASE ? AS {schema}",
+                (f"file:{pathname2url(str(path))}?mode=ro",),
+            )
+            schemas[schema] = account
+            for (table,) in conn.execute(
+                f"SELECT name FROM {schema}.sqlite_master "
+                "WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+            ).fetchall():
+                if tables is not None and table not in tables:
+                    continue
+                columns = [
+                    row[1]
+                    for row in conn.execute(
+                        f"PRAGMA {schema}.table_info({_quote(table)})"
+                    )
+                ]
+                layout.setdefault(table, {})[schema] = columns
+
+        for table, shards in layout.items():
+            shared = set.intersection(*(set(c) for c in shards.values()))
+            columns = [c for c in next(iter(shards.values())) if c in shared]
+            selects = [
+                f"SELECT {_literal(schemas[schema])} AS account, "
+                f"{', '.join(_quote(c) for c in columns)} "
+                f"FROM {schema}.{_quote(table)}"
+                for schema in shards
+            ]
+            conn.execute(
+                f"CREATE TEMP VIEW {_quote(table)} AS " + " UNION ALL ".join(selects)
+            )
+        yield conn
+    finally:
+        conn.close()
+        if owned:
+            catalog.close()
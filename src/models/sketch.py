@@ -0,0 +1,20 @@
+"""
+Model holding mergeable quantile sketches of metrics per month.
+"""
+
+from peewee import *
+from .base import BaseModel
+
+
+class MetricSketch(BaseModel):
+    """A serialized t-digest of one metric's values in one month."""
+
+    metric_sketch_id = AutoField()
+    metric = CharField()
+    bucket = CharField()  # month as YYYY-MM
+    count = IntegerField()
+    digest = BlobField()
+
+    class Meta:
+        table_name = "metric_sketches"
+        indexes = ((("metric", "bucket"), True),)
@@ -1,5 +1,5 @@
 from peewee import *
-from .base import BaseModel
+from .base import BaseModel, HashedModel
 
 
 class SleepSummary(BaseModel):
@@ -27,9 +27,11 @@ class SleepContributor(BaseModel):
         table_name = "sleep_contributors"
 
 
-class SleepPeriod(BaseModel):
+class SleepPeriod(HashedModel):
     sleep_period_id = CharField(primary_key=True)
-    sleep_summary = ForeignKeyField(SleepSummary, backref="periods")
+    # Null until the daily sleep of the period's day has been synced
+    sleep_summary = ForeignKeyField(SleepSummary, backref="periods", null=True)
+    day = DateField(null=True)
     start_datetime = DateTimeField()
     end_datetime = DateTimeField()
     total_sleep_duration = IntegerField(null=True)  # in seconds
@@ -45,6 +47,11 @@ class SleepPeriod(BaseModel):
     bedtime_start = DateTimeField(null=True)
     bedtime_end = DateTimeField(null=True)
     readiness_score_delta = IntegerField(null=True)
+    # One digit per 5 minutes: 1 = deep, 2 = light, 3 = REM, 4 = awake
+    hypnogram = TextField(null=True)
+    # Digest of the embedded heart rate and HRV series, so a change to them
+    # alone still changes the row's content hash
+    series_hash = CharField(null=True)
 
     class Meta:
         table_name = "sleep_periods"
@@ -53,7 +60,7 @@ class SleepPeriod(BaseModel):
 class SleepHeartRate(BaseModel):
     sleep_hr_id = AutoField()
     sleep_period = ForeignKeyField(SleepPeriod, backref="heart_rate_data")
-    timestamp = DateTimeField()
+    timestamp = DateTimeField(index=True)
     bpm = IntegerField(null=True)
 
     class Meta:
@@ -63,8 +70,28 @@ class SleepHeartRate(BaseModel):
 class SleepHRV(BaseModel):
     sleep_hrv_id = AutoField()
     sleep_period = ForeignKeyField(SleepPeriod, backref="hrv_data")
-    timestamp = DateTimeField()
+    timestamp = DateTimeField(index=True)
     rmssd = IntegerField(null=True)
 
     class Meta:
         table_name = "sleep_hrvs"
+
+
+class SleepStageStats(BaseModel):
+    """Sleep stage statistics derived from a sleep period's hypnogram."""
+
+    sleep_stage_stats_id = AutoField()
+    sleep_period = ForeignKeyField(SleepPeriod, backref="stage_stats", unique=True)
+    deep_minutes = IntegerField()
+    light_minutes = IntegerField()
+    rem_minutes = IntegerField()
+    awake_minutes = IntegerField()
+    sleep_onset_minutes = IntegerField(null=True)  # bedtime to first sleep
+    rem_latency_minutes = IntegerField(null=True)  # first sleep to first REM
+    stage_transitions = IntegerField()
+    awakenings = IntegerField()  # awake bouts between first and last sleep
+    longest_deep_minutes = IntegerField()
+    longest_awake_minutes = IntegerField()
+
+    class Meta:
+        table_name = "sleep_stage_stats"
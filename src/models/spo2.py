@@ -3,10 +3,10 @@ Models for SpO2 (blood oxygen saturation) data from Oura API.
 """
 
 from peewee import *
-from .base import BaseModel
+from .base import BaseModel, HashedModel
 
 
-class DailySpO2(BaseModel):
+class DailySpO2(HashedModel):
     """Model for daily SpO2 data."""
 
     daily_spo2_id = CharField(primary_key=True)
@@ -24,7 +24,7 @@ class SpO2Sample(BaseModel):
 
     spo2_sample_id = CharField(primary_key=True)
     daily_spo2 = ForeignKeyField(DailySpO2, backref="samples")
-    timestamp = DateTimeField()
+    timestamp = DateTimeField(index=True)
     value = FloatField()
 
     class Meta:
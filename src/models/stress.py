@@ -6,10 +6,10 @@ from datetime import datetime
 from typing import Optional
 
 from peewee import *
-from src.models.base import BaseModel
+from src.models.base import BaseModel, HashedModel
 
 
-class DailyStress(BaseModel):
+class DailyStress(HashedModel):
     """Model for daily stress data."""
 
     daily_stress_id = CharField(primary_key=True)
@@ -31,7 +31,7 @@ class StressSample(BaseModel):
 
     stress_sample_id = CharField(primary_key=True)
     daily_stress = ForeignKeyField(DailyStress, backref="samples")
-    timestamp = DateTimeField()
+    timestamp = DateTimeField(index=True)
     value = FloatField()
     source = CharField()
 
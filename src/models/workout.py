@@ -6,10 +6,10 @@ from datetime import datetime
 from typing import Optional
 
 from peewee import *
-from .base import BaseModel
+from .base import HashedModel
 
 
-class Workout(BaseModel):
+class Workout(HashedModel):
     """
     Model for workout data from Oura API.
     Represents a single workout session tracked by the Oura Ring.
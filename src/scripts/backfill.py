@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Script to repair missing or stale days in the Oura Ring database.
+
+Prints the backfill plan before running it:
+
+    python -m src.scripts.backfill --start 2024-01-01 --dry-run
+"""
+
+import argparse
+import logging
+import os
+from datetime import date
+
+from src.api import OuraAPI
+from src.models import ShardCatalog, db, initialize_db, use_account
+from src.sync import (
+    SYNC_ORDER,
+    ChangeFeed,
+    plan_backfill,
+    refresh_baselines,
+    refresh_facts,
+    refresh_sketches,
+    run_backfill,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(message)s",
+    handlers=[logging.FileHandler("oura_sync.log"), logging.StreamHandler()],
+)
+logger = logging.getLogger(__name__)
+
+# Disable noisy peewee logging
+logging.getLogger("peewee").setLevel(logging.WARNING)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2024, 1, 1))
+    parser.add_argument("--end", type=date.fromisoformat, default=date.today())
+    parser.add_argument(
+        "--endpoint",
+        action="append",
+        choices=SYNC_ORDER,
+        help="Endpoint to repair; may be repeated. Defaults to all.",
+    )
+    parser.add_argument(
+        "--settle-days",
+        type=int,
+        default=2,
+        help="Re-sync days last synced less than this many days after them.",
+    )
+    parser.add_argument(
+        "--normalize-workers",
+        type=int,
+        default=0,
+        help="Decode and normalize response pages in this many processes.",
+    )
+    parser.add_argument(
+        "--account",
+        help="Repair this account's shard (see src.models.shards) instead of "
+        "oura.db.",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Print the plan without running it."
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main function."""
+    args = parse_args()
+    duckdb_path = os.getenv("OURA_DUCKDB_PATH")
+    rate_limit_path = None
+    if args.account:
+        # The account's mirror and request budget live next to its shard
+        with ShardCatalog() as catalog:
+            use_account(args.account, catalog)
+            rate_limit_path = catalog.store(args.account, "rate_limit.db")
+            if duckdb_path:
+                duckdb_path = catalog.store(args.account, duckdb_path)
+    initialize_db()
+
+    plan = plan_backfill(args.start, args.end, args.endpoint, args.settle_days)
+    print(plan.summary())
+    if args.dry_run or not plan.requests:
+        return
+
+    api = OuraAPI(
+        normalize_workers=args.normalize_workers, rate_limit_path=rate_limit_path
+    )
+    try:
+        results = run_backfill(api, plan)
+    finally:
+        api.close()
+    # Bring the derived tables in step with the repaired days
+    with db.atomic():
+        refresh_baselines(results)
+    with db.atomic():
+        refresh_facts(results)
+    with db.atomic():
+        refresh_sketches(results)
+    feed_dir = os.getenv("OURA_CHANGE_FEED")
+    if feed_dir:
+        with ChangeFeed(feed_dir) as feed:
+            feed.publish(results, account=args.account)
+
+    # Keep the optional DuckDB analytical mirror in step
+    if duckdb_path:
+        from src.analytics import update_mirror
+
+        update_mirror(results, duckdb_path)
+    for result in results.values():
+        logger.info(str(result))
+
+
+if __name__ == "__main__":
+    main()
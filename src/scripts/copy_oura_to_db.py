@@ -1,21 +1,50 @@
 #!/usr/bin/env python3
 """
 Script to populate the Oura Ring database tables using the API wrapper.
+
+Pass --profile to find out where a slow sync spends its time:
+
+    python -m src.scripts.copy_oura_to_db --workers 4 --profile sync.json
+
+Pass --shadow to sync into a copy of the database and swap it into place
+when done, so dashboards reading oura.db never see a half-written sync.
+
+Pass --account to sync one account into its own database file, so syncs
+of different accounts can run side by side:
+
+    OURA_API_TOKEN=... python -m src.scripts.copy_oura_to_db --account alice
 """
+
+import argparse
 import logging
-from datetime import datetime
-from typing import Optional
+import os
+from contextlib import nullcontext
+from datetime import date, datetime
+from typing import Dict, Optional
 
-from src.api import OuraAPI
+from src.api import OuraAPI, ResponseArchive
 from src.models import (
-    db,
     PersonalInfo,
-    DailyActivity,
-    DailySleep,
-    DailyReadiness,
-    SleepPeriod,
+    ShardCatalog,
+    db,
     initialize_db,
+    use_account,
 )
+from src.sync import (
+    FETCHERS,
+    SYNC_ORDER,
+    ChangeFeed,
+    SyncPipeline,
+    WriteResult,
+    personal_info_row,
+    refresh_baselines,
+    refresh_facts,
+    refresh_sketches,
+    sync_range,
+    write_records,
+)
+from src.sync.profiling import profile_run, stage
+from src.sync.shadow import shadow_database
 
 # Configure logging - simplified and focused
 logging.basicConfig(
@@ -29,126 +58,187 @@ logger = logging.getLogger(__name__)
 logging.getLogger("peewee").setLevel(logging.WARNING)
 
 
+def _merge(results: Dict[str, WriteResult], new: Dict[str, WriteResult]) -> None:
+    """Accumulate write results by table."""
+    for table, result in new.items():
+        if table in results:
+            results[table].merge(result)
+        else:
+            results[table] = result
+
+
 def copy_daily_data(
-    api: OuraAPI, start_date: str, end_date: Optional[str] = None
-) -> None:
-    """Copy daily data from Oura API to database."""
+    api: OuraAPI,
+    start_date: str,
+    end_date: Optional[str] = None,
+    workers: int = 0,
+) -> Dict[str, WriteResult]:
+    """Copy daily data from Oura API to database.
+
+    Rows are upserted by content hash, so re-syncing an overlap window only
+    writes rows that changed upstream.
+
+    Args:
+        api: API client.
+        start_date: Start date in YYYY-MM-DD format.
+        end_date: End date in YYYY-MM-DD format. Defaults to today.
+        workers: If set, fetch through a `SyncPipeline` with this many fetch
+            workers and a dedicated writer thread instead of one transaction.
+
+    Returns:
+        Write results keyed by table name.
+    """
     if not end_date:
         end_date = datetime.now().strftime("%Y-%m-%d")
 
     logger.info(f"Starting data sync from {start_date} to {end_date}")
 
+    results: Dict[str, WriteResult] = {}
+
     try:
-        with db.atomic():
+        with stage("sync", "commit"), db.atomic():
             # Personal Info
-            personal_info = api.get_personal_info()
+            with stage("personal_info", "fetch"):
+                personal_info = api.get_personal_info()
             if personal_info:
-                PersonalInfo.delete().execute()
-                PersonalInfo.create(**personal_info)
-                logger.info("Updated personal info")
-
-            # Daily Activity
-            activity_data = api.get_daily_activity(start_date=start_date)
-            DailyActivity.delete().execute()
-            for activity in activity_data:
-                # Rest of the activity processing code remains the same...
-                contributors = activity.pop("contributors", {})
-                # ... (keep existing processing logic)
-                DailyActivity.create(**activity)
-            logger.info(f"Processed {len(activity_data)} activity records")
-
-            # Daily Sleep
-            sleep_data = api.get_daily_sleep(start_date=start_date)
-            DailySleep.delete().execute()
-            sleep_periods_count = 0
-            for sleep in sleep_data:
-                contributors = sleep.pop("contributors", {})
-                periods = sleep.pop("periods", [])
-
-                if "day" in sleep:
-                    sleep["day"] = datetime.strptime(sleep["day"], "%Y-%m-%d").date()
-                if "timestamp" in sleep and isinstance(sleep["timestamp"], str):
-                    sleep["timestamp"] = datetime.fromisoformat(sleep["timestamp"])
-
-                if contributors:
-                    sleep.update(
-                        {
-                            "deep_sleep": contributors.get("deep_sleep"),
-                            "efficiency": contributors.get("efficiency"),
-                            "latency": contributors.get("latency"),
-                            "rem_sleep": contributors.get("rem_sleep"),
-                            "restfulness": contributors.get("restfulness"),
-                            "timing": contributors.get("timing"),
-                            "total_sleep": contributors.get("total_sleep"),
-                        }
-                    )
-
-                DailySleep.create(**sleep)
-
-                # Handle sleep periods
-                for period in periods:
-                    if period.get("bedtime_start") and period.get("bedtime_end"):
-                        SleepPeriod.create(
-                            sleep_period_id=str(period.get("id", "")),
-                            start_datetime=datetime.fromisoformat(
-                                period["bedtime_start"]
-                            ),
-                            end_datetime=datetime.fromisoformat(period["bedtime_end"]),
-                            total_sleep_duration=period.get("total_sleep_duration"),
-                            awake_time=period.get("awake_time"),
-                            light_sleep_duration=period.get("light_sleep_duration"),
-                            rem_sleep_duration=period.get("rem_sleep_duration"),
-                            deep_sleep_duration=period.get("deep_sleep_duration"),
-                            restless_periods=period.get("restless_periods"),
-                            average_heart_rate=period.get("average_heart_rate"),
-                            lowest_heart_rate=period.get("lowest_heart_rate"),
-                            average_hrv=period.get("average_hrv"),
-                            temperature_delta=period.get("temperature_delta"),
-                            bedtime_start=datetime.fromisoformat(
-                                period["bedtime_start"]
-                            ),
-                            bedtime_end=datetime.fromisoformat(period["bedtime_end"]),
-                            readiness_score_delta=period.get("readiness_score_delta"),
-                        )
-                sleep_periods_count += len(periods)
-
-            logger.info(
-                f"Processed {len(sleep_data)} sleep records with {sleep_periods_count} sleep periods"
-            )
-
-            # Daily Readiness
-            readiness_data = api.get_daily_readiness(start_date=start_date)
-            DailyReadiness.delete().execute()
-            for readiness in readiness_data:
-                # ... (keep existing readiness processing logic)
-                pass
-            logger.info(f"Processed {len(readiness_data)} readiness records")
+                with stage("personal_info", "normalize"):
+                    row = personal_info_row(personal_info)
+                with stage("personal_info", "write"):
+                    result = write_records(PersonalInfo, [row])
+                results[result.table] = result
+                logger.info(f"Processed personal info ({result})")
+
+            # Daily activity, sleep, sleep periods and readiness
+            if not workers:
+                for endpoint in SYNC_ORDER:
+                    _merge(results, sync_range(api, endpoint, start_date, end_date))
+
+        if workers:
+            # The writer thread needs the database to itself, so this runs
+            # outside the transaction above.
+            pipeline = SyncPipeline(api, workers=workers)
+            _merge(results, pipeline.run(pipeline.jobs(FETCHERS, start_date, end_date)))
+            # Needs the daily sleep committed by the pipeline
+            _merge(results, sync_range(api, "sleep_periods", start_date, end_date))
+
+        # Roll the HRV, resting heart rate and temperature baselines forward
+        with stage("baselines", "write"), db.atomic():
+            refresh_baselines(results)
+
+        # Refresh the per-day fact table for the days that changed
+        with stage("daily_facts", "write"), db.atomic():
+            refresh_facts(results)
+
+        # Rebuild the percentile sketches of the months that changed
+        with stage("sketches", "write"), db.atomic():
+            refresh_sketches(results)
 
         logger.info("Data sync completed successfully")
+        return results
 
     except Exception as e:
         logger.error(f"Sync failed: {str(e)}")
         raise
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2024, 1, 1))
+    parser.add_argument(
+        "--end", type=date.fromisoformat, help="Last day to sync. Defaults to today."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Fetch through a pipeline with this many workers.",
+    )
+    parser.add_argument(
+        "--normalize-workers",
+        type=int,
+        default=0,
+        help="Decode and normalize response pages in this many processes.",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="REPORT",
+        help="Profile the sync and write a JSON report (plus a .prof pstats "
+        "dump) to this path.",
+    )
+    parser.add_argument(
+        "--account",
+        help="Sync this account's shard (see src.models.shards) instead of oura.db.",
+    )
+    parser.add_argument(
+        "--shadow",
+        action="store_true",
+        help="Sync into a shadow copy of the database and atomically swap it "
+        "in when done.",
+    )
+    return parser.parse_args()
+
+
 def main():
     """Main function."""
-    api = OuraAPI()
+    args = parse_args()
+
+    # Route storage to the account's shard before creating tables
+    catalog = ShardCatalog() if args.account else None
+    if catalog:
+        use_account(args.account, catalog)
+
+    # Optionally keep every raw response for offline reprocessing
+    archive_dir = os.getenv("OURA_ARCHIVE_DIR")
+    if archive_dir and catalog:
+        archive_dir = catalog.store(args.account, archive_dir)
+    api = OuraAPI(
+        archive=ResponseArchive(archive_dir) if archive_dir else None,
+        normalize_workers=args.normalize_workers,
+        rate_limit_path=(
+            catalog.store(args.account, "rate_limit.db") if catalog else None
+        ),
+    )
 
     # Create database tables
     initialize_db()
 
     try:
-        # Copy all time daily data
-        start_date = datetime(2024, 1, 1).strftime("%Y-%m-%d")
-        copy_daily_data(api, start_date)
+        with (
+            profile_run(args.profile, api) if args.profile else nullcontext(),
+            shadow_database(db) if args.shadow else nullcontext(),
+        ):
+            results = copy_daily_data(
+                api,
+                args.start.isoformat(),
+                args.end.isoformat() if args.end else None,
+                workers=args.workers,
+            )
         logger.info("Successfully copied Oura Ring data to database")
+        if catalog:
+            catalog.record_sync(args.account)
+
+        # Tell downstream consumers which rows changed
+        feed_dir = os.getenv("OURA_CHANGE_FEED")
+        if feed_dir:
+            with ChangeFeed(feed_dir) as feed:
+                feed.publish(results, account=args.account)
+
+        # Keep the optional DuckDB analytical mirror in step
+        duckdb_path = os.getenv("OURA_DUCKDB_PATH")
+        if duckdb_path and catalog:
+            duckdb_path = catalog.store(args.account, duckdb_path)
+        if duckdb_path:
+            from src.analytics import update_mirror
 
-        # On to
+            update_mirror(results, duckdb_path)
 
     except Exception as e:
         logger.error(f"Error copying data: {e}")
         raise
+    finally:
+        api.close()
+        if catalog:
+            catalog.close()
 
 
 if __name__ == "__main__":
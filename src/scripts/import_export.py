@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Script to load an Oura account data export into the database.
+
+Imports the history in the export archive, then syncs the days since the
+export from the API:
+
+    OURA_API_TOKEN=... python -m src.scripts.import_export oura-export.zip
+
+Pass --no-sync to only import the archive, and --account to import into an
+account's own database file.
+"""
+
+import argparse
+import logging
+import os
+from pathlib import Path
+
+from src.api import OuraAPI
+from src.models import ShardCatalog, db, initialize_db, use_account
+from src.scripts.copy_oura_to_db import copy_daily_data
+from src.sync import (
+    ChangeFeed,
+    import_export,
+    refresh_baselines,
+    refresh_facts,
+    refresh_sketches,
+)
+from src.sync.export import BATCH_RECORDS
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(message)s",
+    handlers=[logging.FileHandler("oura_sync.log"), logging.StreamHandler()],
+)
+logger = logging.getLogger(__name__)
+
+# Disable noisy peewee logging
+logging.getLogger("peewee").setLevel(logging.WARNING)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("export", type=Path, help="Path of the export zip archive.")
+    parser.add_argument(
+        "--batch-records",
+        type=int,
+        default=BATCH_RECORDS,
+        help="Records normalized and written per transaction.",
+    )
+    parser.add_argument(
+        "--no-sync",
+        action="store_true",
+        help="Only import the archive; do not sync later days from the API.",
+    )
+    parser.add_argument(
+        "--account",
+        help="Import into this account's shard (see src.models.shards) instead "
+        "of oura.db.",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main function."""
+    args = parse_args()
+    catalog = ShardCatalog() if args.account else None
+    if catalog:
+        use_account(args.account, catalog)
+    initialize_db()
+
+    try:
+        imported = import_export(args.export, batch_records=args.batch_records)
+        results = imported.results
+        with db.atomic():
+            refresh_baselines(results)
+        with db.atomic():
+            refresh_facts(results)
+        with db.atomic():
+            refresh_sketches(results)
+
+        # Hand off to the API from the export's last day
+        if not args.no_sync and imported.last_day:
+            api = OuraAPI(
+                rate_limit_path=(
+                    catalog.store(args.account, "rate_limit.db") if catalog else None
+                )
+            )
+            try:
+                synced = copy_daily_data(api, imported.last_day.isoformat())
+            finally:
+                api.close()
+            for table, result in synced.items():
+                if table in results:
+                    results[table].merge(result)
+                else:
+                    results[table] = result
+
+        if catalog:
+            catalog.record_sync(args.account)
+        feed_dir = os.getenv("OURA_CHANGE_FEED")
+        if feed_dir:
+            with ChangeFeed(feed_dir) as feed:
+                feed.publish(results, account=args.account)
+
+        # Keep the optional DuckDB analytical mirror in step
+        duckdb_path = os.getenv("OURA_DUCKDB_PATH")
+        if duckdb_path and catalog:
+            duckdb_path = catalog.store(args.account, duckdb_path)
+        if duckdb_path:
+            from src.analytics import update_mirror
+
+            update_mirror(results, duckdb_path)
+    finally:
+        if catalog:
+            catalog.close()
+
+    for result in results.values():
+        logger.info(str(result))
+
+
+if __name__ == "__main__":
+    main()
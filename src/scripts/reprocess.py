@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Script to rebuild Oura Ring database tables from the raw-response archive.
+
+Runs the current normalizers and row builders over archived pages without
+calling the API, e.g. after a normalization fix:
+
+    python -m src.scripts.reprocess --endpoint daily_sleep --start 2024-01-01
+"""
+
+import argparse
+import logging
+import os
+from datetime import date
+from typing import Dict
+
+from src.api import ArchiveClient, OuraAPI, ResponseArchive
+from src.models import ShardCatalog, db, initialize_db, use_account
+from src.models.database import project_root
+from src.sync import (
+    FETCHERS,
+    SYNC_ORDER,
+    ChangeFeed,
+    WriteResult,
+    refresh_baselines,
+    refresh_facts,
+    refresh_sketches,
+    sync_sleep_periods,
+    write_batches,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(message)s",
+    handlers=[logging.FileHandler("oura_sync.log"), logging.StreamHandler()],
+)
+logger = logging.getLogger(__name__)
+
+# Disable noisy peewee logging
+logging.getLogger("peewee").setLevel(logging.WARNING)
+
+DEFAULT_ARCHIVE = os.getenv("OURA_ARCHIVE_DIR", str(project_root / "oura_archive"))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--archive",
+        help="Archive to replay. Defaults to OURA_ARCHIVE_DIR, or the "
+        "account's own archive with --account.",
+    )
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2024, 1, 1))
+    parser.add_argument("--end", type=date.fromisoformat, default=date.today())
+    parser.add_argument(
+        "--endpoint",
+        action="append",
+        choices=SYNC_ORDER,
+        help="Endpoint to rebuild; may be repeated. Defaults to all.",
+    )
+    parser.add_argument(
+        "--account",
+        help="Rebuild this account's shard (see src.models.shards) instead of "
+        "oura.db.",
+    )
+    return parser.parse_args()
+
+
+def reprocess(
+    api: OuraAPI, endpoint: str, start_day: date, end_day: date
+) -> Dict[str, WriteResult]:
+    """Rebuild one endpoint's rows for a range of days from archived pages.
+
+    Coverage is left alone: reprocessing does not make the data any fresher.
+
+    Returns:
+        Write results keyed by table name.
+    """
+    with db.atomic():
+        if endpoint == "sleep_periods":
+            results = sync_sleep_periods(
+                api, start_day.isoformat(), end_day.isoformat()
+            )
+        else:
+            results = write_batches(
+                FETCHERS[endpoint](api, start_day.isoformat(), end_day.isoformat())
+            )
+        for result in results.values():
+            logger.info(f"Reprocessed {endpoint}: {result}")
+    return results
+
+
+def main():
+    """Main function."""
+    args = parse_args()
+    archive_dir = args.archive or DEFAULT_ARCHIVE
+    duckdb_path = os.getenv("OURA_DUCKDB_PATH")
+    if args.account:
+        # The account's pages and mirror live next to its shard
+        with ShardCatalog() as catalog:
+            use_account(args.account, catalog)
+            if not args.archive:
+                archive_dir = catalog.store(args.account, archive_dir)
+            if duckdb_path:
+                duckdb_path = catalog.store(args.account, duckdb_path)
+    initialize_db()
+
+    archive = ResponseArchive(archive_dir)
+    api = OuraAPI(client=ArchiveClient(archive))
+    results: Dict[str, WriteResult] = {}
+    try:
+        for endpoint in args.endpoint or SYNC_ORDER:
+            for table, result in reprocess(api, endpoint, args.start, args.end).items():
+                if table in results:
+                    results[table].merge(result)
+                else:
+                    results[table] = result
+    finally:
+        archive.close()
+
+    # Rebuild the derived tables from the reprocessed rows
+    with db.atomic():
+        refresh_baselines(results)
+    with db.atomic():
+        refresh_facts(results)
+    with db.atomic():
+        refresh_sketches(results)
+
+    # Tell downstream consumers which rows changed
+    feed_dir = os.getenv("OURA_CHANGE_FEED")
+    if feed_dir:
+        with ChangeFeed(feed_dir) as feed:
+            feed.publish(results, account=args.account)
+
+    # Keep the optional DuckDB analytical mirror in step
+    if duckdb_path:
+        from src.analytics import update_mirror
+
+        update_mirror(results, duckdb_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Script to apply the sample retention policy to the Oura Ring database.
+
+Moves samples older than the hot window into monthly partitions,
+downsamples old partitions and drops expired ones. Run it after syncs,
+e.g. nightly:
+
+    python -m src.scripts.retention --hot-months 2 --raw-months 12 --vacuum
+"""
+
+import argparse
+import logging
+
+from src.models import db, initialize_db
+from src.sync import RetentionPolicy, apply_retention
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(message)s",
+    handlers=[logging.FileHandler("oura_sync.log"), logging.StreamHandler()],
+)
+logger = logging.getLogger(__name__)
+
+# Disable noisy peewee logging
+logging.getLogger("peewee").setLevel(logging.WARNING)
+
+
+def parse_args() -> argparse.Namespace:
+    defaults = RetentionPolicy()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--hot-months",
+        type=int,
+        default=defaults.hot_months,
+        help="Months of samples kept in the hot tables, including this one.",
+    )
+    parser.add_argument(
+        "--raw-months",
+        type=int,
+        default=defaults.raw_months,
+        help="Downsample partitions older than this many months.",
+    )
+    parser.add_argument(
+        "--keep-months",
+        type=int,
+        default=defaults.keep_months,
+        help="Drop partitions older than this many months. Defaults to never.",
+    )
+    parser.add_argument(
+        "--resolution-minutes",
+        type=int,
+        default=defaults.resolution_minutes,
+        help="Interval downsampled partitions are averaged over.",
+    )
+    parser.add_argument(
+        "--vacuum", action="store_true", help="VACUUM the database afterwards."
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main function."""
+    args = parse_args()
+    initialize_db()
+
+    policy = RetentionPolicy(
+        hot_months=args.hot_months,
+        raw_months=args.raw_months,
+        keep_months=args.keep_months,
+        resolution_minutes=args.resolution_minutes,
+    )
+    stats = apply_retention(policy)
+    logger.info(
+        f"Moved {stats['moved']} samples, downsampled {stats['downsampled']} "
+        f"and dropped {stats['dropped']} partitions"
+    )
+    if args.vacuum:
+        db.execute_sql("VACUUM")
+
+
+if __name__ == "__main__":
+    main()
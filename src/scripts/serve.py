@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Script to serve the Oura Ring database through the read-only HTTP API.
+
+    python -m src.scripts.serve --port 8080
+
+Dashboards can then poll e.g. http://localhost:8080/daily?days=30 and get
+a 304 until the next sync.
+"""
+
+import argparse
+import logging
+
+from src.models import ShardCatalog
+from src.models.database import db_path
+from src.server import QueryService, make_server
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--database", default=str(db_path))
+    parser.add_argument(
+        "--account", help="Serve this account's shard instead of --database."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--connections", type=int, default=4, help="Read-only connections to keep."
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main function."""
+    args = parse_args()
+    if args.account:
+        with ShardCatalog() as catalog:
+            args.database = str(catalog.path(args.account))
+    service = QueryService(args.database, pool_size=args.connections)
+    server = make_server(service, args.host, args.port)
+    logger.info(f"Serving {args.database} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
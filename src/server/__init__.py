@@ -0,0 +1,16 @@
+"""
+Read-only HTTP query service over the synced Oura database.
+"""
+
+from .pool import ReadPool
+from .service import BadRequest, QueryService, Response, make_server
+
+__all__ = [
+    # Connections
+    "ReadPool",
+    # Service
+    "BadRequest",
+    "QueryService",
+    "Response",
+    "make_server",
+]
@@ -0,0 +1,74 @@
+"""
+Pool of read-only SQLite connections.
+"""
+
+import os
+import queue
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Tuple, Union
+
+
+class ReadPool:
+    """Fixed-size pool of read-only connections to one SQLite file.
+
+    Connections are opened lazily and reused across threads. A connection
+    opened before the file was replaced (e.g. by a shadow-database sync)
+    would keep reading the old file, so it is reopened when the file's inode
+    changes.
+    """
+
+    def __init__(self, path: Union[str, Path], size: int = 4):
+        """Initialize the pool.
+
+        Args:
+            path: SQLite database file.
+            size: Maximum number of open connections.
+        """
+        self.path = Path(path)
+        self.size = size
+        self._idle: "queue.LifoQueue[Tuple[sqlite3.Connection, int]]" = (
+            queue.LifoQueue()
+        )
+        self._slots = queue.Queue()
+        for _ in range(size):
+            self._slots.put(None)
+
+    def _open(self) -> Tuple[sqlite3.Connection, int]:
+        conn = sqlite3.connect(
+            f"file:{self.path.resolve()}?mode=ro", uri=True, check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        return conn, os.stat(self.path).st_ino
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection, waiting for one if all are in use."""
+        self._slots.get()
+        try:
+            try:
+                conn, inode = self._idle.get_nowait()
+            except queue.Empty:
+                conn, inode = self._open()
+            if inode != os.stat(self.path).st_ino:
+                conn.close()
+                conn, inode = self._open()
+        except BaseException:
+            self._slots.put(None)
+            raise
+
+        try:
+            yield conn
+        finally:
+            self._idle.put((conn, inode))
+            self._slots.put(None)
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            conn.close()
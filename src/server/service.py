@@ -0,0 +1,401 @@
+"""
+Cached read-only HTTP query service over the Oura database.
+
+Dashboards query this service instead of opening the database themselves.
+Queries run on a small pool of read-only SQLite connections, rendered JSON
+is cached until the database file changes, and the most common daily ranges
+are rendered as soon as a new sync is seen. Every response carries an ETag
+and a Last-Modified tied to the last sync, so polling clients mostly get a
+304 without any query work.
+
+Routes:
+    GET /daily?start=YYYY-MM-DD&end=YYYY-MM-DD (or ?days=N)
+        Per-day facts, one item per day.
+    GET /workouts?start=YYYY-MM-DD&end=YYYY-MM-DD (or ?days=N)
+        Workouts by day.
+    GET /heart_rate?start=<ISO datetime>&end=<ISO datetime>&limit=N
+        Sleep heart rate samples, paginated; follow `next` for more.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Type, Union
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from peewee import AutoField
+
+from src.models import (
+    BaseModel,
+    CoverageRange,
+    DailyFact,
+    SamplePartition,
+    SleepHeartRate,
+    Workout,
+)
+
+from .pool import ReadPool
+
+logger = logging.getLogger(__name__)
+
+# Daily ranges (in days, ending today) rendered ahead of time after each sync
+COMMON_RANGES = (7, 30, 90)
+DEFAULT_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 10000
+# SQLite header length; bytes 24-27 hold the file change counter
+HEADER_BYTES = 100
+
+# Normalized request: (route, *parameters)
+Key = Tuple[Any, ...]
+
+
+class BadRequest(ValueError):
+    """Raised for invalid query parameters."""
+
+
+@dataclass
+class Response:
+    """An HTTP response produced by `QueryService.handle`."""
+
+    status: int
+    body: bytes = b""
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+def _columns(model: Type[BaseModel]) -> str:
+    """Selected columns of a model, without its surrogate key and hash."""
+    return ", ".join(
+        f.column_name
+        for f in model._meta.sorted_fields
+        if not isinstance(f, AutoField) and f.name != "content_hash"
+    )
+
+
+def _param(params: Dict[str, List[str]], name: str) -> Optional[str]:
+    values = params.get(name)
+    return values[-1] if values else None
+
+
+def _day_range(params: Dict[str, List[str]]) -> Tuple[str, str]:
+    """Inclusive day range from ``start``/``end`` or ``days``."""
+    try:
+        days = _param(params, "days")
+        if days is not None:
+            end = date.today()
+            return (end - timedelta(days=int(days) - 1)).isoformat(), end.isoformat()
+        start, end = _param(params, "start"), _param(params, "end")
+        if not start:
+            raise BadRequest("start or days is required")
+        end_day = date.fromisoformat(end) if end else date.today()
+        return date.fromisoformat(start).isoformat(), end_day.isoformat()
+    except ValueError as e:
+        raise BadRequest(str(e)) from e
+
+
+def _utc(value: Optional[str], name: str) -> str:
+    """An ISO datetime parameter in the format timestamps are stored in."""
+    if not value:
+        raise BadRequest(f"{name} is required")
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError as e:
+        raise BadRequest(str(e)) from e
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return str(parsed.astimezone(timezone.utc))
+
+
+class QueryService:
+    """Answers read API requests from a SQLite database file.
+
+    The service is transport-independent; `make_server` exposes it over HTTP.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        pool_size: int = 4,
+        cache_entries: int = 256,
+        common_ranges: Tuple[int, ...] = COMMON_RANGES,
+    ):
+        """Initialize the service.
+
+        Args:
+            path: SQLite database file.
+            pool_size: Read-only connections to keep.
+            cache_entries: Rendered responses to keep, least recently used
+                first out.
+            common_ranges: Day counts of the daily ranges to render ahead
+                of time.
+        """
+        self.path = Path(path)
+        self.pool = ReadPool(self.path, pool_size)
+        self.cache_entries = cache_entries
+        self.common_ranges = common_ranges
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[Key, bytes]" = OrderedDict()
+        self._stamp: Optional[Tuple[int, int, int, bytes]] = None
+        self.version = ""
+        self.last_modified = datetime.min.replace(tzinfo=timezone.utc)
+        self.routes = {
+            "/daily": self._daily_key,
+            "/workouts": self._workouts_key,
+            "/heart_rate": self._heart_rate_key,
+        }
+
+    # Request keys
+
+    def _daily_key(self, params: Dict[str, List[str]]) -> Key:
+        return ("daily", *_day_range(params))
+
+    def _workouts_key(self, params: Dict[str, List[str]]) -> Key:
+        return ("workouts", *_day_range(params))
+
+    def _heart_rate_key(self, params: Dict[str, List[str]]) -> Key:
+        start = _utc(_param(params, "start"), "start")
+        end = _utc(_param(params, "end"), "end")
+        try:
+            limit = int(_param(params, "limit") or DEFAULT_PAGE_SIZE)
+        except ValueError as e:
+            raise BadRequest(str(e)) from e
+        if not 0 < limit <= MAX_PAGE_SIZE:
+            raise BadRequest(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        after = _param(params, "after")
+        if after:
+            cursor = after.rsplit("|", 2)
+            if len(cursor) != 3 or not all(cursor) or not cursor[2].isdigit():
+                raise BadRequest("invalid after cursor")
+        return ("heart_rate", start, end, limit, after)
+
+    # Rendering
+
+    def _render(self, conn: sqlite3.Connection, key: Key) -> bytes:
+        route = key[0]
+        if route == "daily":
+            payload = self._render_days(conn, DailyFact, "day", *key[1:])
+        elif route == "workouts":
+            payload = self._render_days(conn, Workout, "start_datetime", *key[1:])
+        else:
+            payload = self._render_heart_rate(conn, *key[1:])
+        return json.dumps(payload, separators=(",", ":")).encode()
+
+    def _render_days(
+        self,
+        conn: sqlite3.Connection,
+        model: Type[BaseModel],
+        order: str,
+        start: str,
+        end: str,
+    ) -> Dict[str, Any]:
+        rows = conn.execute(
+            f"SELECT {_columns(model)} FROM {model._meta.table_name} "
+            f"WHERE day BETWEEN ? AND ? ORDER BY {order}",
+            (start, end),
+        )
+        return {"start": start, "end": end, "items": [dict(row) for row in rows]}
+
+    def _render_heart_rate(
+        self,
+        conn: sqlite3.Connection,
+        start: str,
+        end: str,
+        limit: int,
+        after: Optional[str],
+    ) -> Dict[str, Any]:
+        """One page of samples, keyset-paginated on (timestamp, table, id).
+
+        Each partition numbers its rows separately, so the table a sample was
+        read from is part of the cursor.
+        """
+        selects: List[str] = []
+        args: List[Any] = []
+        for table in self._sample_tables(conn, SleepHeartRate, start, end):
+            where = "WHERE timestamp BETWEEN ? AND ?"
+            args += [start, end]
+            if after:
+                timestamp, after_table, row_id = after.rsplit("|", 2)
+                where += f" AND (timestamp, '{table}', sleep_hr_id) > (?, ?, ?)"
+                args += [timestamp, after_table, int(row_id)]
+            selects.append(
+                f"SELECT '{table}' AS source, sleep_hr_id, sleep_period_id, "
+                f"timestamp, bpm FROM {table} {where}"
+            )
+        sql = " UNION ALL ".join(selects)
+        sql += " ORDER BY timestamp, source, sleep_hr_id LIMIT ?"
+        rows = conn.execute(sql, [*args, limit + 1]).fetchall()
+
+        next_url = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            cursor = f"{last['timestamp']}|{last['source']}|{last['sleep_hr_id']}"
+            query = {"start": start, "end": end, "limit": limit, "after": cursor}
+            next_url = f"/heart_rate?{urlencode(query)}"
+        items = [
+            {
+                "sleep_period_id": row["sleep_period_id"],
+                "timestamp": row["timestamp"],
+                "bpm": row["bpm"],
+            }
+            for row in rows
+        ]
+        return {"items": items, "next": next_url}
+
+    def _sample_tables(
+        self, conn: sqlite3.Connection, model: Type[BaseModel], start: str, end: str
+    ) -> List[str]:
+        """Hot table and monthly partitions of a sample model overlapping a range."""
+        try:
+            rows = conn.execute(
+                f"SELECT table_name FROM {SamplePartition._meta.table_name} "
+                "WHERE source_table = ? AND month BETWEEN ? AND ? ORDER BY month",
+                (model._meta.table_name, start[:7], end[:7]),
+            ).fetchall()
+        except sqlite3.OperationalError:
+            rows = []
+        return [row["table_name"] for row in rows] + [model._meta.table_name]
+
+    # Caching
+
+    def _last_sync(self, conn: sqlite3.Connection) -> Optional[datetime]:
+        try:
+            (synced_at,) = conn.execute(
+                f"SELECT MAX(synced_at) FROM {CoverageRange._meta.table_name}"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return None
+        if not synced_at:
+            return None
+        parsed = datetime.fromisoformat(synced_at)
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+    def refresh(self) -> None:
+        """Drop cached responses if the database changed, then prerender.
+
+        Any committed write bumps the file change counter in the database
+        header and a shadow-database swap changes the file's inode, so
+        either starts a new cache generation.
+        """
+        with open(self.path, "rb") as f:
+            header = f.read(HEADER_BYTES)
+            stat = os.fstat(f.fileno())
+        stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size, header[24:28])
+        with self._lock:
+            if stamp == self._stamp:
+                return
+            self._cache.clear()
+            self._stamp = stamp
+            self.version = hashlib.sha1(repr(stamp).encode()).hexdigest()[:16]
+
+            with self.pool.connection() as conn:
+                mtime = datetime.fromtimestamp(stat.st_mtime, timezone.utc)
+                self.last_modified = (self._last_sync(conn) or mtime).replace(
+                    microsecond=0
+                )
+                for days in self.common_ranges:
+                    key = self._daily_key({"days": [str(days)]})
+                    self._cache[key] = self._render(conn, key)
+            logger.info(f"Database changed; cache generation {self.version}")
+
+    def _body(self, key: Key) -> bytes:
+        with self._lock:
+            body = self._cache.get(key)
+            if body is not None:
+                self._cache.move_to_end(key)
+                return body
+            stamp = self._stamp
+
+        with self.pool.connection() as conn:
+            body = self._render(conn, key)
+
+        with self._lock:
+            # A render that overlapped a refresh may hold the old data
+            if self._stamp != stamp:
+                return body
+            self._cache[key] = body
+            while len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+        return body
+
+    # Requests
+
+    def handle(self, target: str, headers: Mapping[str, str]) -> Response:
+        """Answer a GET request.
+
+        Args:
+            target: Request path with query string.
+            headers: Request headers; ``If-None-Match`` and
+                ``If-Modified-Since`` are honoured.
+        """
+        url = urlsplit(target)
+        route = self.routes.get(url.path.rstrip("/"))
+        if route is None:
+            return self._error(404, f"unknown path {url.path}")
+        try:
+            key = route(parse_qs(url.query))
+        except BadRequest as e:
+            return self._error(400, str(e))
+
+        self.refresh()
+        etag = f'"{self.version}-{hashlib.sha1(repr(key).encode()).hexdigest()[:12]}"'
+        validators = {
+            "ETag": etag,
+            "Last-Modified": format_datetime(self.last_modified, usegmt=True),
+            "Cache-Control": "no-cache",
+        }
+
+        if_none_match = headers.get("If-None-Match")
+        if if_none_match:
+            if etag in (tag.strip() for tag in if_none_match.split(",")):
+                return Response(304, headers=validators)
+        elif headers.get("If-Modified-Since"):
+            try:
+                since = parsedate_to_datetime(headers["If-Modified-Since"])
+            except (TypeError, ValueError):
+                since = None
+            if since and since >= self.last_modified:
+                return Response(304, headers=validators)
+
+        body = self._body(key)
+        return Response(200, body, {**validators, "Content-Type": "application/json"})
+
+    def _error(self, status: int, message: str) -> Response:
+        body = json.dumps({"error": message}).encode()
+        return Response(status, body, {"Content-Type": "application/json"})
+
+    def close(self) -> None:
+        """Close the connection pool."""
+        self.pool.close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service: QueryService
+
+    def do_GET(self):
+        response = self.service.handle(self.path, self.headers)
+        self.send_response(response.status)
+        for name, value in response.headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(response.body)))
+        self.end_headers()
+        self.wfile.write(response.body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def make_server(
+    service: QueryService, host: str = "127.0.0.1", port: int = 8080
+) -> ThreadingHTTPServer:
+    """Create a threaded HTTP server for the service; call `serve_forever`."""
+    handler = type("Handler", (_Handler,), {"service": service})
+    return ThreadingHTTPServer((host, port), handler)
@@ -0,0 +1,120 @@
+"""
+Helpers for syncing normalized Oura API records into the database.
+"""
+
+from .attribution import SampleAttributor, sleep_windows, workout_windows
+from .baselines import deviation, refresh_baselines, update_baselines
+from .changefeed import ChangeFeed, change_events
+from .coverage import coverage_by_day, record_coverage
+from .endpoints import FETCHERS, SYNC_ORDER, sync_range, write_batches
+from .export import ExportImport, import_export
+from .facts import rebuild_daily_facts, refresh_daily_facts, refresh_facts
+from .heart_rate import sync_sleep_heart_rate
+from .intervals import IntervalIndex, merge_intervals
+from .partitions import (
+    RetentionPolicy,
+    apply_retention,
+    partition_samples,
+    sample_tables,
+    select_samples,
+)
+from .pipeline import SyncPipeline, split_range
+from .planner import BackfillPlan, PlannedRequest, plan_backfill, run_backfill
+from .rows import (
+    activity_row,
+    personal_info_row,
+    readiness_row,
+    sleep_period_row,
+    sleep_row,
+)
+from .shadow import copy_database, shadow_database
+from .sketches import (
+    TDigest,
+    load_digest,
+    percentile,
+    rebuild_sketches,
+    refresh_sketches,
+)
+from .sleep_periods import (
+    decode_series,
+    link_sleep_periods,
+    stage_statistics,
+    sync_sleep_periods,
+    unlink_sleep_periods,
+    write_sleep_periods,
+)
+from .writer import WriteResult, content_hash, write_records
+
+__all__ = [
+    # Attribution
+    "SampleAttributor",
+    "sleep_windows",
+    "workout_windows",
+    # Baselines
+    "deviation",
+    "refresh_baselines",
+    "update_baselines",
+    # Change feed
+    "ChangeFeed",
+    "change_events",
+    # Coverage
+    "coverage_by_day",
+    "record_coverage",
+    # Endpoints
+    "FETCHERS",
+    "SYNC_ORDER",
+    "sync_range",
+    "write_batches",
+    # Export import
+    "ExportImport",
+    "import_export",
+    # Facts
+    "rebuild_daily_facts",
+    "refresh_daily_facts",
+    "refresh_facts",
+    # Heart rate
+    "sync_sleep_heart_rate",
+    # Intervals
+    "IntervalIndex",
+    "merge_intervals",
+    # Partitions
+    "RetentionPolicy",
+    "apply_retention",
+    "partition_samples",
+    "sample_tables",
+    "select_samples",
+    # Pipeline
+    "SyncPipeline",
+    "split_range",
+    # Planner
+    "BackfillPlan",
+    "PlannedRequest",
+    "plan_backfill",
+    "run_backfill",
+    # Row builders
+    "activity_row",
+    "personal_info_row",
+    "readiness_row",
+    "sleep_period_row",
+    "sleep_row",
+    # Shadow database
+    "copy_database",
+    "shadow_database",
+    # Quantile sketches
+    "TDigest",
+    "load_digest",
+    "percentile",
+    "rebuild_sketches",
+    "refresh_sketches",
+    # Sleep periods
+    "decode_series",
+    "link_sleep_periods",
+    "stage_statistics",
+    "sync_sleep_periods",
+    "unlink_sleep_periods",
+    "write_sleep_periods",
+    # Writer
+    "WriteResult",
+    "content_hash",
+    "write_records",
+]
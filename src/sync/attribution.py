@@ -0,0 +1,99 @@
+"""
+Attribute timestamped samples to the sleep period or workout containing them.
+
+Stored `SleepPeriod` and `Workout` windows are loaded once per range into an
+`IntervalIndex`, so linking n samples costs O(n log m) instead of comparing
+every sample against every period.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.models import SleepPeriod, Workout
+
+from .intervals import IntervalIndex, as_utc
+
+Window = Tuple[datetime, datetime, str]
+
+
+def _windows(query: Any, start: datetime, end: datetime) -> List[Window]:
+    """Convert (id, start, end) rows to UTC windows overlapping a range."""
+    windows = []
+    for key, window_start, window_end in query.tuples():
+        window_start, window_end = as_utc(window_start), as_utc(window_end)
+        if window_end >= start and window_start <= end:
+            windows.append((window_start, window_end, key))
+    return sorted(windows)
+
+
+def sleep_windows(start: datetime, end: datetime) -> List[Window]:
+    """Load stored sleep periods overlapping a range.
+
+    Returns:
+        (bedtime_start, bedtime_end, sleep_period_id) in UTC, sorted by start.
+    """
+    start, end = as_utc(start), as_utc(end)
+    # Stored values keep their local offsets, so pad the SQL prefilter by a
+    # day and apply the exact bounds after converting to UTC.
+    query = SleepPeriod.select(
+        SleepPeriod.sleep_period_id,
+        SleepPeriod.bedtime_start,
+        SleepPeriod.bedtime_end,
+    ).where(
+        SleepPeriod.bedtime_start.is_null(False),
+        SleepPeriod.bedtime_end.is_null(False),
+        SleepPeriod.bedtime_end >= start - timedelta(days=1),
+        SleepPeriod.bedtime_start <= end + timedelta(days=1),
+    )
+    return _windows(query, start, end)
+
+
+def workout_windows(start: datetime, end: datetime) -> List[Window]:
+    """Load stored workouts overlapping a range.
+
+    Returns:
+        (start_datetime, end_datetime, workout_id) in UTC, sorted by start.
+    """
+    start, end = as_utc(start), as_utc(end)
+    query = Workout.select(
+        Workout.workout_id,
+        Workout.start_datetime,
+        Workout.end_datetime,
+    ).where(
+        Workout.end_datetime >= start - timedelta(days=1),
+        Workout.start_datetime <= end + timedelta(days=1),
+    )
+    return _windows(query, start, end)
+
+
+class SampleAttributor:
+    """Bulk-assign samples in a range to sleep periods and workouts."""
+
+    def __init__(self, start: datetime, end: datetime):
+        self.sleep_periods = IntervalIndex(sleep_windows(start, end))
+        self.workouts = IntervalIndex(workout_windows(start, end))
+
+    def assign(
+        self, timestamps: Iterable[Any]
+    ) -> List[Tuple[Optional[str], Optional[str]]]:
+        """Return (sleep_period_id, workout_id) for each timestamp."""
+        return [
+            (self.sleep_periods.lookup(timestamp), self.workouts.lookup(timestamp))
+            for timestamp in timestamps
+        ]
+
+    def link(
+        self, samples: Iterable[Dict[str, Any]], timestamp_key: str = "timestamp"
+    ) -> List[Dict[str, Any]]:
+        """Copy samples, adding `sleep_period` and `workout` foreign keys."""
+        linked = []
+        for sample in samples:
+            timestamp = sample[timestamp_key]
+            linked.append(
+                {
+                    **sample,
+                    "sleep_period": self.sleep_periods.lookup(timestamp),
+                    "workout": self.workouts.lookup(timestamp),
+                }
+            )
+        return linked
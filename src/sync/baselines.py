@@ -0,0 +1,264 @@
+"""
+Incremental rolling baselines of nightly HRV, resting heart rate and
+temperature.
+
+Each metric's daily value comes from the longest sleep period of the day.
+`BaselineState` keeps running window sums and EWMAs as of the last processed
+day, so advancing by a day costs O(1) per window: add the new value, drop
+the one that left the window. `BaselineDay` stores the baselines going into
+each day, which turns "is today's HRV below my 60-day baseline?" into a
+single-row lookup.
+
+Days that arrive or change after they were processed trigger a targeted
+recompute: the state is rewound to the day before the earliest changed day
+and replayed from there.
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from peewee import Field, chunked
+
+from src.models import BaselineDay, BaselineState, DailySleep, SleepPeriod
+
+from .writer import MAX_VARIABLES, WriteResult
+
+logger = logging.getLogger(__name__)
+
+# Metric name -> sleep period column it is taken from
+METRICS: Dict[str, Field] = {
+    "hrv": SleepPeriod.average_hrv,
+    "resting_hr": SleepPeriod.lowest_heart_rate,
+    "temperature": SleepPeriod.temperature_delta,
+}
+
+# Rolling window sizes in days. EWMAs use the matching span.
+WINDOWS = (7, 14, 30, 60)
+
+
+@dataclass
+class RollingWindow:
+    """Running sums over the last `days` days plus an EWMA of matching span."""
+
+    days: int
+    count: int = 0
+    total: float = 0.0
+    total_sq: float = 0.0
+    ewma: Optional[float] = None
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    @property
+    def std(self) -> Optional[float]:
+        """Sample standard deviation, or None with fewer than two values."""
+        if self.count < 2:
+            return None
+        variance = (self.total_sq - self.total * self.total / self.count) / (
+            self.count - 1
+        )
+        return math.sqrt(max(variance, 0.0))
+
+    def push(self, value: Optional[float], expired: Optional[float]) -> None:
+        """Advance one day: add `value` and drop `expired`, the value that
+        just left the window. Either may be None for a day without data."""
+        if value is not None:
+            self.count += 1
+            self.total += value
+            self.total_sq += value * value
+            alpha = 2 / (self.days + 1)
+            self.ewma = (
+                value if self.ewma is None else self.ewma + alpha * (value - self.ewma)
+            )
+        if expired is not None:
+            self.count -= 1
+            self.total -= expired
+            self.total_sq -= expired * expired
+
+
+def daily_values(metric: str, start_day: date, end_day: date) -> Dict[date, float]:
+    """Value of a metric per day, taken from the day's longest sleep period."""
+    field = METRICS[metric]
+    query = (
+        SleepPeriod.select(DailySleep.day, field)
+        .join(DailySleep, on=(SleepPeriod.sleep_summary == DailySleep.sleep_summary_id))
+        .where(DailySleep.day.between(start_day, end_day), field.is_null(False))
+        .order_by(DailySleep.day, SleepPeriod.total_sleep_duration)
+        .tuples()
+    )
+    return {day: float(value) for day, value in query}  # Longest period wins
+
+
+def _value_day(metric: str, latest: bool) -> Optional[date]:
+    """First or last day with a value for a metric."""
+    field = METRICS[metric]
+    day = (
+        SleepPeriod.select(DailySleep.day)
+        .join(DailySleep, on=(SleepPeriod.sleep_summary == DailySleep.sleep_summary_id))
+        .where(field.is_null(False))
+        .order_by(DailySleep.day.desc() if latest else DailySleep.day)
+        .limit(1)
+        .scalar()
+    )
+    return date.fromisoformat(str(day)[:10]) if day else None
+
+
+def _load_state(metric: str) -> Tuple[Optional[date], Dict[int, RollingWindow]]:
+    states = list(BaselineState.select().where(BaselineState.metric == metric))
+    if len(states) != len(WINDOWS):
+        return None, {size: RollingWindow(size) for size in WINDOWS}
+    windows = {
+        state.window: RollingWindow(
+            state.window, state.count, state.total, state.total_sq, state.ewma
+        )
+        for state in states
+    }
+    return states[0].last_day, windows
+
+
+def _save_state(metric: str, last_day: date, windows: Dict[int, RollingWindow]):
+    BaselineState.delete().where(BaselineState.metric == metric).execute()
+    BaselineState.insert_many(
+        [
+            {
+                "metric": metric,
+                "window": window.days,
+                "last_day": last_day,
+                "count": window.count,
+                "total": window.total,
+                "total_sq": window.total_sq,
+                "ewma": window.ewma,
+            }
+            for window in windows.values()
+        ]
+    ).execute()
+
+
+def _rewind(metric: str, day: date) -> Dict[int, RollingWindow]:
+    """Rebuild the state as it was going into `day` from stored data."""
+    previous = day - timedelta(days=1)
+    values = daily_values(metric, day - timedelta(days=max(WINDOWS)), previous)
+    stored = BaselineDay.get_or_none(
+        BaselineDay.metric == metric, BaselineDay.day == day
+    )
+
+    windows = {}
+    for size in WINDOWS:
+        window = RollingWindow(size)
+        for value_day, value in values.items():
+            if value_day > previous - timedelta(days=size):
+                window.count += 1
+                window.total += value
+                window.total_sq += value * value
+        # Nothing before `day` changed, so its stored EWMA is still valid
+        window.ewma = getattr(stored, f"ewma_{size}") if stored else None
+        windows[size] = window
+    return windows
+
+
+def update_baselines(
+    since: Optional[date] = None, metrics: Optional[Iterable[str]] = None
+) -> int:
+    """Bring the baselines up to date with the stored sleep periods.
+
+    New days are appended to the running state. If `since` is on or before
+    the last processed day, the baselines are recomputed from `since` on.
+
+    Args:
+        since: Earliest day whose value may have changed.
+        metrics: Metrics to update. Defaults to all of `METRICS`.
+
+    Returns:
+        Number of baseline days written.
+    """
+    written = 0
+    for metric in metrics or METRICS:
+        last_day, windows = _load_state(metric)
+        end_day = _value_day(metric, latest=True)
+        if end_day is None:
+            continue
+
+        if last_day is None:
+            start_day = _value_day(metric, latest=False)
+        elif since is not None and since <= last_day:
+            start_day = since
+            windows = _rewind(metric, since)
+            end_day = max(end_day, last_day)
+        else:
+            start_day = last_day + timedelta(days=1)
+        if start_day > end_day:
+            continue
+
+        values = daily_values(metric, start_day - timedelta(days=max(WINDOWS)), end_day)
+        rows: List[Dict] = []
+        day = start_day
+        while day <= end_day:
+            value = values.get(day)
+            row = {"metric": metric, "day": day, "value": value}
+            for size, window in windows.items():
+                row[f"mean_{size}"] = window.mean
+                row[f"std_{size}"] = window.std
+                row[f"ewma_{size}"] = window.ewma
+                window.push(value, values.get(day - timedelta(days=size)))
+            rows.append(row)
+            day += timedelta(days=1)
+
+        with BaselineDay._meta.database.atomic():
+            BaselineDay.delete().where(
+                BaselineDay.metric == metric, BaselineDay.day >= start_day
+            ).execute()
+            for batch in chunked(rows, MAX_VARIABLES // len(rows[0])):
+                BaselineDay.insert_many(batch).execute()
+            _save_state(metric, end_day, windows)
+
+        logger.info(f"Updated {metric} baselines for {start_day}..{end_day}")
+        written += len(rows)
+    return written
+
+
+def refresh_baselines(results: Dict[str, WriteResult]) -> int:
+    """Update the baselines after a sync, recomputing from the earliest
+    sleep period it inserted, changed or deleted."""
+    result = results.get(SleepPeriod._meta.table_name)
+    since = (
+        min(result.deleted_days.values()) if result and result.deleted_days else None
+    )
+    if result is not None and result.changed:
+        for ids in chunked(result.changed, MAX_VARIABLES):
+            day = (
+                SleepPeriod.select(DailySleep.day)
+                .join(
+                    DailySleep,
+                    on=(SleepPeriod.sleep_summary == DailySleep.sleep_summary_id),
+                )
+                .where(SleepPeriod.sleep_period_id.in_(ids))
+                .order_by(DailySleep.day)
+                .limit(1)
+                .scalar()
+            )
+            if day:
+                day = date.fromisoformat(str(day)[:10])
+                since = day if since is None else min(since, day)
+    return update_baselines(since)
+
+
+def deviation(metric: str, day: date, window: int = 60) -> Optional[float]:
+    """Z-score of a day's value against its baseline going into that day.
+
+    Returns:
+        Standard deviations above (positive) or below the rolling mean, or
+        None if the day or its baseline is missing.
+    """
+    stored = BaselineDay.get_or_none(
+        BaselineDay.metric == metric, BaselineDay.day == day
+    )
+    if stored is None or stored.value is None:
+        return None
+    mean, std = getattr(stored, f"mean_{window}"), getattr(stored, f"std_{window}")
+    if mean is None or not std:
+        return None
+    return (stored.value - mean) / std
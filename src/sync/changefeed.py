@@ -0,0 +1,222 @@
+"""
+Append-only feed of the rows each sync changed, with consumer offsets.
+
+After a sync, `ChangeFeed.publish` appends one JSON line per inserted,
+updated or deleted row to ``changes.jsonl``:
+
+    {"table": "daily_sleep", "key": "abc", "op": "update", "day": "2024-03-01",
+     "at": "2024-03-02T06:00:00+00:00"}
+
+Consumers such as alerting or warehouse loaders read from their last
+committed offset instead of re-scanning tables. An offset is a byte
+position in the log, so a read only touches the new lines:
+
+    feed = ChangeFeed("oura_changes")
+    events, offset = feed.read("alerts")
+    ...  # handle the events
+    feed.commit("alerts", offset)
+
+Offsets live in a small SQLite file next to the log, so every process
+sharing the directory sees the same positions.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, Union
+
+from src.models import (
+    BaseModel,
+    DailyActivity,
+    DailyReadiness,
+    DailySleep,
+    DailySpO2,
+    DailyStress,
+    PersonalInfo,
+    SleepPeriod,
+    Workout,
+)
+
+from .facts import FACT_SOURCES, key_days
+from .writer import WriteResult
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+LOG_NAME = "changes.jsonl"
+OFFSETS_NAME = "offsets.db"
+
+# Synced models by table name, for looking up the day of changed rows
+FEED_MODELS: Dict[str, Type[BaseModel]] = {
+    model._meta.table_name: model
+    for model in (
+        PersonalInfo,
+        DailyActivity,
+        DailySleep,
+        SleepPeriod,
+        DailyReadiness,
+        DailySpO2,
+        DailyStress,
+        Workout,
+    )
+}
+
+# (operation, WriteResult attribute) in the order events are written
+OPERATIONS = (("insert", "inserted"), ("update", "updated"), ("delete", "deleted"))
+
+
+def change_events(
+    results: Dict[str, WriteResult],
+    at: Optional[datetime] = None,
+    account: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """One event per row a sync inserted, updated or deleted.
+
+    Deleted rows carry the day they were deleted from; the day is None for
+    tables without days. Events of an account's shard (see
+    `src.models.shards`) also carry the account.
+    """
+    stamp = (at or datetime.now(timezone.utc)).isoformat()
+    events = []
+    for table, result in results.items():
+        model = FEED_MODELS.get(table)
+        days = dict(result.deleted_days)
+        if model is not None and result.changed:
+            days.update(key_days(model, FACT_SOURCES.get(model), result.changed))
+        for op, attribute in OPERATIONS:
+            for key in getattr(result, attribute):
+                day = days.get(key)
+                event = {
+                    "table": table,
+                    "key": key,
+                    "op": op,
+                    "day": day.isoformat() if day else None,
+                    "at": stamp,
+                }
+                if account is not None:
+                    event["account"] = account
+                events.append(event)
+    return events
+
+
+class ChangeFeed:
+    """JSONL change log with per-consumer offsets."""
+
+    def __init__(self, root: Union[str, Path]):
+        """Open (or create) a feed directory.
+
+        Args:
+            root: Directory holding the log and the consumer offsets.
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.path = self.root / LOG_NAME
+        self.path.touch()
+        self._lock = threading.Lock()
+        self._offsets = sqlite3.connect(
+            str(self.root / OFFSETS_NAME), timeout=30, check_same_thread=False
+        )
+        self._offsets.execute("""
+            CREATE TABLE IF NOT EXISTS offsets (
+                consumer TEXT PRIMARY KEY,
+                offset INTEGER NOT NULL,
+                committed_at TEXT NOT NULL
+            )
+            """)
+        self._offsets.commit()
+
+    def close(self) -> None:
+        self._offsets.close()
+
+    def __enter__(self) -> "ChangeFeed":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def append(self, events: Iterable[Dict[str, Any]]) -> int:
+        """Append events to the log in one write.
+
+        Returns:
+            Number of events appended.
+        """
+        lines = [
+            json.dumps(event, separators=(",", ":"), default=str) + "\n"
+            for event in events
+        ]
+        if not lines:
+            return 0
+        data = "".join(lines).encode()
+        with self._lock, open(self.path, "ab") as f:
+            # Keep concurrent writers' batches whole
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            f.write(data)
+            f.flush()
+        return len(lines)
+
+    def publish(
+        self, results: Dict[str, WriteResult], account: Optional[str] = None
+    ) -> int:
+        """Append the changes of a sync's write results."""
+        appended = self.append(change_events(results, account=account))
+        if appended:
+            logger.info(f"Published {appended} change events to {self.path}")
+        return appended
+
+    def offset(self, consumer: str) -> int:
+        """Committed offset of a consumer; 0 for a new consumer."""
+        row = self._offsets.execute(
+            "SELECT offset FROM offsets WHERE consumer = ?", (consumer,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def read(
+        self, consumer: str, limit: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Events after a consumer's committed offset.
+
+        Nothing is committed; pass the returned offset to `commit` once the
+        events are handled, so a crashed consumer sees them again.
+
+        Args:
+            consumer: Consumer name.
+            limit: Maximum number of events to return.
+
+        Returns:
+            The events and the offset just past the last one.
+        """
+        offset = self.offset(consumer)
+        events = []
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Still being written
+                if limit is not None and len(events) >= limit:
+                    break
+                events.append(json.loads(line))
+                offset += len(line)
+        return events, offset
+
+    def commit(self, consumer: str, offset: int) -> None:
+        """Record that a consumer has handled the log up to `offset`."""
+        with self._lock:
+            self._offsets.execute(
+                "INSERT INTO offsets (consumer, offset, committed_at) "
+                "VALUES (?, ?, ?) ON CONFLICT (consumer) DO UPDATE SET "
+                "offset = excluded.offset, committed_at = excluded.committed_at",
+                (consumer, offset, datetime.now(timezone.utc).isoformat()),
+            )
+            self._offsets.commit()
+
+    def lag(self, consumer: str) -> int:
+        """Bytes of the log a consumer has not committed yet."""
+        return self.path.stat().st_size - self.offset(consumer)
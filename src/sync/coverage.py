@@ -0,0 +1,76 @@
+"""
+Bookkeeping of which days each endpoint has been synced for.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from src.models import CoverageRange
+
+
+def _utcnow() -> datetime:
+    """Current time as a naive UTC datetime, the format stored in the table."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def record_coverage(
+    endpoint: str,
+    start_day: date,
+    end_day: date,
+    synced_at: Optional[datetime] = None,
+) -> None:
+    """Record that an endpoint was synced for a range of days.
+
+    Existing ranges overlapping the new one are trimmed so each day keeps
+    only its most recent sync time.
+    """
+    synced_at = synced_at or _utcnow()
+    with CoverageRange._meta.database.atomic():
+        overlapping = CoverageRange.select().where(
+            CoverageRange.endpoint == endpoint,
+            CoverageRange.start_day <= end_day,
+            CoverageRange.end_day >= start_day,
+        )
+        for existing in list(overlapping):
+            if existing.start_day < start_day:
+                CoverageRange.create(
+                    endpoint=endpoint,
+                    start_day=existing.start_day,
+                    end_day=start_day - timedelta(days=1),
+                    synced_at=existing.synced_at,
+                )
+            if existing.end_day > end_day:
+                CoverageRange.create(
+                    endpoint=endpoint,
+                    start_day=end_day + timedelta(days=1),
+                    end_day=existing.end_day,
+                    synced_at=existing.synced_at,
+                )
+            existing.delete_instance()
+
+        CoverageRange.create(
+            endpoint=endpoint,
+            start_day=start_day,
+            end_day=end_day,
+            synced_at=synced_at,
+        )
+
+
+def coverage_by_day(
+    endpoint: str, start_day: date, end_day: date
+) -> Dict[date, datetime]:
+    """Return when each covered day in a range was last synced."""
+    query = CoverageRange.select().where(
+        CoverageRange.endpoint == endpoint,
+        CoverageRange.start_day <= end_day,
+        CoverageRange.end_day >= start_day,
+    )
+
+    synced: Dict[date, datetime] = {}
+    for coverage in query:
+        day = max(coverage.start_day, start_day)
+        last = min(coverage.end_day, end_day)
+        while day <= last:
+            synced[day] = coverage.synced_at
+            day += timedelta(days=1)
+    return synced
@@ -0,0 +1,193 @@
+"""
+Per-endpoint sync steps.
+
+Each fetcher calls one `OuraAPI` endpoint for a date range and returns the
+normalized model rows to write, so fetching and writing can be scheduled
+independently. `sync_range` runs both for one endpoint and records the
+range as covered.
+"""
+
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from peewee import Field
+
+from src.api import OuraAPI
+from src.api.types import (
+    ActivitySummaryDict,
+    ReadinessSummaryDict,
+    SleepSummaryDict,
+    WorkoutDict,
+)
+from src.models import (
+    DailyActivity,
+    DailyReadiness,
+    DailySleep,
+    HashedModel,
+    Workout,
+    db,
+)
+
+from .coverage import record_coverage
+from .heart_rate import sync_sleep_heart_rate
+from .profiling import stage
+from .rows import activity_row, readiness_row, sleep_row
+from .sleep_periods import (
+    link_sleep_periods,
+    sync_sleep_periods,
+    unlink_sleep_periods,
+)
+from .writer import WriteResult, write_records
+
+logger = logging.getLogger(__name__)
+
+# Rows for one model, matched on `key` (None means the primary key)
+RowBatch = Tuple[Type[HashedModel], Optional[Field], List[Dict[str, Any]]]
+
+
+def activity_batches(activity_data: List[ActivitySummaryDict]) -> List[RowBatch]:
+    """Daily activity rows of normalized records."""
+    return [
+        (
+            DailyActivity,
+            DailyActivity.activity_summary_id,
+            [activity_row(activity) for activity in activity_data],
+        )
+    ]
+
+
+def sleep_batches(sleep_data: List[SleepSummaryDict]) -> List[RowBatch]:
+    """Daily sleep rows of normalized records."""
+    return [
+        (
+            DailySleep,
+            DailySleep.sleep_summary_id,
+            [sleep_row(sleep) for sleep in sleep_data],
+        )
+    ]
+
+
+def readiness_batches(readiness_data: List[ReadinessSummaryDict]) -> List[RowBatch]:
+    """Daily readiness rows of normalized records."""
+    return [
+        (
+            DailyReadiness,
+            None,
+            [readiness_row(readiness) for readiness in readiness_data],
+        )
+    ]
+
+
+def workout_batches(workouts: List[WorkoutDict]) -> List[RowBatch]:
+    """Workout rows of normalized records, whose keys match the model."""
+    return [(Workout, None, [dict(workout) for workout in workouts])]
+
+
+def fetch_daily_activity(
+    api: OuraAPI, start_date: str, end_date: str
+) -> List[RowBatch]:
+    """Fetch daily activity rows."""
+    return activity_batches(
+        api.get_daily_activity(start_date=start_date, end_date=end_date)
+    )
+
+
+def fetch_daily_sleep(api: OuraAPI, start_date: str, end_date: str) -> List[RowBatch]:
+    """Fetch daily sleep rows."""
+    return sleep_batches(api.get_daily_sleep(start_date=start_date, end_date=end_date))
+
+
+def fetch_daily_readiness(
+    api: OuraAPI, start_date: str, end_date: str
+) -> List[RowBatch]:
+    """Fetch daily readiness rows."""
+    return readiness_batches(
+        api.get_daily_readiness(start_date=start_date, end_date=end_date)
+    )
+
+
+# Endpoint name -> fetcher, in dependency order
+FETCHERS: Dict[str, Callable[[OuraAPI, str, str], List[RowBatch]]] = {
+    "daily_activity": fetch_daily_activity,
+    "daily_sleep": fetch_daily_sleep,
+    "daily_readiness": fetch_daily_readiness,
+}
+
+# All synced endpoints in the order they must run. Sleep periods are linked
+# to their daily sleep, so they run after it. Their embedded 5-minute series
+# fill the sleep heart rate tables; `sync_range` still accepts
+# "sleep_heart_rate" to download the per-sample stream instead.
+SYNC_ORDER = ["daily_activity", "daily_sleep", "sleep_periods", "daily_readiness"]
+
+
+def write_batches(
+    batches: List[RowBatch], days: Optional[Tuple[date, date]] = None
+) -> Dict[str, WriteResult]:
+    """Write fetched rows, returning results keyed by table name.
+
+    Sleep periods are linked to the daily sleep written here, and unlinked
+    from daily sleeps deleted here.
+
+    Args:
+        batches: Fetched rows.
+        days: First and last day the batches are complete for; stored rows
+            of these days missing from them are deleted (see
+            `write_records`).
+    """
+    results: Dict[str, WriteResult] = {}
+    for model, key, rows in batches:
+        result = write_records(model, rows, key=key, days=days)
+        if result.table in results:
+            results[result.table].merge(result)
+        else:
+            results[result.table] = result
+    if any(model is DailySleep for model, _, _ in batches):
+        unlink_sleep_periods(results[DailySleep._meta.table_name].deleted)
+        link_sleep_periods()
+    return results
+
+
+def sync_range(
+    api: OuraAPI, endpoint: str, start_date: str, end_date: str
+) -> Dict[str, WriteResult]:
+    """Sync one endpoint for a date range and record it as covered.
+
+    The fetched rows are the complete data for the range, so stored rows of
+    its days that upstream no longer returns are deleted.
+
+    Args:
+        api: API client.
+        endpoint: One of `SYNC_ORDER`.
+        start_date: Start date in YYYY-MM-DD format.
+        end_date: End date in YYYY-MM-DD format, inclusive.
+
+    Returns:
+        Write results keyed by table name.
+    """
+    days = (date.fromisoformat(start_date), date.fromisoformat(end_date))
+    with stage(endpoint, "commit"), db.atomic():
+        if endpoint == "sleep_heart_rate":
+            range_start = datetime.fromisoformat(start_date).replace(
+                tzinfo=timezone.utc
+            )
+            range_end = datetime.fromisoformat(end_date).replace(
+                tzinfo=timezone.utc
+            ) + timedelta(days=1)
+            with stage(endpoint, "write"):
+                sync_sleep_heart_rate(api, range_start, range_end)
+            results: Dict[str, WriteResult] = {}
+        elif endpoint == "sleep_periods":
+            with stage(endpoint, "write"):
+                results = sync_sleep_periods(api, start_date, end_date, days)
+        else:
+            with stage(endpoint, "normalize"):
+                batches = FETCHERS[endpoint](api, start_date, end_date)
+            with stage(endpoint, "write"):
+                results = write_batches(batches, days)
+
+        record_coverage(endpoint, *days)
+
+    for result in results.values():
+        logger.info(f"Synced {endpoint} {start_date}..{end_date}: {result}")
+    return results
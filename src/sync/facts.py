@@ -0,0 +1,223 @@
+"""
+Incremental maintenance of the `DailyFact` per-day table.
+
+Reports read one indexed row per day instead of joining six daily tables
+whose `day` columns do not even share a type. After a sync, only the days
+touched by inserted, updated or deleted rows are recomputed.
+"""
+
+import logging
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Type
+
+from peewee import Field, chunked, fn
+
+from src.models import (
+    BaseModel,
+    DailyActivity,
+    DailyFact,
+    DailyReadiness,
+    DailySleep,
+    DailySpO2,
+    DailyStress,
+    SleepPeriod,
+    Workout,
+)
+
+from .writer import MAX_VARIABLES, WriteResult
+
+logger = logging.getLogger(__name__)
+
+# Source models feeding the fact table, with the key their sync results
+# are reported by (None means the primary key)
+FACT_SOURCES: Dict[Type[BaseModel], Optional[Field]] = {
+    DailyActivity: DailyActivity.activity_summary_id,
+    DailySleep: DailySleep.sleep_summary_id,
+    DailyReadiness: None,
+    DailySpO2: None,
+    DailyStress: None,
+    SleepPeriod: None,
+    Workout: None,
+}
+
+_sleep_join = SleepPeriod.sleep_summary == DailySleep.sleep_summary_id
+
+
+def _day(value: Any) -> date:
+    """Normalize a `day` column value, stored as DATE or text, to a date."""
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+def key_days(
+    model: Type[BaseModel], key: Optional[Field], keys: List[Any]
+) -> Dict[Any, date]:
+    """Day of each stored row of `model` whose `key` is in `keys`.
+
+    Sleep periods belong to the day of their daily sleep. Models without a
+    `day` column, and keys of rows that no longer exist, are left out.
+    """
+    key = key or model._meta.primary_key
+    days: Dict[Any, date] = {}
+    for batch in chunked(keys, MAX_VARIABLES):
+        if model is SleepPeriod:
+            query = (
+                SleepPeriod.select(SleepPeriod.sleep_period_id, DailySleep.day)
+                .join(DailySleep, on=_sleep_join)
+                .where(SleepPeriod.sleep_period_id.in_(batch))
+            )
+        elif "day" in model._meta.fields:
+            query = model.select(key, model.day).where(key.in_(batch))
+        else:
+            return days
+        days.update((row_key, _day(day)) for row_key, day in query.tuples())
+    return days
+
+
+def changed_days(results: Dict[str, WriteResult]) -> Set[date]:
+    """Days touched by the rows a sync inserted, updated or deleted."""
+    days: Set[date] = set()
+    for model, key in FACT_SOURCES.items():
+        result = results.get(model._meta.table_name)
+        if result is None:
+            continue
+        if result.changed:
+            days.update(key_days(model, key, result.changed).values())
+        days.update(result.deleted_days.values())
+    return days
+
+
+def _select_days(model: Type[BaseModel], days: List[str], *fields):
+    return model.select(model.day, *fields).where(model.day.in_(days)).tuples()
+
+
+def _fact_rows(days: List[date]) -> List[Dict[str, Any]]:
+    """Compute fact rows for the given days from the source tables."""
+    keys = [day.isoformat() for day in days]
+    facts: Dict[date, Dict[str, Any]] = {}
+
+    def merge(rows: Iterable[Tuple], columns: Tuple[str, ...]) -> None:
+        for day, *values in rows:
+            fact = facts.setdefault(_day(day), {"day": _day(day)})
+            fact.update(zip(columns, values))
+
+    merge(
+        _select_days(DailySleep, keys, DailySleep.score),
+        ("sleep_score",),
+    )
+    merge(
+        _select_days(
+            DailyActivity,
+            keys,
+            DailyActivity.score,
+            DailyActivity.steps,
+            DailyActivity.active_calories,
+            DailyActivity.total_calories,
+            DailyActivity.sedentary_time,
+        ),
+        (
+            "activity_score",
+            "steps",
+            "active_calories",
+            "total_calories",
+            "sedentary_time",
+        ),
+    )
+    merge(
+        _select_days(DailyReadiness, keys, DailyReadiness.score),
+        ("readiness_score",),
+    )
+    merge(  # Ordered so the longest sleep period of the day is merged last
+        SleepPeriod.select(
+            DailySleep.day,
+            SleepPeriod.total_sleep_duration,
+            SleepPeriod.average_hrv,
+            SleepPeriod.lowest_heart_rate,
+            SleepPeriod.temperature_delta,
+        )
+        .join(DailySleep, on=_sleep_join)
+        .where(DailySleep.day.in_(keys))
+        .order_by(DailySleep.day, SleepPeriod.total_sleep_duration)
+        .tuples(),
+        (
+            "total_sleep_duration",
+            "average_hrv",
+            "lowest_heart_rate",
+            "temperature_delta",
+        ),
+    )
+    merge(
+        _select_days(
+            DailySpO2,
+            keys,
+            DailySpO2.average,
+            DailySpO2.breathing_disturbance_index,
+        ),
+        ("spo2_average", "breathing_disturbance_index"),
+    )
+    merge(
+        _select_days(
+            DailyStress,
+            keys,
+            DailyStress.stress_high,
+            DailyStress.recovery_high,
+            DailyStress.day_summary,
+        ),
+        ("stress_high", "recovery_high", "stress_summary"),
+    )
+    duration = (
+        fn.julianday(Workout.end_datetime) - fn.julianday(Workout.start_datetime)
+    ) * 86400
+    merge(
+        Workout.select(
+            Workout.day,
+            fn.COUNT(Workout.workout_id),
+            fn.SUM(Workout.calories),
+            fn.SUM(duration).cast("INTEGER"),
+        )
+        .where(Workout.day.in_(keys))
+        .group_by(Workout.day)
+        .tuples(),
+        ("workout_count", "workout_calories", "workout_duration"),
+    )
+    return list(facts.values())
+
+
+def refresh_daily_facts(days: Iterable[date]) -> int:
+    """Recompute the fact rows of the given days.
+
+    Returns:
+        Number of fact rows written.
+    """
+    days = sorted(set(days))
+    written = 0
+    with DailyFact._meta.database.atomic():
+        for batch in chunked(days, MAX_VARIABLES):
+            rows = _fact_rows(batch)
+            DailyFact.delete().where(DailyFact.day.in_(batch)).execute()
+            if rows:
+                # Every row needs the same columns for insert_many
+                columns = {column: None for row in rows for column in row}
+                columns["workout_count"] = 0
+                rows = [{**columns, **row} for row in rows]
+                for chunk in chunked(rows, MAX_VARIABLES // len(columns)):
+                    DailyFact.insert_many(chunk).execute()
+            written += len(rows)
+    if days:
+        logger.info(f"Refreshed {written} daily facts for {days[0]}..{days[-1]}")
+    return written
+
+
+def refresh_facts(results: Dict[str, WriteResult]) -> int:
+    """Update the fact table for the days a sync changed."""
+    return refresh_daily_facts(changed_days(results))
+
+
+def rebuild_daily_facts() -> int:
+    """Recompute the whole fact table from the source tables."""
+    days: Set[date] = set()
+    for model in FACT_SOURCES:
+        if model is not SleepPeriod:
+            days.update(_day(day) for (day,) in model.select(model.day).tuples())
+    with DailyFact._meta.database.atomic():
+        DailyFact.delete().execute()
+        return refresh_daily_facts(days)
@@ -0,0 +1,80 @@
+"""
+Sync heart rate samples recorded during known sleep periods.
+
+Rather than downloading the full heart rate stream for a date range and
+discarding everything outside of sleep, the stored `SleepPeriod` bedtime
+windows are merged and heart rate is requested only for those windows.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, List
+
+from peewee import chunked
+
+from src.api import OuraAPI
+from src.api.types import HeartRateDict
+from src.models import SleepHeartRate
+
+from .attribution import Window, sleep_windows
+from .intervals import IntervalIndex, merge_intervals
+from .partitions import delete_samples
+from .writer import MAX_VARIABLES
+
+logger = logging.getLogger(__name__)
+
+
+def link_to_sleep_periods(
+    samples: List[HeartRateDict], windows: List[Window]
+) -> List[Dict[str, Any]]:
+    """Build `SleepHeartRate` rows for samples inside a sleep window.
+
+    Samples outside every window are dropped.
+    """
+    index = IntervalIndex(windows)
+    period_ids = index.assign(sample["timestamp"] for sample in samples)
+    return [
+        {
+            "sleep_period": period_id,
+            "timestamp": sample["timestamp"],
+            "bpm": sample["bpm"],
+        }
+        for sample, period_id in zip(samples, period_ids)
+        if period_id is not None
+    ]
+
+
+def sync_sleep_heart_rate(api: OuraAPI, start: datetime, end: datetime) -> int:
+    """Replace stored sleep heart rate for the sleep periods in a range.
+
+    Args:
+        api: API client.
+        start: Start of the range.
+        end: End of the range.
+
+    Returns:
+        Number of samples stored.
+    """
+    windows = sleep_windows(start, end)
+    if not windows:
+        logger.info("No stored sleep periods in range, skipping sleep heart rate")
+        return 0
+
+    merged = merge_intervals(
+        (window_start, window_end) for window_start, window_end, _ in windows
+    )
+    logger.info(
+        f"Fetching sleep heart rate for {len(windows)} sleep periods "
+        f"in {len(merged)} windows"
+    )
+    samples = api.get_sleep_heart_rate(windows=merged)
+    rows = link_to_sleep_periods(samples, windows)
+
+    period_ids = [period_id for _, _, period_id in windows]
+    with SleepHeartRate._meta.database.atomic():
+        delete_samples(SleepHeartRate, "sleep_period_id", period_ids)
+        for batch in chunked(rows, MAX_VARIABLES // 3):
+            SleepHeartRate.insert_many(batch).execute()
+
+    logger.info(f"Stored {len(rows)} sleep heart rate samples")
+    return len(rows)
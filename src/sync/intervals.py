@@ -0,0 +1,117 @@
+"""
+Helpers for working with time intervals such as sleep periods.
+"""
+
+import heapq
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Hashable, Iterable, List, Optional, Tuple, Union
+
+Interval = Tuple[datetime, datetime]
+
+
+def as_utc(value: Union[datetime, str]) -> datetime:
+    """Coerce a stored datetime to an aware UTC datetime.
+
+    Peewee returns offset-aware values read back from SQLite as strings, and
+    naive values are assumed to already be in UTC.
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def merge_intervals(
+    intervals: Iterable[Interval], gap: timedelta = timedelta(0)
+) -> List[Interval]:
+    """Merge overlapping or adjacent intervals.
+
+    Args:
+        intervals: (start, end) pairs in any order.
+        gap: Intervals separated by at most this much are merged too.
+
+    Returns:
+        Disjoint intervals sorted by start.
+    """
+    merged: List[Interval] = []
+    for start, end in sorted((as_utc(s), as_utc(e)) for s, e in intervals):
+        if merged and start <= merged[-1][1] + gap:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class IntervalIndex:
+    """Map timestamps to the interval that contains them.
+
+    The intervals are flattened into sorted, disjoint segments when the index
+    is built (O(m log m)), so each lookup is one binary search (O(log m)).
+    Where source intervals overlap, the one that started last wins. Interval
+    ends are inclusive.
+
+    Example:
+        index = IntervalIndex((p.bedtime_start, p.bedtime_end, p.sleep_period_id)
+                              for p in periods)
+        period_ids = index.assign(sample["timestamp"] for sample in samples)
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[datetime, datetime, Hashable]]):
+        keys: List[Hashable] = []
+        spans = []
+        for start, end, key in intervals:
+            spans.append(
+                (as_utc(start).timestamp(), as_utc(end).timestamp(), len(keys))
+            )
+            keys.append(key)
+        spans.sort()
+
+        self._starts: List[float] = []
+        self._ends: List[float] = []
+        self._keys: List[Hashable] = []
+
+        boundaries = sorted({t for start, end, _ in spans for t in (start, end)})
+        active: List[Tuple[float, int, float]] = []  # (-start, -key_index, end)
+        position = 0
+        for boundary, next_boundary in zip(boundaries, boundaries[1:]):
+            while position < len(spans) and spans[position][0] <= boundary:
+                start, end, key_index = spans[position]
+                heapq.heappush(active, (-start, -key_index, end))
+                position += 1
+            while active and active[0][2] <= boundary:
+                heapq.heappop(active)
+            if not active:
+                continue
+
+            key = keys[-active[0][1]]
+            if self._keys and self._keys[-1] == key and self._ends[-1] == boundary:
+                self._ends[-1] = next_boundary
+            else:
+                self._starts.append(boundary)
+                self._ends.append(next_boundary)
+                self._keys.append(key)
+
+    def __len__(self) -> int:
+        """Number of disjoint segments in the index."""
+        return len(self._keys)
+
+    def lookup(self, timestamp: Union[datetime, str, float]) -> Optional[Hashable]:
+        """Return the key of the interval containing a timestamp, if any.
+
+        Args:
+            timestamp: Datetime, ISO 8601 string or POSIX timestamp.
+        """
+        if not isinstance(timestamp, (int, float)):
+            timestamp = as_utc(timestamp).timestamp()
+        i = bisect_right(self._starts, timestamp) - 1
+        if i >= 0 and timestamp <= self._ends[i]:
+            return self._keys[i]
+        return None
+
+    def assign(
+        self, timestamps: Iterable[Union[datetime, str, float]]
+    ) -> List[Optional[Hashable]]:
+        """Look up a stream of timestamps in O(n log m)."""
+        return [self.lookup(timestamp) for timestamp in timestamps]
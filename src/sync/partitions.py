@@ -0,0 +1,404 @@
+"""
+Monthly partitioning of the sample tables, with retention.
+
+The sample tables (`SleepHeartRate`, `SleepHRV`, `SpO2Sample`,
+`StressSample`) only keep the last few months of samples. Older samples
+are moved into one table per month, e.g. ``sleep_heart_rates_2024_01``,
+which `SamplePartition` registers. Inserts and recent-range queries
+therefore only touch the small hot tables. `select_samples` and
+`sample_tables` route range queries to the hot table plus the partitions
+the range overlaps.
+
+`apply_retention` moves samples out of the hot tables. It also downsamples
+old partitions to a coarser resolution (one averaged sample per parent
+record and interval) and drops partitions past the retention limit.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from itertools import groupby
+from typing import Any, Dict, Iterable, List, Optional, Type
+
+from peewee import (
+    AutoField,
+    Expression,
+    Field,
+    FloatField,
+    ForeignKeyField,
+    Function,
+    IntegerField,
+    Model,
+    chunked,
+    fn,
+)
+
+from src.models import (
+    BaseModel,
+    SamplePartition,
+    SleepHeartRate,
+    SleepHRV,
+    SpO2Sample,
+    StressSample,
+)
+
+from .writer import MAX_VARIABLES
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_MODELS: List[Type[BaseModel]] = [
+    SleepHeartRate,
+    SleepHRV,
+    SpO2Sample,
+    StressSample,
+]
+
+
+@dataclass
+class RetentionPolicy:
+    """How long samples stay hot, raw and stored at all, in months.
+
+    Months are counted back from the current month, which is always hot.
+    """
+
+    hot_months: int = 2
+    raw_months: Optional[int] = 12
+    keep_months: Optional[int] = None
+    resolution_minutes: int = 30
+
+
+def _add_months(day: date, months: int) -> date:
+    """First day of the month `months` after the month of `day`."""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _utc(day: date) -> datetime:
+    return datetime.combine(day, datetime.min.time(), timezone.utc)
+
+
+def _month_bounds(month: str) -> List[datetime]:
+    start = date.fromisoformat(f"{month}-01")
+    return [_utc(start), _utc(_add_months(start, 1))]
+
+
+def _partition_table(model: Type[BaseModel], month: str) -> str:
+    return f"{model._meta.table_name}_{month.replace('-', '_')}"
+
+
+def _clone_field(field: Field) -> Field:
+    """A copy of `field` for a partition table.
+
+    Foreign keys become plain indexed columns, so partitions do not add
+    backrefs to the parent models. Unique constraints are kept.
+    """
+    if isinstance(field, ForeignKeyField):
+        target = field.rel_field
+        kind = IntegerField if isinstance(target, AutoField) else type(target)
+        return kind(column_name=field.column_name, null=field.null, index=True)
+    return type(field)(
+        column_name=field.column_name,
+        null=field.null,
+        primary_key=field.primary_key,
+        unique=field.unique,
+        index=field.index or field.name == "timestamp",
+    )
+
+
+_partition_models: Dict[str, Type[Model]] = {}
+
+
+def partition_model(model: Type[BaseModel], month: str) -> Type[Model]:
+    """Model class for one month's partition of a sample model."""
+    table = _partition_table(model, month)
+    partition = _partition_models.get(table)
+    if partition is None:
+        attrs: Dict[str, Any] = {
+            field.column_name: _clone_field(field)
+            for field in model._meta.sorted_fields
+        }
+        indexes = tuple(
+            (tuple(model._meta.fields[name].column_name for name in names), unique)
+            for names, unique in model._meta.indexes
+        )
+        attrs["Meta"] = type("Meta", (), {"table_name": table, "indexes": indexes})
+        partition = type(table, (Model,), attrs)
+        _partition_models[table] = partition
+    partition._meta.set_database(model._meta.database)
+    return partition
+
+
+def retarget(node: Any, source: Type[Model]) -> Any:
+    """Copy of a filter with the fields of one model swapped for `source`'s.
+
+    Used to apply a filter on a sample model to its partition models.
+    """
+    if isinstance(node, Field):
+        return source._meta.columns[node.column_name]
+    if isinstance(node, Expression):
+        return Expression(
+            retarget(node.lhs, source),
+            node.op,
+            retarget(node.rhs, source),
+            node.flat,
+        )
+    if isinstance(node, Function):
+        return Function(node.name, [retarget(arg, source) for arg in node.arguments])
+    return node
+
+
+def partitions(
+    model: Type[BaseModel],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> List[SamplePartition]:
+    """Registered partitions of a sample model overlapping a time range."""
+    query = SamplePartition.select().where(
+        SamplePartition.source_table == model._meta.table_name
+    )
+    if start:
+        query = query.where(SamplePartition.month >= start.strftime("%Y-%m"))
+    if end:
+        query = query.where(SamplePartition.month <= end.strftime("%Y-%m"))
+    return list(query.order_by(SamplePartition.month))
+
+
+def sample_tables(
+    model: Type[BaseModel],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> List[str]:
+    """Tables holding a sample model's rows between `start` and `end`.
+
+    Partitions come first in month order, followed by the hot table.
+    """
+    return [p.table_name for p in partitions(model, start, end)] + [
+        model._meta.table_name
+    ]
+
+
+def select_samples(
+    model: Type[BaseModel],
+    *columns: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    """Select columns of a sample model across its hot table and partitions.
+
+    Args:
+        model: Sample model.
+        columns: Column names to select.
+        start: Earliest timestamp, inclusive.
+        end: Latest timestamp, exclusive.
+
+    Returns:
+        A UNION ALL query over the tables the range overlaps.
+    """
+    query = None
+    models = [partition_model(model, p.month) for p in partitions(model, start, end)]
+    for source in [*models, model]:
+        timestamp = source._meta.columns["timestamp"]
+        part = source.select(*[source._meta.columns[c] for c in columns])
+        if start:
+            part = part.where(timestamp >= start)
+        if end:
+            part = part.where(timestamp < end)
+        query = part if query is None else query + part
+    return query
+
+
+def delete_samples(model: Type[BaseModel], column: str, keys: List[Any]) -> int:
+    """Delete a sample model's rows whose `column` is in `keys`, everywhere."""
+    deleted = 0
+    sources = [partition_model(model, p.month) for p in partitions(model)]
+    for source in [model, *sources]:
+        field = source._meta.columns[column]
+        for batch in chunked(keys, MAX_VARIABLES):
+            deleted += source.delete().where(field.in_(batch)).execute()
+    return deleted
+
+
+def _ensure_partition(model: Type[BaseModel], month: str) -> SamplePartition:
+    table = partition_model(model, month)
+    table.create_table(safe=True)
+    partition, _ = SamplePartition.get_or_create(
+        table_name=table._meta.table_name,
+        defaults={
+            "source_table": model._meta.table_name,
+            "month": month,
+            "updated_at": datetime.now(timezone.utc),
+        },
+    )
+    return partition
+
+
+def partition_samples(model: Type[BaseModel], before: date) -> int:
+    """Move a sample model's rows older than `before` into monthly partitions.
+
+    Moving rows into a partition that was already downsampled marks it raw
+    again, so the next retention run downsamples it with the late rows.
+
+    Returns:
+        Number of rows moved.
+    """
+    hot = model._meta.table_name
+    database = model._meta.database
+    cutoff = _utc(before)
+    month = fn.substr(model.timestamp, 1, 7)
+    months = [
+        value
+        for (value,) in model.select(month)
+        .where(model.timestamp < cutoff)
+        .distinct()
+        .tuples()
+    ]
+    # Surrogate keys are reassigned by the partition. Natural keys are carried
+    # over, and a row moved again replaces its earlier copy.
+    columns = ", ".join(
+        f'"{field.column_name}"'
+        for field in model._meta.sorted_fields
+        if not isinstance(field, AutoField)
+    )
+    insert = (
+        "INSERT"
+        if isinstance(model._meta.primary_key, AutoField)
+        else "INSERT OR REPLACE"
+    )
+
+    moved = 0
+    for value in sorted(months):
+        start, end = _month_bounds(value)
+        bounds = (str(start), str(min(end, cutoff)))
+        with database.atomic():
+            partition = _ensure_partition(model, value)
+            table = partition.table_name
+            database.execute_sql(
+                f'{insert} INTO "{table}" ({columns}) SELECT {columns} '
+                f'FROM "{hot}" WHERE "timestamp" >= ? AND "timestamp" < ?',
+                bounds,
+            )
+            cursor = database.execute_sql(
+                f'DELETE FROM "{hot}" WHERE "timestamp" >= ? AND "timestamp" < ?',
+                bounds,
+            )
+            moved += cursor.rowcount
+            partition.row_count = partition_model(model, value).select().count()
+            partition.resolution_seconds = None
+            partition.updated_at = datetime.now(timezone.utc)
+            partition.save()
+    if moved:
+        logger.info(f"Moved {moved} rows of {hot} into {len(months)} partitions")
+    return moved
+
+
+def _parse_timestamp(value: Any) -> datetime:
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
+def downsample_partition(
+    model: Type[BaseModel], partition: SamplePartition, resolution_minutes: int
+) -> int:
+    """Replace a partition's rows with one averaged row per parent and interval.
+
+    Numeric columns are averaged (and rounded for integer columns); other
+    columns keep the first row's value. Each row's timestamp is the start
+    of its interval.
+
+    Returns:
+        Number of rows after downsampling.
+    """
+    table = partition_model(model, partition.month)
+    fields = table._meta.sorted_fields
+    parents = [
+        f.column_name
+        for f in model._meta.sorted_fields
+        if isinstance(f, ForeignKeyField)
+    ]
+    numeric = [
+        f.column_name
+        for f in fields
+        if isinstance(f, (IntegerField, FloatField))
+        and not f.primary_key
+        and f.column_name not in parents
+    ]
+    step = timedelta(minutes=resolution_minutes).total_seconds()
+
+    def interval(row: Dict[str, Any]) -> tuple:
+        timestamp = _parse_timestamp(row["timestamp"])
+        start = timestamp.timestamp() // step * step
+        bucket = datetime.fromtimestamp(start, timestamp.tzinfo or timezone.utc)
+        return (*[row[c] for c in parents], bucket)
+
+    rows = sorted(table.select().dicts(), key=interval)
+    downsampled = []
+    for key, group in groupby(rows, key=interval):
+        group = list(group)
+        row = {
+            f.column_name: group[0][f.column_name]
+            for f in fields
+            if not isinstance(f, AutoField)
+        }
+        row["timestamp"] = key[-1]
+        for column in numeric:
+            values = [r[column] for r in group if r[column] is not None]
+            mean = sum(values) / len(values) if values else None
+            if mean is not None and isinstance(
+                table._meta.columns[column], IntegerField
+            ):
+                mean = round(mean)
+            row[column] = mean
+        downsampled.append(row)
+
+    with table._meta.database.atomic():
+        table.delete().execute()
+        for batch in chunked(downsampled, MAX_VARIABLES // max(len(fields), 1)):
+            table.insert_many(batch).execute()
+        partition.row_count = len(downsampled)
+        partition.resolution_seconds = int(step)
+        partition.updated_at = datetime.now(timezone.utc)
+        partition.save()
+    logger.info(
+        f"Downsampled {partition.table_name} from {len(rows)} to "
+        f"{len(downsampled)} rows"
+    )
+    return len(downsampled)
+
+
+def drop_partition(model: Type[BaseModel], partition: SamplePartition) -> None:
+    """Drop a partition table and its registration."""
+    with SamplePartition._meta.database.atomic():
+        partition_model(model, partition.month).drop_table(safe=True)
+        partition.delete_instance()
+    logger.info(f"Dropped partition {partition.table_name}")
+
+
+def apply_retention(
+    policy: Optional[RetentionPolicy] = None,
+    models: Iterable[Type[BaseModel]] = SAMPLE_MODELS,
+    today: Optional[date] = None,
+) -> Dict[str, int]:
+    """Partition, downsample and drop sample data according to `policy`.
+
+    Returns:
+        Counts of moved rows and downsampled and dropped partitions.
+    """
+    policy = policy or RetentionPolicy()
+    current = (today or date.today()).replace(day=1)
+    hot_start = _add_months(current, -(policy.hot_months - 1))
+    stats = {"moved": 0, "downsampled": 0, "dropped": 0}
+
+    for model in models:
+        stats["moved"] += partition_samples(model, hot_start)
+        for partition in partitions(model):
+            month = date.fromisoformat(f"{partition.month}-01")
+            if policy.keep_months and month < _add_months(current, -policy.keep_months):
+                drop_partition(model, partition)
+                stats["dropped"] += 1
+            elif (
+                policy.raw_months is not None
+                and partition.resolution_seconds is None
+                and month < _add_months(current, -policy.raw_months)
+            ):
+                downsample_partition(model, partition, policy.resolution_minutes)
+                stats["downsampled"] += 1
+    return stats
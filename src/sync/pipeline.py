@@ -0,0 +1,190 @@
+"""
+Producer/consumer sync pipeline.
+
+Fetch workers call the API and normalize responses into row batches, which
+they push onto a bounded queue. A single writer thread owns the SQLite
+connection, drains the queue and commits in batches. Network and disk work
+overlap, SQLite only ever sees one writer, and a full queue blocks the
+fetch workers until the writer catches up.
+"""
+
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.api import OuraAPI
+from src.models import db
+
+from .coverage import record_coverage
+from .endpoints import FETCHERS, RowBatch, write_batches
+from .profiling import stage
+from .writer import WriteResult
+
+logger = logging.getLogger(__name__)
+
+# (endpoint, start_date, end_date)
+Job = Tuple[str, str, str]
+
+_DONE = object()
+# Sent instead of `_DONE` when a fetch failed, to discard uncommitted rows
+_ABORT = object()
+
+
+def split_range(start_date: str, end_date: str, days: int) -> List[Tuple[str, str]]:
+    """Split an inclusive date range into chunks of at most `days` days."""
+    start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    chunks = []
+    while start <= end:
+        chunk_end = min(start + timedelta(days=days - 1), end)
+        chunks.append((start.isoformat(), chunk_end.isoformat()))
+        start = chunk_end + timedelta(days=1)
+    return chunks
+
+
+class SyncPipeline:
+    """Fetch endpoints concurrently while one thread writes to SQLite.
+
+    Example:
+        pipeline = SyncPipeline(api, workers=4)
+        results = pipeline.run(pipeline.jobs(FETCHERS, "2024-01-01", "2024-06-30"))
+    """
+
+    def __init__(
+        self,
+        api: OuraAPI,
+        workers: int = 4,
+        queue_size: int = 8,
+        commit_rows: int = 5000,
+        chunk_days: int = 30,
+    ):
+        """Initialize the pipeline.
+
+        Args:
+            api: API client shared by the fetch workers.
+            workers: Number of concurrent fetch workers.
+            queue_size: Maximum fetched jobs waiting to be written.
+            commit_rows: Commit once this many rows have been written.
+            chunk_days: Days per fetch job when splitting a range.
+        """
+        self.api = api
+        self.workers = workers
+        self.commit_rows = commit_rows
+        self.chunk_days = chunk_days
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._results: Dict[str, WriteResult] = {}
+        self._writer_error: Optional[BaseException] = None
+        self._stopped = False
+
+    def jobs(
+        self, endpoints: Iterable[str], start_date: str, end_date: str
+    ) -> List[Job]:
+        """Build chunked fetch jobs for endpoints over a date range."""
+        chunks = split_range(start_date, end_date, self.chunk_days)
+        return [
+            (endpoint, start, end) for endpoint in endpoints for start, end in chunks
+        ]
+
+    def _fetch(self, job: Job) -> None:
+        endpoint, start_date, end_date = job
+        with stage(endpoint, "normalize"):
+            batches = FETCHERS[endpoint](self.api, start_date, end_date)
+        self._queue.put((job, batches))  # Blocks while the writer is behind
+
+    def _write(self) -> None:
+        """Writer thread: the only thread that touches the database."""
+        try:
+            self._write_queue()
+        except Exception as e:
+            logger.error(f"Writer failed: {str(e)}")
+            self._writer_error = self._writer_error or e
+            # Keep draining so fetch workers never block
+            while not self._stopped and self._queue.get() not in (_DONE, _ABORT):
+                pass
+
+    def _write_queue(self) -> None:
+        db.connect(reuse_if_open=True)
+        pending_rows = 0
+        try:
+            with db.atomic() as transaction:
+                while True:
+                    try:
+                        item = self._queue.get(timeout=0.5)
+                    except queue.Empty:
+                        if pending_rows:  # Idle, so commit what we have
+                            with stage("pipeline", "commit"):
+                                transaction.commit()
+                            pending_rows = 0
+                        continue
+                    self._stopped = item is _DONE or item is _ABORT
+                    if item is _ABORT:
+                        transaction.rollback()
+                        break
+                    if item is _DONE:
+                        if pending_rows and self._writer_error is None:
+                            with stage("pipeline", "commit"):
+                                transaction.commit()
+                        break
+                    if self._writer_error is not None:
+                        continue  # Keep draining so fetch workers never block
+
+                    job, batches = item
+                    try:
+                        pending_rows += self._write_job(job, batches)
+                        if pending_rows >= self.commit_rows:
+                            with stage("pipeline", "commit"):
+                                transaction.commit()
+                            pending_rows = 0
+                    except Exception as e:
+                        logger.error(f"Writer failed on {job}: {str(e)}")
+                        self._writer_error = e
+                        transaction.rollback()
+        finally:
+            db.close()
+
+    def _write_job(self, job: Job, batches: List[RowBatch]) -> int:
+        endpoint, start_date, end_date = job
+        days = (date.fromisoformat(start_date), date.fromisoformat(end_date))
+        with stage(endpoint, "write"):
+            written = write_batches(batches, days)
+        for table, result in written.items():
+            if table in self._results:
+                self._results[table].merge(result)
+            else:
+                self._results[table] = result
+        record_coverage(endpoint, *days)
+        return sum(len(rows) for _, _, rows in batches)
+
+    def run(self, jobs: List[Job]) -> Dict[str, WriteResult]:
+        """Fetch and write all jobs, returning write results by table.
+
+        Rows not committed yet when a fetch or write fails are rolled back.
+
+        Raises:
+            The first fetch or write error, after the writer has stopped.
+        """
+        writer = threading.Thread(target=self._write, name="sync-writer")
+        writer.start()
+        stop = _ABORT
+        try:
+            with ThreadPoolExecutor(self.workers, "sync-fetch") as pool:
+                futures = [pool.submit(self._fetch, job) for job in jobs]
+                try:
+                    for future in futures:
+                        future.result()
+                except Exception:
+                    for future in futures:
+                        future.cancel()
+                    raise
+            stop = _DONE
+        finally:
+            self._queue.put(stop)
+            writer.join()
+
+        if self._writer_error is not None:
+            raise self._writer_error
+        for result in self._results.values():
+            logger.info(f"Pipeline wrote {result}")
+        return self._results
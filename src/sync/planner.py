@@ -0,0 +1,163 @@
+"""
+Backfill planner that repairs only missing or stale days.
+
+Coverage recorded by `sync_range` tells, for every endpoint, which days were
+synced and when. The planner turns the uncovered or not-yet-settled days of
+a range into the fewest API requests without re-fetching covered days.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from src.api import OuraAPI
+
+from .coverage import coverage_by_day
+from .endpoints import SYNC_ORDER, sync_range
+from .writer import WriteResult
+
+logger = logging.getLogger(__name__)
+
+# Rough number of rows one day of each endpoint writes, for plan estimates
+RECORDS_PER_DAY: Dict[str, int] = {
+    "daily_activity": 1,
+    "daily_sleep": 1,
+    # The period plus ~8 hours of embedded 5-minute heart rate and HRV
+    "sleep_periods": 200,
+    "daily_readiness": 1,
+}
+
+# Largest range a single request may span. Sleep period documents carry
+# their sample series, so their ranges are capped to keep responses small.
+MAX_REQUEST_DAYS: Dict[str, int] = {
+    "sleep_periods": 30,
+}
+
+
+@dataclass
+class PlannedRequest:
+    """One API request repairing a contiguous run of days."""
+
+    endpoint: str
+    start_day: date
+    end_day: date
+    missing_days: int = 0
+    stale_days: int = 0
+
+    @property
+    def days(self) -> int:
+        return (self.end_day - self.start_day).days + 1
+
+    @property
+    def estimated_records(self) -> int:
+        return self.days * RECORDS_PER_DAY.get(self.endpoint, 1)
+
+
+@dataclass
+class BackfillPlan:
+    """Requests needed to bring a date range up to date."""
+
+    start_day: date
+    end_day: date
+    requests: List[PlannedRequest] = field(default_factory=list)
+
+    @property
+    def estimated_records(self) -> int:
+        return sum(request.estimated_records for request in self.requests)
+
+    def summary(self) -> str:
+        """Human-readable plan listing."""
+        lines = [
+            f"Backfill plan {self.start_day}..{self.end_day}: "
+            f"{len(self.requests)} requests, "
+            f"~{self.estimated_records} records"
+        ]
+        for request in self.requests:
+            lines.append(
+                f"  {request.endpoint:<18} {request.start_day}..{request.end_day} "
+                f"({request.missing_days} missing, {request.stale_days} stale, "
+                f"~{request.estimated_records} records)"
+            )
+        return "\n".join(lines)
+
+
+def _runs(days: List[date], max_days: Optional[int]) -> Iterable[List[date]]:
+    """Split sorted days into runs of consecutive days."""
+    run: List[date] = []
+    for day in days:
+        contiguous = run and day == run[-1] + timedelta(days=1)
+        if run and (not contiguous or (max_days and len(run) >= max_days)):
+            yield run
+            run = []
+        run.append(day)
+    if run:
+        yield run
+
+
+def plan_backfill(
+    start_day: date,
+    end_day: date,
+    endpoints: Optional[List[str]] = None,
+    settle_days: int = 2,
+) -> BackfillPlan:
+    """Work out which days of each endpoint need to be (re-)synced.
+
+    A day is missing if it was never synced, and stale if it was last synced
+    less than `settle_days` after it, since Oura keeps revising recent days.
+
+    Args:
+        start_day: First day of the range.
+        end_day: Last day of the range, inclusive.
+        endpoints: Endpoints to plan for. Defaults to all synced endpoints.
+        settle_days: Days after which a day's data is considered final.
+    """
+    plan = BackfillPlan(start_day, end_day)
+    endpoints = [e for e in SYNC_ORDER if e in (endpoints or SYNC_ORDER)]
+
+    for endpoint in endpoints:
+        synced = coverage_by_day(endpoint, start_day, end_day)
+        reasons: Dict[date, str] = {}
+        day = start_day
+        while day <= end_day:
+            synced_at = synced.get(day)
+            if synced_at is None:
+                reasons[day] = "missing"
+            elif synced_at.date() < day + timedelta(days=settle_days):
+                reasons[day] = "stale"
+            day += timedelta(days=1)
+
+        for run in _runs(sorted(reasons), MAX_REQUEST_DAYS.get(endpoint)):
+            missing = sum(1 for day in run if reasons[day] == "missing")
+            plan.requests.append(
+                PlannedRequest(
+                    endpoint=endpoint,
+                    start_day=run[0],
+                    end_day=run[-1],
+                    missing_days=missing,
+                    stale_days=len(run) - missing,
+                )
+            )
+
+    return plan
+
+
+def run_backfill(api: OuraAPI, plan: BackfillPlan) -> Dict[str, WriteResult]:
+    """Execute a plan, returning accumulated write results by table."""
+    results: Dict[str, WriteResult] = {}
+    for request in plan.requests:
+        logger.info(
+            f"Backfilling {request.endpoint} {request.start_day}..{request.end_day}"
+        )
+        synced = sync_range(
+            api,
+            request.endpoint,
+            request.start_day.isoformat(),
+            request.end_day.isoformat(),
+        )
+        for table, result in synced.items():
+            if table in results:
+                results[table].merge(result)
+            else:
+                results[table] = result
+    return results
@@ -0,0 +1,220 @@
+"""
+Profiling support for sync runs.
+
+`StageTimer` accumulates wall-clock time per endpoint and stage (fetch,
+normalize, write, commit). Sync code marks stages with `stage()`, which does
+nothing unless a timer is active. Stages nest: a stage's time excludes the
+stages inside it, so HTTP time recorded as ``fetch`` is not counted again
+under the ``normalize`` step that triggered it.
+
+`profile_run` wraps a whole run with the stage timer, cProfile and
+tracemalloc and writes the results as a JSON report.
+"""
+
+import cProfile
+import io
+import json
+import logging
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
+
+from src.api import OuraAPI
+from src.api.archive import endpoint_name
+
+logger = logging.getLogger(__name__)
+
+# Timer that `stage()` reports to, if profiling is on
+_active: Optional["StageTimer"] = None
+
+
+class StageTimer:
+    """Thread-safe wall-clock timings per endpoint and stage."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.seconds: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: defaultdict(float)
+        )
+        self.calls: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def _stack(self) -> List[List[Any]]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def current_endpoint(self) -> Optional[str]:
+        """Endpoint of the innermost stage running on this thread."""
+        stack = self._stack()
+        return stack[-1][0] if stack else None
+
+    @contextmanager
+    def stage(self, endpoint: str, name: str) -> Iterator[None]:
+        """Time a block as stage `name` of `endpoint`, excluding nested stages."""
+        stack = self._stack()
+        frame = [endpoint, 0.0]  # endpoint, seconds spent in nested stages
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][1] += elapsed
+            with self._lock:
+                self.seconds[endpoint][name] += elapsed - frame[1]
+                self.calls[endpoint][name] += 1
+
+    def instrument(self, api: OuraAPI) -> Callable[[], None]:
+        """Record every HTTP request the API client makes as a fetch stage.
+
+        Returns:
+            A function that removes the instrumentation again.
+        """
+        client = api.client
+        patched = "_make_request" in vars(client)
+        make_request = client._make_request
+
+        def timed_request(method, url_slug, **kwargs):
+            endpoint = self.current_endpoint() or endpoint_name(url_slug)
+            with self.stage(endpoint, "fetch"):
+                return make_request(method=method, url_slug=url_slug, **kwargs)
+
+        def restore() -> None:
+            if patched:
+                client._make_request = make_request
+            else:
+                del client._make_request
+
+        client._make_request = timed_request
+        return restore
+
+    def report(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Timings as ``{endpoint: {stage: {"seconds": s, "calls": n}}}``."""
+        with self._lock:
+            return {
+                endpoint: {
+                    name: {
+                        "seconds": round(seconds, 6),
+                        "calls": self.calls[endpoint][name],
+                    }
+                    for name, seconds in sorted(stages.items())
+                }
+                for endpoint, stages in sorted(self.seconds.items())
+            }
+
+
+def stage(endpoint: str, name: str) -> ContextManager[None]:
+    """Time a block on the active `StageTimer`, if there is one."""
+    if _active is None:
+        return nullcontext()
+    return _active.stage(endpoint, name)
+
+
+def _top_functions(profiler: cProfile.Profile, limit: int) -> List[Dict[str, Any]]:
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    stats.sort_stats(pstats.SortKey.CUMULATIVE)
+    rows = []
+    for func in stats.fcn_list[:limit]:
+        calls, _, own_time, cumulative, _ = stats.stats[func]
+        filename, line, name = func
+        rows.append(
+            {
+                "function": f"{filename}:{line}({name})",
+                "calls": calls,
+                "own_seconds": round(own_time, 6),
+                "cumulative_seconds": round(cumulative, 6),
+            }
+        )
+    return rows
+
+
+def _top_allocations(snapshot: tracemalloc.Snapshot, limit: int) -> List[Dict]:
+    return [
+        {
+            "location": str(stat.traceback),
+            "bytes": stat.size,
+            "blocks": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+
+@contextmanager
+def profile_run(
+    report_path: Union[str, Path], api: Optional[OuraAPI] = None, top: int = 25
+) -> Iterator[StageTimer]:
+    """Profile a sync run and write a JSON report when it finishes.
+
+    Collects per-stage timings, a cProfile dump of the calling thread
+    (written next to the report with a ``.prof`` suffix, for ``pstats`` or
+    snakeviz), the tracemalloc peak with its largest allocation sites and
+    the API's rate-limit waits.
+
+    Args:
+        report_path: Where to write the JSON report.
+        api: If given, its HTTP requests are timed as fetch stages while
+            the run lasts.
+        top: Number of functions and allocation sites to include.
+    """
+    global _active
+    report_path = Path(report_path)
+    timer = StageTimer()
+    restore = timer.instrument(api) if api is not None else None
+
+    started_at = datetime.now(timezone.utc)
+    tracemalloc.start()
+    profiler = cProfile.Profile()
+    _active = timer
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield timer
+    finally:
+        profiler.disable()
+        wall_seconds = time.perf_counter() - start
+        _active = None
+        if restore is not None:
+            restore()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        profile_path = report_path.with_suffix(".prof")
+        profiler.dump_stats(str(profile_path))
+        limiter = getattr(api, "rate_limiter", None)
+        page_pool = getattr(api, "page_pool", None)
+        report = {
+            "started_at": started_at.isoformat(),
+            "wall_seconds": round(wall_seconds, 6),
+            "stages": timer.report(),
+            "rate_limit": limiter.stats if limiter else None,
+            "page_pool": page_pool.stats if page_pool else None,
+            "memory": {
+                "peak_bytes": peak_bytes,
+                "top_allocations": _top_allocations(snapshot, top),
+            },
+            "profile": {
+                "pstats_path": str(profile_path),
+                "top_functions": _top_functions(profiler, top),
+            },
+        }
+        report_path.write_text(json.dumps(report, indent=2))
+        logger.info(f"Wrote profiling report to {report_path}")
@@ -0,0 +1,91 @@
+"""
+Builders that turn normalized `OuraAPI` records into model rows.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+from src.api.types import (
+    ActivityContributorDict,
+    ActivitySummaryDict,
+    PersonalInfoDict,
+    ReadinessContributorDict,
+    ReadinessSummaryDict,
+    SleepContributorDict,
+    SleepSummaryDict,
+)
+
+
+def _flatten_contributors(
+    record: Dict[str, Any], names: Iterable[str]
+) -> Dict[str, Any]:
+    """Copy a record, replacing its `contributors` dict with flat columns."""
+    row = dict(record)
+    contributors = row.pop("contributors", None) or {}
+    row.update({name: contributors.get(name) for name in names})
+    return row
+
+
+def personal_info_row(personal_info: PersonalInfoDict) -> Dict[str, Any]:
+    """Build a `PersonalInfo` row."""
+    return dict(personal_info)
+
+
+def activity_row(activity: ActivitySummaryDict) -> Dict[str, Any]:
+    """Build a `DailyActivity` row with flattened contributors."""
+    return _flatten_contributors(activity, ActivityContributorDict.__annotations__)
+
+
+def readiness_row(readiness: ReadinessSummaryDict) -> Dict[str, Any]:
+    """Build a `DailyReadiness` row with flattened contributors."""
+    return _flatten_contributors(readiness, ReadinessContributorDict.__annotations__)
+
+
+def sleep_period_row(period: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Build a `SleepPeriod` row from a raw sleep period.
+
+    The row leaves out the link to the daily sleep, which is set by
+    `link_sleep_periods` and so kept out of the content hash.
+
+    Returns:
+        The row, or None if the period has no bedtime window.
+    """
+    if not (period.get("bedtime_start") and period.get("bedtime_end")):
+        return None
+
+    bedtime_start = datetime.fromisoformat(period["bedtime_start"])
+    bedtime_end = datetime.fromisoformat(period["bedtime_end"])
+    return {
+        "sleep_period_id": str(period.get("id", "")),
+        "day": period.get("day"),
+        "start_datetime": bedtime_start,
+        "end_datetime": bedtime_end,
+        "total_sleep_duration": period.get("total_sleep_duration"),
+        "awake_time": period.get("awake_time"),
+        "light_sleep_duration": period.get("light_sleep_duration"),
+        "rem_sleep_duration": period.get("rem_sleep_duration"),
+        "deep_sleep_duration": period.get("deep_sleep_duration"),
+        "restless_periods": period.get("restless_periods"),
+        "average_heart_rate": period.get("average_heart_rate"),
+        "lowest_heart_rate": period.get("lowest_heart_rate"),
+        "average_hrv": period.get("average_hrv"),
+        "temperature_delta": period.get("temperature_delta"),
+        "bedtime_start": bedtime_start,
+        "bedtime_end": bedtime_end,
+        "readiness_score_delta": period.get("readiness_score_delta"),
+        "hypnogram": period.get("sleep_phase_5_min"),
+    }
+
+
+def sleep_row(sleep: SleepSummaryDict) -> Dict[str, Any]:
+    """Build a `DailySleep` row.
+
+    Nested periods are dropped: `SleepPeriod` rows come from the sleep
+    periods endpoint only (see `src.sync.sleep_periods`).
+    """
+    row = _flatten_contributors(sleep, SleepContributorDict.__annotations__)
+    row.pop("periods", None)
+
+    if isinstance(row.get("day"), str):
+        row["day"] = datetime.strptime(row["day"], "%Y-%m-%d").date()
+    return row
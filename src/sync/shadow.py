@@ -0,0 +1,117 @@
+"""
+Shadow-database syncs that never block readers of the live database.
+
+`shadow_database` copies the live SQLite file with the online backup API,
+points the peewee database at the copy for the duration of the sync, and
+atomically renames the copy over the live file when the sync succeeds.
+Readers of the live file only ever see a complete database: connections
+opened before the swap keep reading the old snapshot, new connections see
+the new one, and neither waits on the sync's write locks.
+
+Other writers, however, are held off: a write committed to the live file
+after the copy would be lost by the swap, so the live file's write lock is
+taken before the copy and kept until the swap. Writers that open their
+connection after the swap write to the new file.
+
+    with shadow_database(db):
+        copy_daily_data(api, "2024-01-01")
+"""
+
+import logging
+import os
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Union
+
+from peewee import SqliteDatabase
+
+logger = logging.getLogger(__name__)
+
+# Pages copied per backup step; readers may take the lock between steps
+BACKUP_PAGES = 1024
+
+
+def copy_database(source: Union[str, Path], target: Union[str, Path]) -> None:
+    """Copy a SQLite database with the online backup API.
+
+    The copy is consistent even while other connections use the source, and
+    is left in rollback-journal mode so it can be renamed into place without
+    a write-ahead log that belongs to another file.
+    """
+    src = sqlite3.connect(f"file:{Path(source).resolve()}?mode=ro", uri=True)
+    dst = sqlite3.connect(str(target))
+    try:
+        src.backup(dst, pages=BACKUP_PAGES)
+        dst.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        dst.close()
+        src.close()
+
+
+def _publish(shadow: Path, live: Path) -> None:
+    """Flush the shadow file to disk and rename it over the live file."""
+    fd = os.open(shadow, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(shadow, live)
+
+
+@contextmanager
+def shadow_database(database: SqliteDatabase) -> Iterator[Path]:
+    """Run the enclosed writes against a copy of the database, then swap it in.
+
+    On success the copy replaces the live file with one atomic rename. On
+    error the copy is discarded and the live file is left untouched. Either
+    way the database points at the live file again afterwards, with its
+    original pragmas and connect parameters. Other connections cannot write
+    to the live file until then.
+
+    Args:
+        database: File-backed peewee database to shadow.
+
+    Yields:
+        Path of the shadow file being written.
+    """
+    live = Path(database.database)
+    shadow = live.with_name(f"{live.name}.shadow")
+    # Reopen both files with the database's own settings
+    settings = {
+        "pragmas": list(database._pragmas),
+        "timeout": database._timeout,
+        **database.connect_params,
+    }
+
+    database.close()
+    if shadow.exists():
+        logger.warning(f"Discarding stale shadow database {shadow}")
+        shadow.unlink()
+    lock = None
+    if live.exists():
+        lock = sqlite3.connect(
+            str(live), timeout=database._timeout, isolation_level=None
+        )
+        lock.execute("BEGIN IMMEDIATE")
+        try:
+            copy_database(live, shadow)
+        except BaseException:
+            lock.close()
+            raise
+    logger.info(f"Syncing into shadow database {shadow}")
+
+    database.init(str(shadow), **settings)
+    try:
+        yield shadow
+        database.close()
+        _publish(shadow, live)
+        logger.info(f"Published shadow database to {live}")
+    except BaseException:
+        database.close()
+        shadow.unlink(missing_ok=True)
+        raise
+    finally:
+        if lock is not None:
+            lock.close()
+        database.init(str(live), **settings)
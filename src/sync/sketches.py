@@ -0,0 +1,317 @@
+"""
+Mergeable quantile sketches of metrics, one per metric and month.
+
+Percentiles such as "95th-percentile sleep heart rate" or "median steps
+this year" would otherwise sort the whole history. Each month of a metric
+is summarized in a t-digest of a few hundred centroids. A percentile over
+any range of months merges those digests, so its cost does not grow with
+the number of samples.
+
+After a sync, only the months touched by changed rows are rebuilt.
+"""
+
+import logging
+import math
+import struct
+from array import array
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from peewee import DateTimeField, Field, chunked, fn
+
+from src.models import DailyFact, MetricSketch, SleepHeartRate, SleepHRV
+
+from .facts import changed_days
+from .partitions import partitions, select_samples
+from .writer import MAX_VARIABLES, WriteResult
+
+logger = logging.getLogger(__name__)
+
+# Metric name -> (time column, value column). Daily metrics come from the
+# per-day fact table, so sketches are refreshed after the facts.
+METRICS: Dict[str, Tuple[Field, Field]] = {
+    "steps": (DailyFact.day, DailyFact.steps),
+    "lowest_heart_rate": (DailyFact.day, DailyFact.lowest_heart_rate),
+    "average_hrv": (DailyFact.day, DailyFact.average_hrv),
+    "total_sleep_duration": (DailyFact.day, DailyFact.total_sleep_duration),
+    "sleep_heart_rate": (SleepHeartRate.timestamp, SleepHeartRate.bpm),
+    "sleep_hrv": (SleepHRV.timestamp, SleepHRV.rmssd),
+}
+
+COMPRESSION = 100.0
+_HEADER = struct.Struct("<ddd")  # compression, min, max
+
+
+class TDigest:
+    """Merging t-digest (Dunning & Ertl) for streaming quantile estimates.
+
+    Values are buffered and periodically merged into centroids whose size
+    is bounded by the arcsine scale function, which keeps the tails
+    accurate. Digests of disjoint data merge into a digest of the union.
+
+    Example:
+        digest = TDigest()
+        digest.extend([52, 48, 61])
+        digest.quantile(0.95)
+    """
+
+    __slots__ = ("compression", "means", "weights", "min", "max", "_buffer")
+
+    def __init__(self, compression: float = COMPRESSION):
+        self.compression = compression
+        self.means: List[float] = []
+        self.weights: List[float] = []
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer: List[Tuple[float, float]] = []
+
+    @property
+    def count(self) -> float:
+        return sum(self.weights) + sum(weight for _, weight in self._buffer)
+
+    def update(self, value: float, weight: float = 1.0) -> None:
+        """Add a value."""
+        self._buffer.append((value, weight))
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self._buffer) >= 10 * self.compression:
+            self._compress()
+
+    def extend(self, values: Iterable[float]) -> "TDigest":
+        """Add many values."""
+        for value in values:
+            self.update(value)
+        return self
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        """Fold another digest into this one."""
+        other._compress()
+        self._buffer.extend(zip(other.means, other.weights))
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if len(self._buffer) >= 10 * self.compression:
+            self._compress()
+        return self
+
+    def _scale(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _scale_inverse(self, k: float) -> float:
+        return (math.sin(min(k * 2 * math.pi / self.compression, math.pi / 2)) + 1) / 2
+
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+        items = sorted([*zip(self.means, self.weights), *self._buffer])
+        self._buffer = []
+        total = sum(weight for _, weight in items)
+
+        means, weights = [], []
+        mean, weight = items[0]
+        done = 0.0
+        limit = self._scale_inverse(self._scale(0.0) + 1) * total
+        for next_mean, next_weight in items[1:]:
+            if done + weight + next_weight <= limit:
+                weight += next_weight
+                mean += (next_mean - mean) * next_weight / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                done += weight
+                limit = self._scale_inverse(self._scale(done / total) + 1) * total
+                mean, weight = next_mean, next_weight
+        means.append(mean)
+        weights.append(weight)
+        self.means, self.weights = means, weights
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the `q` quantile (0 to 1), or None if the digest is empty."""
+        self._compress()
+        if not self.means:
+            return None
+        if len(self.means) == 1:
+            return self.means[0]
+
+        total = sum(self.weights)
+        target = q * total
+        # Interpolate between centroid centres, pinned to min and max at the ends
+        position, previous_mean, previous_center = 0.0, self.min, 0.0
+        for mean, weight in zip(self.means, self.weights):
+            center = position + weight / 2
+            if target < center:
+                if center == previous_center:
+                    return mean
+                fraction = (target - previous_center) / (center - previous_center)
+                return previous_mean + fraction * (mean - previous_mean)
+            position += weight
+            previous_mean, previous_center = mean, center
+        if total == previous_center:
+            return self.max
+        fraction = (target - previous_center) / (total - previous_center)
+        return previous_mean + fraction * (self.max - previous_mean)
+
+    def to_bytes(self) -> bytes:
+        """Serialize as a header followed by interleaved (mean, weight) doubles."""
+        self._compress()
+        centroids = array(
+            "d", [x for pair in zip(self.means, self.weights) for x in pair]
+        )
+        return _HEADER.pack(self.compression, self.min, self.max) + centroids.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TDigest":
+        compression, minimum, maximum = _HEADER.unpack_from(data)
+        digest = cls(compression)
+        centroids = array("d")
+        centroids.frombytes(data[_HEADER.size :])
+        digest.means = list(centroids[0::2])
+        digest.weights = list(centroids[1::2])
+        digest.min, digest.max = minimum, maximum
+        return digest
+
+
+def _month(day: date) -> str:
+    return day.strftime("%Y-%m")
+
+
+def _month_range(bucket: str) -> Tuple[date, date]:
+    """First day of the month and first day of the next month."""
+    start = date.fromisoformat(f"{bucket}-01")
+    return start, (start + timedelta(days=32)).replace(day=1)
+
+
+def _bounds(time_field: Field, bucket: str):
+    start, end = _month_range(bucket)
+    if not isinstance(time_field, DateTimeField):
+        return start, end
+    # Sample timestamps are stored in UTC
+    return (
+        datetime.combine(start, datetime.min.time(), timezone.utc),
+        datetime.combine(end, datetime.min.time(), timezone.utc),
+    )
+
+
+def _digest(metric: str, bucket: str) -> TDigest:
+    """Build a metric's digest for one month from its source table."""
+    time_field, value_field = METRICS[metric]
+    start, end = _bounds(time_field, bucket)
+    if isinstance(time_field, DateTimeField):
+        # Older sample months live in partitions
+        query = select_samples(
+            value_field.model, value_field.column_name, start=start, end=end
+        ).tuples()
+        return TDigest().extend(
+            value for (value,) in query.iterator() if value is not None
+        )
+    query = (
+        value_field.model.select(value_field)
+        .where((time_field >= start) & (time_field < end) & value_field.is_null(False))
+        .tuples()
+    )
+    return TDigest().extend(value for (value,) in query.iterator())
+
+
+def refresh_sketch_buckets(
+    buckets: Iterable[str], metrics: Optional[Iterable[str]] = None
+) -> int:
+    """Rebuild the sketches of the given months.
+
+    Args:
+        buckets: Months as YYYY-MM.
+        metrics: Metric names; defaults to all of `METRICS`.
+
+    Returns:
+        Number of sketches written.
+    """
+    metrics = list(metrics or METRICS)
+    buckets = sorted(set(buckets))
+    rows = []
+    for metric in metrics:
+        for bucket in buckets:
+            digest = _digest(metric, bucket)
+            if digest.count:
+                rows.append(
+                    {
+                        "metric": metric,
+                        "bucket": bucket,
+                        "count": int(digest.count),
+                        "digest": digest.to_bytes(),
+                    }
+                )
+
+    with MetricSketch._meta.database.atomic():
+        for batch in chunked(buckets, MAX_VARIABLES):
+            MetricSketch.delete().where(
+                MetricSketch.metric.in_(metrics) & MetricSketch.bucket.in_(batch)
+            ).execute()
+        for batch in chunked(rows, MAX_VARIABLES // 4):
+            MetricSketch.insert_many(batch).execute()
+    return len(rows)
+
+
+def refresh_sketches(results: Dict[str, WriteResult]) -> int:
+    """Rebuild the sketches of the months touched by a sync's changes.
+
+    Sleep samples are bucketed by UTC timestamp, which for a night can fall
+    on the day before its local day, so that day's month is included too.
+    """
+    days: Set[date] = changed_days(results)
+    buckets = {_month(day) for day in days} | {
+        _month(day - timedelta(days=1)) for day in days
+    }
+    if not buckets:
+        return 0
+    written = refresh_sketch_buckets(buckets)
+    logger.info(f"Refreshed {written} metric sketches for {len(buckets)} months")
+    return written
+
+
+def rebuild_sketches() -> int:
+    """Rebuild every sketch from the source tables."""
+    buckets: Set[str] = set()
+    for time_field, _ in METRICS.values():
+        month = fn.substr(time_field, 1, 7)
+        query = time_field.model.select(month).distinct().tuples()
+        buckets.update(bucket for (bucket,) in query if bucket)
+        if isinstance(time_field, DateTimeField):
+            buckets.update(
+                partition.month for partition in partitions(time_field.model)
+            )
+    return refresh_sketch_buckets(buckets)
+
+
+def load_digest(
+    metric: str, start: Optional[date] = None, end: Optional[date] = None
+) -> TDigest:
+    """Merge a metric's monthly sketches for the months from `start` to `end`.
+
+    Ranges are rounded out to whole months.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric {metric!r}")
+    query = MetricSketch.select(MetricSketch.digest).where(
+        MetricSketch.metric == metric
+    )
+    if start:
+        query = query.where(MetricSketch.bucket >= _month(start))
+    if end:
+        query = query.where(MetricSketch.bucket <= _month(end))
+
+    digest = TDigest()
+    for (data,) in query.tuples():
+        digest.merge(TDigest.from_bytes(bytes(data)))
+    return digest
+
+
+def percentile(
+    metric: str,
+    p: float,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> Optional[float]:
+    """Estimate a metric's `p`-th percentile (0 to 100) over whole months.
+
+    Example:
+        percentile("sleep_heart_rate", 95, date(2024, 1, 1), date(2024, 12, 31))
+    """
+    return load_digest(metric, start, end).quantile(p / 100)
@@ -0,0 +1,268 @@
+"""
+Ingest sleep periods together with their embedded nightly detail.
+
+Each sleep periods endpoint document carries 5-minute heart rate and HRV
+series and a `sleep_phase_5_min` hypnogram. Decoding those in the same pass
+that stores the period fills `SleepHeartRate`, `SleepHRV` and
+`SleepStageStats` at one request per date range, instead of downloading the
+per-sample heart rate stream separately.
+
+Samples and statistics are only rewritten for periods whose content changed,
+and removed with periods deleted upstream. The period row carries a digest
+of its series for that, since the series themselves are not stored on it.
+"""
+
+import logging
+from datetime import date, datetime, timedelta
+from itertools import groupby
+from typing import Any, Dict, List, Optional, Tuple
+
+from peewee import chunked
+
+from src.api import OuraAPI
+from src.api.types import SleepPeriodDocumentDict, SleepSeriesDict
+from src.models import (
+    DailySleep,
+    SleepHeartRate,
+    SleepHRV,
+    SleepPeriod,
+    SleepStageStats,
+)
+
+from .intervals import as_utc
+from .partitions import delete_samples
+from .rows import sleep_period_row
+from .writer import MAX_VARIABLES, WriteResult, content_hash, write_records
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Hypnogram digits
+DEEP, LIGHT, REM, AWAKE = 1, 2, 3, 4
+EPOCH_MINUTES = 5
+
+
+def decode_series(series: Optional[SleepSeriesDict]) -> List[Tuple[datetime, float]]:
+    """Expand an embedded series into (UTC timestamp, value) samples.
+
+    Items without a value are skipped.
+    """
+    if not series or not series.get("items") or not series.get("timestamp"):
+        return []
+    start = as_utc(series["timestamp"])
+    step = timedelta(seconds=series["interval"])
+    return [
+        (start + index * step, value)
+        for index, value in enumerate(series["items"])
+        if value is not None
+    ]
+
+
+def _runs(hypnogram: str) -> Tuple[List[int], List[int], List[int]]:
+    """Run-length encode a hypnogram into (stages, starts, lengths)."""
+    if np is not None:
+        codes = np.frombuffer(hypnogram.encode("ascii"), dtype=np.uint8) - ord("0")
+        starts = np.flatnonzero(np.diff(codes, prepend=codes[0] + 1))
+        lengths = np.diff(starts, append=len(codes))
+        return codes[starts].tolist(), starts.tolist(), lengths.tolist()
+
+    stages, starts, lengths = [], [], []
+    position = 0
+    for stage, run in groupby(hypnogram):
+        length = len(list(run))
+        stages.append(int(stage))
+        starts.append(position)
+        lengths.append(length)
+        position += length
+    return stages, starts, lengths
+
+
+def stage_statistics(hypnogram: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Sleep stage statistics of a hypnogram, in minutes where applicable.
+
+    The hypnogram is run-length encoded first (vectorized with NumPy when it
+    is installed), so the statistics cost one pass over a few dozen runs.
+
+    Returns:
+        `SleepStageStats` columns, or None for an empty hypnogram.
+    """
+    if not hypnogram:
+        return None
+    stages, starts, lengths = _runs(hypnogram)
+
+    minutes = {stage: 0 for stage in (DEEP, LIGHT, REM, AWAKE)}
+    longest = {stage: 0 for stage in (DEEP, LIGHT, REM, AWAKE)}
+    for stage, length in zip(stages, lengths):
+        if stage in minutes:
+            minutes[stage] += length * EPOCH_MINUTES
+            longest[stage] = max(longest[stage], length * EPOCH_MINUTES)
+
+    sleep_runs = [i for i, stage in enumerate(stages) if stage != AWAKE]
+    onset = starts[sleep_runs[0]] if sleep_runs else None
+    first_rem = next(
+        (start for stage, start in zip(stages, starts) if stage == REM), None
+    )
+    awakenings = (
+        sum(1 for stage in stages[sleep_runs[0] : sleep_runs[-1]] if stage == AWAKE)
+        if sleep_runs
+        else 0
+    )
+
+    return {
+        "deep_minutes": minutes[DEEP],
+        "light_minutes": minutes[LIGHT],
+        "rem_minutes": minutes[REM],
+        "awake_minutes": minutes[AWAKE],
+        "sleep_onset_minutes": (onset * EPOCH_MINUTES if onset is not None else None),
+        "rem_latency_minutes": (
+            (first_rem - onset) * EPOCH_MINUTES
+            if first_rem is not None and onset is not None
+            else None
+        ),
+        "stage_transitions": len(stages) - 1,
+        "awakenings": awakenings,
+        "longest_deep_minutes": longest[DEEP],
+        "longest_awake_minutes": longest[AWAKE],
+    }
+
+
+def link_sleep_periods() -> int:
+    """Link unlinked periods to the daily sleep of their day.
+
+    The link is not part of a period's content hash, so linking does not
+    make the next sync rewrite the period.
+
+    Returns:
+        Number of periods linked.
+    """
+    summary_id = (
+        DailySleep.select(DailySleep.sleep_summary_id)
+        .where(DailySleep.day == SleepPeriod.day)
+        .limit(1)
+    )
+    linked = (
+        SleepPeriod.update(sleep_summary=summary_id)
+        .where(
+            SleepPeriod.sleep_summary.is_null()
+            & SleepPeriod.day.in_(DailySleep.select(DailySleep.day))
+        )
+        .execute()
+    )
+    if linked:
+        logger.info(f"Linked {linked} sleep periods to their daily sleep")
+    return linked
+
+
+def unlink_sleep_periods(sleep_summary_ids: List[str]) -> int:
+    """Unlink periods from deleted daily sleeps, so they can be relinked.
+
+    Returns:
+        Number of periods unlinked.
+    """
+    unlinked = 0
+    for ids in chunked(sleep_summary_ids, MAX_VARIABLES):
+        unlinked += (
+            SleepPeriod.update(sleep_summary=None)
+            .where(SleepPeriod.sleep_summary.in_(ids))
+            .execute()
+        )
+    return unlinked
+
+
+def _delete_details(period_ids: List[str]) -> None:
+    """Delete the samples and stage statistics of the given periods."""
+    for model in (SleepHeartRate, SleepHRV):
+        delete_samples(model, "sleep_period_id", period_ids)
+    for ids in chunked(period_ids, MAX_VARIABLES):
+        SleepStageStats.delete().where(SleepStageStats.sleep_period.in_(ids)).execute()
+
+
+def _replace_details(periods: List[SleepPeriodDocumentDict]) -> int:
+    """Rewrite the samples and stage statistics of the given periods.
+
+    Returns:
+        Number of heart rate and HRV samples written.
+    """
+    _delete_details([period["id"] for period in periods])
+
+    heart_rate_rows, hrv_rows, stats_rows = [], [], []
+    for period in periods:
+        period_id = period["id"]
+        heart_rate_rows.extend(
+            {"sleep_period": period_id, "timestamp": timestamp, "bpm": round(bpm)}
+            for timestamp, bpm in decode_series(period.get("heart_rate"))
+        )
+        hrv_rows.extend(
+            {"sleep_period": period_id, "timestamp": timestamp, "rmssd": round(hrv)}
+            for timestamp, hrv in decode_series(period.get("hrv"))
+        )
+        stats = stage_statistics(period.get("sleep_phase_5_min"))
+        if stats:
+            stats_rows.append({"sleep_period": period_id, **stats})
+
+    for model, rows in (
+        (SleepHeartRate, heart_rate_rows),
+        (SleepHRV, hrv_rows),
+        (SleepStageStats, stats_rows),
+    ):
+        if rows:
+            for batch in chunked(rows, MAX_VARIABLES // len(rows[0])):
+                model.insert_many(batch).execute()
+    return len(heart_rate_rows) + len(hrv_rows)
+
+
+def write_sleep_periods(
+    periods: List[SleepPeriodDocumentDict],
+    days: Optional[Tuple[date, date]] = None,
+) -> Dict[str, WriteResult]:
+    """Write normalized sleep period documents and their embedded detail.
+
+    Given `days`, stored periods of those days missing from `periods` are
+    deleted with their detail (see `write_records`). Periods are then linked to the daily sleep of their day. A period whose
+    day has no daily sleep yet is left unlinked until `link_sleep_periods`
+    runs for that daily sleep.
+
+    Returns:
+        Write results keyed by table name.
+    """
+    rows, documents = [], {}
+    for period in periods:
+        row = sleep_period_row(period)
+        if row:
+            row["series_hash"] = content_hash(
+                {"heart_rate": period.get("heart_rate"), "hrv": period.get("hrv")}
+            )
+            rows.append(row)
+            documents[row["sleep_period_id"]] = period
+
+    with SleepPeriod._meta.database.atomic():
+        result = write_records(SleepPeriod, rows, days=days)
+        _delete_details(result.deleted)
+        samples = _replace_details([documents[key] for key in result.changed])
+        link_sleep_periods()
+
+    logger.info(f"Synced sleep periods: {result}, {samples} embedded samples")
+    return {result.table: result}
+
+
+def sync_sleep_periods(
+    api: OuraAPI,
+    start_date: str,
+    end_date: str,
+    days: Optional[Tuple[date, date]] = None,
+) -> Dict[str, WriteResult]:
+    """Sync sleep periods and their embedded detail for a date range.
+
+    See `write_sleep_periods`; pass the range as `days` to delete periods
+    upstream no longer returns.
+
+    Returns:
+        Write results keyed by table name.
+    """
+    return write_sleep_periods(
+        api.get_sleep_periods(start_date=start_date, end_date=end_date), days
+    )
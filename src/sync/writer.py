@@ -0,0 +1,149 @@
+"""
+Change-detecting bulk writer for synced records.
+
+Every row is hashed on its way in and the hash is stored in the row's
+`content_hash` column. Re-syncing an overlap window then only touches rows
+whose content actually changed upstream. Given the days a sync covered,
+stored rows of those days that upstream no longer returns are deleted.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+from peewee import Field, chunked
+
+from src.models import HashedModel
+
+logger = logging.getLogger(__name__)
+
+# Conservative bound on bound parameters per statement for older SQLite builds
+MAX_VARIABLES = 999
+
+
+def content_hash(row: Dict[str, Any]) -> str:
+    """Return a stable hash of a row's content, ignoring its stored hash."""
+    payload = json.dumps(
+        {k: v for k, v in row.items() if k != "content_hash"},
+        sort_keys=True,
+        default=str,
+        separators=(",", ":"),
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+@dataclass
+class WriteResult:
+    """Outcome of writing one batch of rows to a table."""
+
+    table: str
+    inserted: List[Any] = field(default_factory=list)
+    updated: List[Any] = field(default_factory=list)
+    unchanged: int = 0
+    deleted: List[Any] = field(default_factory=list)
+    # Day of each deleted row, which can no longer be looked up
+    deleted_days: Dict[Any, date] = field(default_factory=dict)
+
+    @property
+    def changed(self) -> List[Any]:
+        """Keys of rows that were inserted or updated."""
+        return self.inserted + self.updated
+
+    def merge(self, other: "WriteResult") -> "WriteResult":
+        """Accumulate another result for the same table into this one."""
+        self.inserted.extend(other.inserted)
+        self.updated.extend(other.updated)
+        self.unchanged += other.unchanged
+        self.deleted.extend(other.deleted)
+        self.deleted_days.update(other.deleted_days)
+        return self
+
+    def __str__(self) -> str:
+        summary = (
+            f"{self.table}: {len(self.inserted)} inserted, "
+            f"{len(self.updated)} updated, {self.unchanged} unchanged"
+        )
+        if self.deleted:
+            summary += f", {len(self.deleted)} deleted"
+        return summary
+
+
+def write_records(
+    model: Type[HashedModel],
+    rows: Iterable[Dict[str, Any]],
+    key: Optional[Field] = None,
+    days: Optional[Tuple[date, date]] = None,
+) -> WriteResult:
+    """Upsert rows, skipping those whose content hash is unchanged.
+
+    Args:
+        model: Target model.
+        rows: Rows keyed by model field name.
+        key: Natural key field used to match rows. Defaults to the primary key.
+        days: First and last day `rows` are the complete upstream data for.
+            Stored rows of these days whose key is not among `rows` are
+            deleted. Requires a `day` field on the model.
+
+    Returns:
+        Keys of inserted, updated and deleted rows and the number of
+        unchanged rows.
+    """
+    key_field = key or model._meta.primary_key
+    result = WriteResult(model._meta.table_name)
+
+    incoming: Dict[Any, Dict[str, Any]] = {}
+    for row in rows:
+        row = dict(row)
+        row["content_hash"] = content_hash(row)
+        incoming[row[key_field.name]] = row  # Later duplicates win
+
+    if days is not None:
+        _delete_missing(model, key_field, incoming, days, result)
+    if not incoming:
+        return result
+
+    existing: Dict[Any, Optional[str]] = {}
+    for keys in chunked(list(incoming), MAX_VARIABLES):
+        query = model.select(key_field, model.content_hash).where(key_field.in_(keys))
+        existing.update(query.tuples())
+
+    to_insert = []
+    for row_key, row in incoming.items():
+        if row_key not in existing:
+            to_insert.append(row)
+            result.inserted.append(row_key)
+        elif existing[row_key] != row["content_hash"]:
+            model.update(**row).where(key_field == row_key).execute()
+            result.updated.append(row_key)
+        else:
+            result.unchanged += 1
+
+    if to_insert:
+        batch_size = max(1, MAX_VARIABLES // len(to_insert[0]))
+        for batch in chunked(to_insert, batch_size):
+            model.insert_many(batch).execute()
+
+    logger.debug(str(result))
+    return result
+
+
+def _delete_missing(
+    model: Type[HashedModel],
+    key_field: Field,
+    incoming: Dict[Any, Dict[str, Any]],
+    days: Tuple[date, date],
+    result: WriteResult,
+) -> None:
+    """Delete stored rows of `days` whose key is not in `incoming`."""
+    stored = model.select(key_field, model.day).where(model.day.between(*days))
+    for row_key, day in stored.tuples():
+        if row_key not in incoming:
+            result.deleted.append(row_key)
+            result.deleted_days[row_key] = (
+                day if isinstance(day, date) else date.fromisoformat(str(day)[:10])
+            )
+    for keys in chunked(result.deleted, MAX_VARIABLES):
+        model.delete().where(key_field.in_(keys)).execute()
@@ -0,0 +1,90 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from src.models import DailySleep, SleepPeriod
+from src.sync import WriteResult, write_batches
+
+pytest.importorskip("duckdb")
+
+from src.analytics.duckdb_mirror import DuckDBMirror
+
+TIMESTAMP = datetime(2024, 1, 2, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def mirror():
+    with DuckDBMirror(":memory:") as mirror:
+        yield mirror
+
+
+def add_sleep(summary_id, day, score):
+    DailySleep.create(
+        sleep_summary_id=summary_id, day=day, score=score, timestamp=TIMESTAMP
+    )
+
+
+def add_period(period_id, hypnogram):
+    SleepPeriod.create(
+        sleep_period_id=period_id,
+        sleep_summary="sleep-1",
+        start_datetime=TIMESTAMP,
+        end_datetime=TIMESTAMP,
+        hypnogram=hypnogram,
+    )
+
+
+def scores(mirror):
+    return mirror.query("SELECT sleep_summary_id, score FROM daily_sleep ORDER BY 1")
+
+
+def test_first_apply_copies_every_table(test_db, mirror):
+    """Test that missing mirror tables are created with all their rows."""
+    add_sleep("sleep-1", date(2024, 1, 1), 80)
+    add_sleep("sleep-2", date(2024, 1, 2), 70)
+
+    mirror.apply({})
+
+    assert scores(mirror) == [("sleep-1", 80), ("sleep-2", 70)]
+    assert mirror.query("SELECT count(*) FROM workouts") == [(0,)]
+
+
+def test_changed_and_deleted_keys_are_applied(test_db, mirror):
+    """Test that updates replace rows and rows gone upstream are removed."""
+    days = (date(2024, 1, 1), date(2024, 1, 3))
+
+    def sync(*rows):
+        batch = [
+            {
+                "sleep_summary_id": summary_id,
+                "day": day,
+                "score": score,
+                "timestamp": TIMESTAMP,
+            }
+            for summary_id, day, score in rows
+        ]
+        return write_batches([(DailySleep, DailySleep.sleep_summary_id, batch)], days)
+
+    sync(("sleep-1", date(2024, 1, 1), 80), ("sleep-2", date(2024, 1, 2), 70))
+    mirror.apply({})
+
+    results = sync(("sleep-1", date(2024, 1, 1), 85), ("sleep-3", date(2024, 1, 3), 60))
+    copied = mirror.apply(results)
+
+    assert results["daily_sleep"].deleted == ["sleep-2"]
+    assert copied == 2
+    assert scores(mirror) == [("sleep-1", 85), ("sleep-3", 60)]
+
+
+def test_columns_added_to_models_reach_old_mirrors(test_db, mirror):
+    """Test that a mirror table missing a model column is altered and filled."""
+    add_period("period-1", "4221")
+    mirror.apply({})
+    mirror.conn.execute('ALTER TABLE sleep_periods DROP COLUMN "hypnogram"')
+
+    add_period("period-2", "1122")
+    mirror.apply({"sleep_periods": WriteResult("sleep_periods", inserted=["period-2"])})
+
+    assert mirror.query(
+        "SELECT sleep_period_id, hypnogram FROM sleep_periods ORDER BY 1"
+    ) == [("period-1", "4221"), ("period-2", "1122")]
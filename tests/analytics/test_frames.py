@@ -0,0 +1,93 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from src.models import DailyActivity, SleepHeartRate
+from src.sync.partitions import partition_samples
+
+np = pytest.importorskip("numpy")
+
+from src.analytics.frames import iter_arrays, load_array, load_arrow, load_frame
+
+
+def add_days(count):
+    for i in range(count):
+        day = date(2024, 1, 1) + timedelta(days=i)
+        DailyActivity.create(
+            activity_summary_id=f"activity-{i}",
+            day=day,
+            timestamp=datetime(2024, 1, 1, 4, tzinfo=timezone(timedelta(hours=2)))
+            + timedelta(days=i),
+            steps=None if i == 1 else 1000 * i,
+            content_hash="",
+        )
+
+
+def test_projection_types_and_pushdown(test_db):
+    """Test column types, nulls, date ranges and filters."""
+    add_days(10)
+
+    array = load_array(
+        DailyActivity,
+        "day",
+        "timestamp",
+        "steps",
+        start=date(2024, 1, 2),
+        end=date(2024, 1, 5),
+    )
+    assert array.dtype.names == ("day", "timestamp", "steps")
+    assert array["day"][0] == np.datetime64("2024-01-02")
+    assert array["timestamp"][0] == np.datetime64("2024-01-02T02:00:00.000")
+    assert np.isnan(array["steps"][0])
+    assert len(array) == 4
+
+    chunks = list(
+        iter_arrays(
+            DailyActivity,
+            "daily_activity_id",
+            where=DailyActivity.steps > 3000,
+            chunk_rows=2,
+        )
+    )
+    assert [len(chunk) for chunk in chunks] == [2, 2, 2]
+    assert chunks[0].dtype["daily_activity_id"] == np.dtype("i8")
+    assert len(load_array(DailyActivity, where=DailyActivity.steps > 10**6)) == 0
+
+
+def test_samples_span_partitions(test_db):
+    """Test that sample loads include partitions, with filters retargeted."""
+    start = datetime(2024, 1, 31, 23, tzinfo=timezone.utc)
+    for minute in range(0, 120, 5):
+        SleepHeartRate.create(
+            sleep_period="period-1",
+            timestamp=start + timedelta(minutes=minute),
+            bpm=40 + minute,
+        )
+    partition_samples(SleepHeartRate, date(2024, 2, 1))
+
+    array = load_array(
+        SleepHeartRate, "timestamp", "bpm", where=SleepHeartRate.bpm >= 90
+    )
+    assert list(array["bpm"]) == list(range(90, 160, 5))
+    assert array["timestamp"][0] == np.datetime64("2024-01-31T23:50")
+    assert len(load_array(SleepHeartRate, "bpm", start=date(2024, 2, 1))) == 12
+
+
+def test_arrow_and_pandas(test_db):
+    """Test that Arrow and pandas loads keep nulls and UTC timestamps."""
+    pa = pytest.importorskip("pyarrow")
+    pytest.importorskip("pandas")
+    add_days(3)
+
+    table = load_arrow(DailyActivity, "day", "timestamp", "steps")
+    assert table.schema.field("day").type == pa.date32()
+    assert table.schema.field("timestamp").type == pa.timestamp("ms", tz="UTC")
+    assert table.column("steps").null_count == 1
+
+    frame = load_frame(DailyActivity, "day", "steps", "activity_summary_id")
+    assert list(frame["activity_summary_id"]) == [
+        "activity-0",
+        "activity-1",
+        "activity-2",
+    ]
+    assert frame["steps"].isna().sum() == 1
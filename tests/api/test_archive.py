@@ -0,0 +1,57 @@
+from typing import Any, Dict, List
+
+from oura_ring import OuraClient
+
+from src.api import ArchiveClient, OuraAPI, ResponseArchive
+
+
+class StubClient(OuraClient):
+    """Client that serves canned pages instead of calling the API."""
+
+    def __init__(self, pages: Dict[str, List[Dict[str, Any]]]):
+        self.pages = pages
+
+    def _make_request(self, method, url_slug, **kwargs) -> Dict[str, Any]:
+        params = kwargs.get("params") or {}
+        pages = self.pages[url_slug.rsplit("/", 1)[-1]]
+        return pages[int(params.get("next_token") or 0)]
+
+
+def activity(day: str, score: int) -> Dict[str, Any]:
+    return {"id": f"a-{day}", "day": day, "score": score}
+
+
+def test_archived_pages_replay_through_the_normalizers(tmp_path):
+    """Test that every page is archived and replays without the API."""
+    archive = ResponseArchive(tmp_path)
+    stub = StubClient(
+        {
+            "daily_activity": [
+                {"data": [activity("2024-01-01", 70)], "next_token": "1"},
+                {"data": [activity("2024-01-02", 80)], "next_token": None},
+            ]
+        }
+    )
+    live = OuraAPI(archive=archive, client=stub)
+    fetched = live.get_daily_activity("2024-01-01", "2024-01-02")
+
+    replay = OuraAPI(client=ArchiveClient(archive))
+
+    assert replay.get_daily_activity("2024-01-01", "2024-01-02") == fetched
+    assert len(list(archive.pages("daily_activity"))) == 2
+    assert [
+        a["day"] for a in replay.get_daily_activity("2024-01-02", "2024-01-02")
+    ] == ["2024-01-02"]
+
+
+def test_latest_version_of_a_record_wins(tmp_path):
+    """Test that a re-fetched record replaces the older archived copy."""
+    archive = ResponseArchive(tmp_path, segment_bytes=1)
+    slug = "v2/usercollection/daily_activity"
+    archive.append(slug, {}, {"data": [activity("2024-01-01", 70)]})
+    archive.append(slug, {}, {"data": [activity("2024-01-01", 75)]})
+
+    records = archive.records("daily_activity", "2024-01-01", "2024-01-01")
+
+    assert [r["score"] for r in records] == [75]
+    assert len(list(tmp_path.glob("daily_activity-*.json.gz"))) == 2
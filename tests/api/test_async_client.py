@@ -0,0 +1,116 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from src.api.async_client import AsyncOuraAPI
+
+
+def _stand_in_server(requests_seen):
+    """Build a transport that serves two pages of daily activity."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests_seen.append(request)
+        if request.url.path == "/v2/usercollection/daily_activity":
+            if "next_token" not in request.url.params:
+                return httpx.Response(
+                    200,
+                    json={
+                        "data": [
+                            {"id": "a1", "day": "2024-01-01", "steps": 100},
+                        ],
+                        "next_token": "page2",
+                    },
+                )
+            return httpx.Response(
+                200,
+                json={
+                    "data": [{"id": "a2", "day": "2024-01-02", "steps": 200}],
+                    "next_token": None,
+                },
+            )
+        if request.url.path == "/v2/usercollection/heartrate":
+            return httpx.Response(
+                200,
+                json={
+                    "data": [
+                        {
+                            "bpm": 50,
+                            "source": "sleep",
+                            "timestamp": "2024-01-01T01:00:00+00:00",
+                        },
+                        {
+                            "bpm": 90,
+                            "source": "awake",
+                            "timestamp": "2024-01-01T12:00:00+00:00",
+                        },
+                    ],
+                    "next_token": None,
+                },
+            )
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler)
+
+
+def test_paginated_endpoint_is_normalized():
+    """Test that all pages are fetched and normalized like OuraAPI."""
+    seen = []
+
+    async def run():
+        async with AsyncOuraAPI(
+            api_token="token", transport=_stand_in_server(seen)
+        ) as api:
+            return await api.get_daily_activity("2024-01-01", "2024-01-02")
+
+    activity = asyncio.run(run())
+
+    assert [a["activity_summary_id"] for a in activity] == ["a1", "a2"]
+    assert activity[1]["steps"] == 200
+    assert len(seen) == 2
+    assert seen[0].headers["Authorization"] == "Bearer token"
+
+
+def test_concurrent_fetches_share_one_client():
+    """Test that many concurrent calls run on one event loop."""
+    seen = []
+
+    async def run():
+        async with AsyncOuraAPI(
+            api_token="token", max_concurrency=4, transport=_stand_in_server(seen)
+        ) as api:
+            return await asyncio.gather(
+                *(
+                    api.get_sleep_heart_rate(
+                        datetime(2024, 1, 1, tzinfo=timezone.utc),
+                        datetime(2024, 1, 2, tzinfo=timezone.utc),
+                    )
+                    for _ in range(200)
+                )
+            )
+
+    results = asyncio.run(run())
+
+    assert len(results) == 200
+    assert all(len(r) == 1 and r[0]["bpm"] == 50 for r in results)
+    assert len(seen) == 200
+
+
+def test_heart_rate_window_is_sent_in_utc():
+    """Test that aware datetimes are converted to UTC like OuraAPI does."""
+    seen = []
+    pacific = timezone(timedelta(hours=-8))
+
+    async def run():
+        async with AsyncOuraAPI(
+            api_token="token", transport=_stand_in_server(seen)
+        ) as api:
+            return await api.get_sleep_heart_rate(
+                datetime(2024, 1, 1, 16, tzinfo=pacific),
+                datetime(2024, 1, 2, 16, tzinfo=pacific),
+            )
+
+    asyncio.run(run())
+
+    assert seen[0].url.params["start_datetime"] == "2024-01-02T00:00:00.000Z"
+    assert seen[0].url.params["end_datetime"] == "2024-01-03T00:00:00.000Z"
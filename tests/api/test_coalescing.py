@@ -0,0 +1,104 @@
+import threading
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from src.api import RequestCoalescer
+
+SLUG = "v2/usercollection/daily_activity"
+
+
+class CountingFetch:
+    """Paginated fetch stand-in returning one record per requested day."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+
+    def __call__(self, method, url_slug, **kwargs):
+        params = kwargs["params"]
+        self.calls.append((params["start_date"], params["end_date"]))
+        time.sleep(self.delay)
+        day = date.fromisoformat(params["start_date"])
+        records = []
+        while day <= date.fromisoformat(params["end_date"]):
+            records.append({"id": day.isoformat(), "day": day.isoformat()})
+            day += timedelta(days=1)
+        return records
+
+
+def request(coalescer, fetch, start, end):
+    params = {"start_date": start, "end_date": end}
+    return coalescer.fetch(fetch, "GET", SLUG, params=params)
+
+
+def test_concurrent_identical_requests_share_one_fetch():
+    """Test that concurrent callers for the same range make one API call."""
+    coalescer, fetch = RequestCoalescer(), CountingFetch(delay=0.1)
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                request(coalescer, fetch, "2024-01-01", "2024-01-07")
+            )
+        )
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fetch.calls == [("2024-01-01", "2024-01-07")]
+    assert len(results) == 5 and all(len(records) == 7 for records in results)
+
+
+def test_sub_range_is_answered_from_the_super_range():
+    """Test that a narrower request is filtered from a recent response."""
+    coalescer, fetch = RequestCoalescer(), CountingFetch()
+    request(coalescer, fetch, "2024-01-01", "2024-01-31")
+
+    records = request(coalescer, fetch, "2024-01-10", "2024-01-12")
+
+    assert [r["day"] for r in records] == ["2024-01-10", "2024-01-11", "2024-01-12"]
+    assert len(fetch.calls) == 1
+    assert coalescer.stats["cached"] == 1
+
+
+def test_expired_and_wider_requests_are_fetched():
+    """Test that stale responses and wider ranges go to the API."""
+    coalescer, fetch = RequestCoalescer(ttl=0.05), CountingFetch()
+    request(coalescer, fetch, "2024-01-10", "2024-01-12")
+    request(coalescer, fetch, "2024-01-01", "2024-01-31")
+    time.sleep(0.1)
+    request(coalescer, fetch, "2024-01-10", "2024-01-12")
+
+    assert len(fetch.calls) == 3
+
+
+def test_errors_reach_every_waiting_caller():
+    """Test that a failed shared request raises in all callers."""
+    coalescer = RequestCoalescer()
+
+    def failing(method, url_slug, **kwargs):
+        time.sleep(0.05)
+        raise RuntimeError("boom")
+
+    errors = []
+
+    def call():
+        try:
+            request(coalescer, failing, "2024-01-01", "2024-01-07")
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 3
+    with pytest.raises(RuntimeError):
+        request(coalescer, failing, "2024-01-01", "2024-01-07")
@@ -0,0 +1,113 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+from oura_ring import OuraClient
+
+from src.api import OuraAPI, RawPage
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.content = json.dumps(body).encode()
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class PagedSession:
+    """Session serving each endpoint's records in pages of two."""
+
+    def __init__(self, records):
+        self.records = records
+        self.requests = 0
+
+    def request(self, method, url, timeout, params=None, **kwargs):
+        self.requests += 1
+        records = self.records[url.rsplit("/", 1)[-1]]
+        start = int((params or {}).get("next_token") or 0)
+        more = start + 2 < len(records)
+        return FakeResponse(
+            {
+                "data": records[start : start + 2],
+                "next_token": str(start + 2) if more else None,
+            }
+        )
+
+
+def activity(day):
+    return {
+        "id": f"activity-{day}",
+        "day": f"2024-01-{day:02d}",
+        "score": 80 + day,
+        "steps": 1000 * day,
+        "contributors": {"meet_daily_targets": 90},
+    }
+
+
+def heart_rate(minute, source):
+    return {
+        "bpm": 50 + minute,
+        "source": source,
+        "timestamp": f"2024-01-01T00:{minute:02d}:00+00:00",
+    }
+
+
+RECORDS = {
+    "daily_activity": [activity(day) for day in range(1, 6)],
+    "heartrate": [
+        heart_rate(minute, "sleep" if minute % 3 else "awake") for minute in range(7)
+    ],
+}
+
+
+def make_api(workers):
+    client = OuraClient("token")
+    client.session = PagedSession(RECORDS)
+    return OuraAPI(client=client, coalesce_ttl=None, normalize_workers=workers)
+
+
+@pytest.fixture(scope="module")
+def pooled():
+    api = make_api(2)
+    yield api
+    api.close()
+
+
+def test_pool_matches_in_process_normalization(pooled):
+    """Test that pooled pages normalize to the same records, in order."""
+    api = make_api(0)
+    start, end = "2024-01-01", "2024-01-05"
+
+    assert pooled.get_daily_activity(start, end) == api.get_daily_activity(start, end)
+    assert pooled.page_pool.stats["pages"] == 3
+
+    window = ("2024-01-01T00:00:00", "2024-01-01T01:00:00")
+    assert pooled.get_heart_rate(*window) == api.get_heart_rate(*window)
+    assert [hr["sleep_hr_id"] for hr in pooled.get_heart_rate(*window)] == list(
+        range(7)
+    )
+
+    hour = (
+        datetime(2024, 1, 1, tzinfo=timezone.utc),
+        datetime(2024, 1, 1, 1, tzinfo=timezone.utc),
+    )
+    sleep = pooled.get_sleep_heart_rate(windows=[hour])
+    assert sleep == api.get_sleep_heart_rate(windows=[hour])
+    assert [hr["sleep_hr_id"] for hr in sleep] == [1, 2, 4, 5]
+
+    series = pooled.get_heart_rate(*window, compact=True)
+    assert list(series) == list(api.get_heart_rate(*window, compact=True))
+
+
+def test_raw_page_reads_next_token_from_tail():
+    """Test that pagination sees a page's token without decoding its records."""
+    page = RawPage(b'{"data":[{"day":"2024-01-01"}],"next_token":"a\\"b"}')
+
+    assert page["next_token"] == 'a"b'
+    assert page["data"] == [page]
+    assert page.get("day") is None
+    assert RawPage(b'{"next_token": null, "data": []}')["next_token"] is None
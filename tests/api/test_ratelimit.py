@@ -0,0 +1,68 @@
+from typing import Any, Dict
+
+import pytest
+import requests
+from oura_ring import OuraClient
+
+from src.api import OuraAPI, SharedRateLimiter
+
+
+class ThrottledClient(OuraClient):
+    """Client whose first request is answered with 429."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def _make_request(self, method, url_slug, **kwargs) -> Dict[str, Any]:
+        self.calls += 1
+        if self.calls == 1:
+            response = requests.Response()
+            response.status_code = 429
+            response.headers["Retry-After"] = "0"
+            raise requests.HTTPError(response=response)
+        return {"id": "user-1", "age": 30}
+
+
+def test_burst_then_wait(tmp_path):
+    """Test that requests beyond the burst wait for the refill."""
+    limiter = SharedRateLimiter(tmp_path / "limit.db", requests=5, seconds=0.5)
+
+    assert [limiter.acquire() for _ in range(5)] == [0.0] * 5
+    assert limiter.acquire() == pytest.approx(0.1, abs=0.05)
+    assert limiter.stats["throttled"] == 1
+
+
+def test_budget_is_shared_through_the_file(tmp_path):
+    """Test that limiters on the same file draw from one bucket."""
+    path = tmp_path / "limit.db"
+    first = SharedRateLimiter(path, requests=4, seconds=0.4, key="token")
+    second = SharedRateLimiter(path, requests=4, seconds=0.4, key="token")
+    other = SharedRateLimiter(path, requests=4, seconds=0.4, key="other")
+
+    for _ in range(2):
+        first.acquire()
+        second.acquire()
+
+    assert other.acquire() == 0.0
+    assert second.acquire() > 0
+    assert first.stats["wait_seconds"] == 0
+
+
+def test_from_env_path_overrides_the_shared_file(tmp_path, monkeypatch):
+    """Test that an explicit state file replaces OURA_RATE_LIMIT_DB."""
+    monkeypatch.setenv("OURA_RATE_LIMIT_DB", str(tmp_path / "shared.db"))
+
+    assert SharedRateLimiter.from_env("token").path == tmp_path / "shared.db"
+    limiter = SharedRateLimiter.from_env("token", tmp_path / "alice.db")
+    assert limiter.path == tmp_path / "alice.db"
+
+
+def test_429_backs_off_and_retries(tmp_path):
+    """Test that a 429 empties the bucket and the request is retried."""
+    limiter = SharedRateLimiter(tmp_path / "limit.db", requests=10, seconds=1)
+    client = ThrottledClient()
+    api = OuraAPI(client=client, coalesce_ttl=None, rate_limiter=limiter)
+
+    assert api.get_personal_info()["age"] == 30
+    assert client.calls == 2
+    assert limiter.stats["backoffs"] == 1
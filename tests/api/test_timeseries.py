@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+
+import pytest
+from oura_ring import OuraClient
+
+from src.api import OuraAPI, TimeSeries
+
+SAMPLES = [
+    {"timestamp": "2024-01-01T00:00:00+00:00", "bpm": 60, "source": "sleep"},
+    {"timestamp": "2024-01-01T00:05:00+00:00", "bpm": 58, "source": "sleep"},
+    {"timestamp": "2024-01-01T08:00:00+00:00", "bpm": None, "source": "awake"},
+    {"timestamp": "2024-01-01T08:05:00+00:00", "bpm": 75, "source": "awake"},
+]
+
+
+def test_samples_are_stored_as_columns():
+    """Test that samples round-trip and samples without a value are dropped."""
+    series = TimeSeries.from_samples(SAMPLES, "bpm")
+
+    assert len(series) == 3
+    assert series.nbytes == 3 * (8 + 2 + 1)
+    assert list(series)[1] == (
+        datetime(2024, 1, 1, 0, 5, tzinfo=timezone.utc),
+        58,
+        "sleep",
+    )
+
+
+def test_source_filter_and_time_slicing():
+    """Test filtering by source and slicing by time range."""
+    sleep = TimeSeries.from_samples(SAMPLES, "bpm", source="sleep")
+    assert list(sleep.values) == [60, 58]
+
+    series = TimeSeries.from_samples(SAMPLES, "bpm")
+    morning = series.between(
+        datetime(2024, 1, 1, 6, tzinfo=timezone.utc),
+        datetime(2024, 1, 1, 9, tzinfo=timezone.utc),
+    )
+    assert [source for _, _, source in morning] == ["awake"]
+
+
+def test_numpy_views_share_memory():
+    """Test that the NumPy views are zero-copy."""
+    np = pytest.importorskip("numpy")
+    series = TimeSeries.from_samples(SAMPLES, "bpm")
+
+    timestamps, bpm = series.numpy()
+
+    assert bpm.dtype == np.uint16
+    assert bpm.mean() == pytest.approx(193 / 3)
+    assert series.source_mask("awake").tolist() == [False, False, True]
+    series.values[0] = 61
+    assert bpm[0] == 61
+
+
+class HeartRateClient(OuraClient):
+    """Records request parameters and answers with one heart rate page."""
+
+    def _make_request(self, method, url_slug, **kwargs):
+        self.params = kwargs.get("params")
+        return {"data": [{**SAMPLES[0], "hrv": 42}], "next_token": None}
+
+
+def test_hrv_requests_the_heart_rate_datetime_range():
+    """Test that get_hrv passes the keywords the heart rate endpoint takes."""
+    client = HeartRateClient("token")
+    api = OuraAPI(client=client, coalesce_ttl=None)
+
+    series = api.get_hrv("2024-01-01T00:00:00", "2024-01-02T00:00:00", compact=True)
+
+    assert sorted(client.params) == ["end_datetime", "start_datetime"]
+    assert list(series.values) == [42]
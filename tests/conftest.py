@@ -1,25 +1,14 @@
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from peewee import SqliteDatabase
 
-from src.models.base import Base
+from src.models import MODELS
 
 
-@pytest.fixture(scope="session")
-def engine():
-    """Create a test database engine."""
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine)
-    return engine
-
-
-@pytest.fixture(scope="function")
-def db_session(engine):
-    """Create a new database session for a test."""
-    Session = sessionmaker(bind=engine)
-    session = Session()
-    try:
-        yield session
-    finally:
-        session.rollback()
-        session.close()
+@pytest.fixture
+def test_db():
+    """Bind every model to a fresh in-memory database."""
+    database = SqliteDatabase(":memory:")
+    with database.bind_ctx(MODELS):
+        database.create_tables(MODELS)
+        yield database
+    database.close()
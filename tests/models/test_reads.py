@@ -0,0 +1,102 @@
+import math
+from array import array
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from src.models import (
+    DailySleep,
+    SleepHeartRate,
+    read_columns,
+    read_rows,
+    read_sql,
+    read_tuples,
+)
+from src.sync.partitions import partition_samples
+
+START = datetime(2024, 1, 2, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def test_db(test_db):
+    """In-memory database with three nights and their heart rate."""
+    for offset, score in enumerate([80, None, 70]):
+        DailySleep.create(
+            sleep_summary_id=f"sleep-{offset}",
+            day=date(2024, 1, 1) + timedelta(days=offset),
+            score=score,
+            timestamp=START,
+        )
+    for minute in range(0, 15, 5):
+        SleepHeartRate.create(
+            sleep_period="period-1",
+            timestamp=START + timedelta(minutes=minute),
+            bpm=50 + minute,
+        )
+    return test_db
+
+
+def test_tuples_are_raw_unless_converted(test_db):
+    """Test projection, filtering and per-column conversion."""
+    rows = read_tuples(
+        DailySleep,
+        "day",
+        "score",
+        where=DailySleep.score.is_null(False),
+        order_by=[DailySleep.day.desc()],
+    )
+    assert rows == [("2024-01-03", 70), ("2024-01-01", 80)]
+
+    (row,) = read_tuples(DailySleep, "day", limit=1, convert=["day"])
+    assert row == (date(2024, 1, 1),)
+
+
+def test_rows_match_the_orm(test_db):
+    """Test that named rows carry the same values as model instances."""
+    rows = read_rows(SleepHeartRate, convert=["timestamp"])
+
+    assert rows[0]._fields == ("sleep_hr_id", "sleep_period_id", "timestamp", "bpm")
+    assert [(r.sleep_hr_id, r.sleep_period_id, r.bpm) for r in rows] == [
+        (s.sleep_hr_id, s.sleep_period_id, s.bpm) for s in SleepHeartRate.select()
+    ]
+    assert [r.timestamp for r in rows] == [
+        START + timedelta(minutes=minute) for minute in (0, 5, 10)
+    ]
+
+
+def test_columns_are_arrays(test_db):
+    """Test that numeric columns come back as typed arrays."""
+    columns = read_columns(DailySleep, "sleep_summary_id", "score")
+    heart_rate = read_columns(SleepHeartRate, "bpm")
+
+    assert columns["sleep_summary_id"] == ["sleep-0", "sleep-1", "sleep-2"]
+    assert columns["score"].typecode == "d" and math.isnan(columns["score"][1])
+    assert heart_rate["bpm"] == array("q", [50, 55, 60])
+    assert read_columns(SleepHeartRate, "bpm", limit=0)["bpm"] == array("q")
+
+
+def test_sample_reads_include_partitioned_months(test_db):
+    """Test that samples moved into a monthly partition are still read."""
+    SleepHeartRate.create(
+        sleep_period="period-2",
+        timestamp=datetime(2024, 3, 1, tzinfo=timezone.utc),
+        bpm=70,
+    )
+    partition_samples(SleepHeartRate, date(2024, 2, 1))
+
+    assert read_columns(SleepHeartRate, "bpm")["bpm"] == array("q", [50, 55, 60, 70])
+    rows = read_tuples(
+        SleepHeartRate,
+        "bpm",
+        where=SleepHeartRate.bpm > 52,
+        order_by=[SleepHeartRate.bpm.desc()],
+        limit=2,
+    )
+    assert rows == [(70,), (60,)]
+
+
+def test_sql_and_unknown_columns(test_db):
+    """Test raw SQL and the error for unknown columns."""
+    assert read_sql(DailySleep, "SELECT COUNT(*) FROM daily_sleep") == [(3,)]
+    with pytest.raises(ValueError):
+        read_tuples(DailySleep, "nope")
@@ -0,0 +1,69 @@
+from datetime import date
+
+import pytest
+
+from src.models import DailyFact, ShardCatalog, attach_shards, db, use_account
+from src.models.shards import shard_filename
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    """A shard catalog in a temporary directory; restores the shared db."""
+    live, timeout = db.database, db._timeout
+    with ShardCatalog(tmp_path) as catalog:
+        yield catalog
+    db.close()
+    db.init(live, timeout=timeout)
+
+
+def write_facts(catalog, account, steps):
+    use_account(account, catalog)
+    with db:
+        db.create_tables([DailyFact])
+        for i, value in enumerate(steps):
+            DailyFact.create(day=date(2024, 1, 1 + i), steps=value)
+
+
+def test_accounts_get_their_own_files(catalog):
+    """Test that each account writes to its own registered shard."""
+    write_facts(catalog, "alice", [1000, 3000])
+    write_facts(catalog, "bob's ring", [5000])
+
+    assert catalog.accounts() == ["alice", "bob's ring"]
+    assert catalog.path("alice").name == shard_filename("alice")
+    assert shard_filename("bob's ring").startswith("bob_s_ring-")
+    assert db.database == str(catalog.path("bob's ring"))
+    assert DailyFact.select().count() == 1
+    assert catalog.register("alice") == catalog.path("alice")
+    with pytest.raises(KeyError):
+        catalog.path("carol")
+
+
+def test_cross_account_aggregates(catalog):
+    """Test that attached shards are queried through per-table views."""
+    write_facts(catalog, "alice", [1000, 3000])
+    write_facts(catalog, "bob's ring", [5000])
+    catalog.register("carol")  # registered, never synced
+
+    with attach_shards(catalog=catalog) as conn:
+        rows = conn.execute(
+            "SELECT account, count(*), avg(steps) FROM daily_facts "
+            "GROUP BY account ORDER BY account"
+        ).fetchall()
+    assert rows == [("alice", 2, 2000.0), ("bob's ring", 1, 5000.0)]
+
+    with attach_shards(["alice"], catalog, tables=["daily_facts"]) as conn:
+        assert conn.execute("SELECT sum(steps) FROM daily_facts").fetchone() == (4000,)
+
+
+def test_stores_live_next_to_the_shard(catalog):
+    """Test that archives and mirrors are kept apart per account."""
+    alice = catalog.register("alice")
+    bob = catalog.register("bob's ring")
+
+    archive = catalog.store("alice", "/srv/oura_archive")
+    assert archive == alice.with_suffix("") / "oura_archive"
+    assert archive.parent.is_dir()
+    assert catalog.store("bob's ring", "mirror.duckdb").parent == bob.with_suffix("")
+    with pytest.raises(KeyError):
+        catalog.store("carol", "mirror.duckdb")
@@ -1,13 +1,14 @@
 from datetime import datetime
 
 import pytest
+from peewee import IntegrityError
 
 from src.models.workout import Workout
 
 
-def test_create_workout(db_session):
+def test_create_workout(test_db):
     """Test creating a workout record."""
-    workout = Workout(
+    Workout.create(
         workout_id="test123",
         activity="swimming",
         day="2023-12-01",
@@ -24,28 +25,21 @@ def test_create_workout(db_session):
         training_time=3600,
     )
 
-    db_session.add(workout)
-    db_session.commit()
-
-    saved_workout = db_session.query(Workout).filter_by(workout_id="test123").first()
+    saved_workout = Workout.get_or_none(Workout.workout_id == "test123")
     assert saved_workout is not None
     assert saved_workout.activity == "swimming"
     assert saved_workout.distance == 1500.0
 
 
-def test_workout_required_fields(db_session):
+def test_workout_required_fields(test_db):
     """Test that required fields must be provided."""
-    with pytest.raises(
-        Exception
-    ):  # SQLAlchemy will raise an error for missing required fields
-        workout = Workout(activity="swimming")  # Missing other required fields
-        db_session.add(workout)
-        db_session.commit()
+    with pytest.raises(IntegrityError):
+        Workout.create(activity="swimming")  # Missing other required fields
 
 
-def test_workout_optional_fields(db_session):
+def test_workout_optional_fields(test_db):
     """Test that optional fields can be null."""
-    workout = Workout(
+    Workout.create(
         workout_id="test456",
         activity="swimming",
         day="2023-12-01",
@@ -55,10 +49,7 @@ def test_workout_optional_fields(db_session):
         # Omitting all optional fields
     )
 
-    db_session.add(workout)
-    db_session.commit()
-
-    saved_workout = db_session.query(Workout).filter_by(workout_id="test456").first()
+    saved_workout = Workout.get_or_none(Workout.workout_id == "test456")
     assert saved_workout is not None
     assert saved_workout.calories is None
     assert saved_workout.distance is None
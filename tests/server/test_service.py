@@ -0,0 +1,173 @@
+import json
+import threading
+import urllib.request
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from peewee import SqliteDatabase
+
+from src.models import (
+    CoverageRange,
+    DailyFact,
+    SamplePartition,
+    SleepHeartRate,
+    Workout,
+)
+from src.server import QueryService, make_server
+from src.sync.partitions import partition_samples
+
+MODELS = [CoverageRange, DailyFact, SamplePartition, SleepHeartRate, Workout]
+
+
+@pytest.fixture
+def service(tmp_path):
+    """Service over a file database with a week of facts and 5 samples."""
+    database = SqliteDatabase(str(tmp_path / "oura.db"))
+    with database.bind_ctx(MODELS):
+        database.create_tables(MODELS)
+        today = date.today()
+        for offset in range(7):
+            DailyFact.create(day=today - timedelta(days=offset), steps=offset)
+        start = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        for minute in range(0, 25, 5):
+            SleepHeartRate.create(
+                sleep_period="period-1",
+                timestamp=start + timedelta(minutes=minute),
+                bpm=50 + minute,
+            )
+        CoverageRange.create(
+            endpoint="daily_sleep",
+            start_day=today,
+            end_day=today,
+            synced_at=datetime(2024, 1, 3, 12),
+        )
+        database.close()
+
+        service = QueryService(database.database)
+        yield service
+        service.close()
+    database.close()
+
+
+def test_daily_range_with_validators(service):
+    """Test that a daily range is served with ETag and Last-Modified."""
+    response = service.handle("/daily?days=3", {})
+
+    assert response.status == 200
+    assert [item["steps"] for item in json.loads(response.body)["items"]] == [2, 1, 0]
+    assert response.headers["Last-Modified"] == "Wed, 03 Jan 2024 12:00:00 GMT"
+
+    etag = response.headers["ETag"]
+    assert service.handle("/daily?days=3", {"If-None-Match": etag}).status == 304
+    since = {"If-Modified-Since": response.headers["Last-Modified"]}
+    assert service.handle("/daily?days=3", since).status == 304
+
+
+def test_common_ranges_are_prerendered(service):
+    """Test that the common daily ranges are cached once a sync is seen."""
+    service.refresh()
+    service.pool.close()
+    service.pool.path = service.path.with_name("missing.db")
+
+    # Served from the cache without opening a connection
+    assert service.handle("/daily?days=7", {}).status == 200
+
+
+def paged_bpms(service, limit):
+    """Follow `next` links through a night's heart rate pages."""
+    target = (
+        "/heart_rate?start=2024-01-02T00:00:00Z&end=2024-01-02T01:00:00Z"
+        f"&limit={limit}"
+    )
+    bpms = []
+    while target:
+        page = json.loads(service.handle(target, {}).body)
+        bpms += [item["bpm"] for item in page["items"]]
+        target = page["next"]
+    return bpms
+
+
+def test_heart_rate_pagination(service):
+    """Test that samples are paged with a `next` link."""
+    assert paged_bpms(service, limit=2) == [50, 55, 60, 65, 70]
+
+
+def test_heart_rate_pages_span_partitions(service):
+    """Test that partition and hot rows with equal ids are each paged once."""
+    database = SqliteDatabase(str(service.path))
+    with database.bind_ctx(MODELS):
+        partition_samples(SleepHeartRate, date(2024, 2, 1))
+        # Same timestamps, and the emptied hot table numbers rows from 1 again
+        start = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        for minute in range(0, 25, 5):
+            SleepHeartRate.create(
+                sleep_period="period-2",
+                timestamp=start + timedelta(minutes=minute),
+                bpm=100 + minute,
+            )
+    database.close()
+
+    bpms = paged_bpms(service, limit=3)
+
+    assert sorted(bpms) == [50, 55, 60, 65, 70, 100, 105, 110, 115, 120]
+
+
+def test_cache_is_dropped_when_the_database_changes(service):
+    """Test that a write to the database starts a new cache generation."""
+    etag = service.handle("/daily?days=1", {}).headers["ETag"]
+    database = SqliteDatabase(str(service.path))
+    with database.bind_ctx([DailyFact]):
+        DailyFact.update(steps=100).where(DailyFact.day == date.today()).execute()
+    database.close()
+
+    response = service.handle("/daily?days=1", {"If-None-Match": etag})
+
+    assert response.status == 200
+    assert json.loads(response.body)["items"][0]["steps"] == 100
+
+
+def test_render_overlapping_a_refresh_is_not_cached(service):
+    """Test that a body rendered before a new generation is not kept."""
+    service.refresh()
+    database = SqliteDatabase(str(service.path))
+    render = service._render
+
+    def render_then_write(conn, key):
+        body = render(conn, key)
+        service._render = render
+        with database.bind_ctx([DailyFact]):
+            DailyFact.update(steps=100).where(DailyFact.day == date.today()).execute()
+        service.refresh()
+        return body
+
+    service._render = render_then_write
+    service._body(service._daily_key({"days": ["1"]}))
+    database.close()
+
+    response = service.handle("/daily?days=1", {})
+
+    assert json.loads(response.body)["items"][0]["steps"] == 100
+
+
+def test_bad_requests(service):
+    """Test that invalid parameters and paths are rejected."""
+    assert service.handle("/daily", {}).status == 400
+    assert service.handle("/heart_rate?start=2024-01-02", {}).status == 400
+    window = "start=2024-01-02T00:00:00Z&end=2024-01-02T01:00:00Z"
+    assert service.handle(f"/heart_rate?{window}&after=x|1", {}).status == 400
+    assert service.handle("/nope", {}).status == 404
+
+
+def test_http_server(service):
+    """Test a request over HTTP."""
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/workouts?days=7"
+        with urllib.request.urlopen(url) as response:
+            assert response.headers["ETag"]
+            assert json.loads(response.read())["items"] == []
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,76 @@
+import statistics
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from src.models import (
+    BaselineDay,
+    BaselineState,
+    DailySleep,
+    SleepPeriod,
+)
+from src.sync.baselines import deviation, update_baselines
+
+START = date(2024, 1, 1)
+
+
+def add_night(day: date, hrv: int) -> None:
+    summary_id = f"sleep-{day}"
+    bedtime = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    DailySleep.create(sleep_summary_id=summary_id, day=day, timestamp=bedtime, score=80)
+    SleepPeriod.create(
+        sleep_period_id=f"period-{day}",
+        sleep_summary=summary_id,
+        start_datetime=bedtime - timedelta(hours=8),
+        end_datetime=bedtime,
+        total_sleep_duration=8 * 3600,
+        average_hrv=hrv,
+    )
+
+
+def stored(day: date) -> BaselineDay:
+    return BaselineDay.get(BaselineDay.metric == "hrv", BaselineDay.day == day)
+
+
+def test_incremental_baselines_match_a_window_scan(test_db):
+    """Test that days added one sync at a time give the same baselines."""
+    hrv = [40 + (i * 7) % 13 for i in range(20)]
+    for i, value in enumerate(hrv[:10]):
+        add_night(START + timedelta(days=i), value)
+    update_baselines(metrics=["hrv"])
+    for i, value in enumerate(hrv[10:], start=10):
+        add_night(START + timedelta(days=i), value)
+    update_baselines(metrics=["hrv"])
+
+    row = stored(START + timedelta(days=15))
+    prior = hrv[8:15]  # The 7 days before day 15
+    assert row.mean_7 == pytest.approx(statistics.mean(prior))
+    assert row.std_7 == pytest.approx(statistics.stdev(prior))
+    assert deviation("hrv", START + timedelta(days=15), 7) == pytest.approx(
+        (hrv[15] - statistics.mean(prior)) / statistics.stdev(prior)
+    )
+
+
+def test_late_day_recomputes_only_from_that_day(test_db):
+    """Test that a late-arriving day gives the same result as a full rebuild."""
+    for i in range(30):
+        if i != 12:
+            add_night(START + timedelta(days=i), 50 + i % 5)
+    update_baselines(metrics=["hrv"])
+
+    add_night(START + timedelta(days=12), 90)
+    assert update_baselines(START + timedelta(days=12), ["hrv"]) == 18
+    incremental = [
+        (row.day, row.mean_30, row.std_14, row.ewma_60)
+        for row in BaselineDay.select().order_by(BaselineDay.day)
+    ]
+
+    BaselineDay.delete().execute()
+    BaselineState.delete().execute()
+    update_baselines(metrics=["hrv"])
+    rebuilt = [
+        (row.day, row.mean_30, row.std_14, row.ewma_60)
+        for row in BaselineDay.select().order_by(BaselineDay.day)
+    ]
+
+    assert incremental == pytest.approx(rebuilt)
@@ -0,0 +1,77 @@
+from datetime import date, datetime, timezone
+
+from src.models import DailySleep
+from src.sync import ChangeFeed, WriteResult, change_events, write_batches
+
+
+def add_sleep(summary_id, day):
+    DailySleep.create(
+        sleep_summary_id=summary_id,
+        day=day,
+        timestamp=datetime(2024, 3, 1, tzinfo=timezone.utc),
+        content_hash="",
+    )
+
+
+def test_events_carry_operation_and_day(test_db):
+    """Test that each changed row becomes one event with its day."""
+    add_sleep("s1", date(2024, 3, 1))
+    add_sleep("s2", date(2024, 3, 2))
+    results = {
+        "daily_sleep": WriteResult("daily_sleep", inserted=["s1"], updated=["s2"]),
+        "personal_info": WriteResult("personal_info", updated=["user-1"]),
+    }
+
+    events = change_events(results, account="alice")
+
+    assert [(e["table"], e["key"], e["op"], e["day"]) for e in events] == [
+        ("daily_sleep", "s1", "insert", "2024-03-01"),
+        ("daily_sleep", "s2", "update", "2024-03-02"),
+        ("personal_info", "user-1", "update", None),
+    ]
+    assert {e["account"] for e in events} == {"alice"}
+
+
+def test_rows_gone_upstream_are_published_as_deletes(test_db, tmp_path):
+    """Test that a resync missing a row publishes its delete with its day."""
+    days = (date(2024, 3, 1), date(2024, 3, 2))
+
+    def sync(*summary_ids):
+        rows = [
+            {
+                "sleep_summary_id": summary_id,
+                "day": date(2024, 3, int(summary_id[1:])),
+                "timestamp": datetime(2024, 3, 1, tzinfo=timezone.utc),
+            }
+            for summary_id in summary_ids
+        ]
+        return write_batches([(DailySleep, DailySleep.sleep_summary_id, rows)], days)
+
+    sync("s1", "s2")
+    with ChangeFeed(tmp_path) as feed:
+        feed.publish(sync("s1"))
+        events, _ = feed.read("alerts")
+
+    assert [(e["key"], e["op"], e["day"]) for e in events] == [
+        ("s2", "delete", "2024-03-02")
+    ]
+
+
+def test_consumers_resume_from_committed_offsets(tmp_path):
+    """Test that each consumer reads only what it has not committed."""
+    feed = ChangeFeed(tmp_path)
+    feed.append([{"key": 1}, {"key": 2}, {"key": 3}])
+
+    events, offset = feed.read("alerts", limit=2)
+    assert [e["key"] for e in events] == [1, 2]
+    feed.commit("alerts", offset)
+
+    feed.append([{"key": 4}])
+    # Unfinished lines from a concurrent writer are left for the next read
+    with open(feed.path, "ab") as f:
+        f.write(b'{"key":')
+
+    assert [e["key"] for e in feed.read("alerts")[0]] == [3, 4]
+    assert [e["key"] for e in feed.read("warehouse")[0]] == [1, 2, 3, 4]
+    assert ChangeFeed(tmp_path).offset("alerts") == offset
+    feed.close()
@@ -0,0 +1,132 @@
+import io
+import json
+import zipfile
+from datetime import date
+
+from src.models import (
+    CoverageRange,
+    DailyActivity,
+    DailySleep,
+    SleepHeartRate,
+    SleepHRV,
+    SleepPeriod,
+    SleepStageStats,
+    Workout,
+)
+from src.sync import export, import_export
+from src.sync.export import export_endpoint, iter_json_records
+
+SLEEP = [
+    {
+        "id": f"sleep-{day}",
+        "day": f"2024-01-0{day}",
+        "score": 80 + day,
+        "timestamp": f"2024-01-0{day}T00:00:00+00:00",
+        "contributors": {"deep_sleep": 70},
+    }
+    for day in (1, 2, 3)
+]
+
+PERIOD = {
+    "id": "period-2",
+    "day": "2024-01-02",
+    "type": "long_sleep",
+    "bedtime_start": "2024-01-01T23:00:00+00:00",
+    "bedtime_end": "2024-01-02T07:00:00+00:00",
+    "heart_rate": {
+        "interval": 300,
+        "items": [52, None, 48],
+        "timestamp": "2024-01-01T23:00:00.000+00:00",
+    },
+    "hrv": {
+        "interval": 300,
+        "items": [40, 44],
+        "timestamp": "2024-01-01T23:00:00.000+00:00",
+    },
+    "sleep_phase_5_min": "4221",
+}
+
+WORKOUT = {
+    "id": "workout-1",
+    "activity": "running",
+    "calories": 300,
+    "day": "2024-01-02",
+    "distance": 5000.0,
+    "start_datetime": "2024-01-02T18:00:00+00:00",
+    "end_datetime": "2024-01-02T18:30:00+00:00",
+    "intensity": "moderate",
+    "source": "manual",
+    "heart_rate": {"average": 140, "max": 170},
+}
+
+ACTIVITY_CSV = (
+    "id,day,score,timestamp,steps,contributors\n"
+    'activity-1,2024-01-01,75,2024-01-01T04:00:00+00:00,8000,"{""stay_active"": 90}"\n'
+    "activity-2,2024-01-02,,2024-01-02T04:00:00+00:00,12000,\n"
+)
+
+
+def write_export(path):
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("oura_export/dailysleep.json", json.dumps(SLEEP, indent=2))
+        archive.writestr("oura_export/sleep.jsonl", json.dumps(PERIOD) + "\n")
+        archive.writestr("oura_export/dailyactivity.csv", ACTIVITY_CSV)
+        archive.writestr("oura_export/workouts.json", json.dumps({"data": [WORKOUT]}))
+        archive.writestr("oura_export/README.txt", "not data")
+    return path
+
+
+def test_json_records_stream_from_small_chunks(monkeypatch):
+    """Test arrays, pages and lines decoded across buffer refills."""
+    monkeypatch.setattr(export, "CHUNK_CHARS", 8)
+
+    records = list(iter_json_records(io.StringIO(json.dumps(SLEEP, indent=2))))
+    assert records == SLEEP
+    lines = "\n".join(json.dumps(record) for record in SLEEP)
+    assert list(iter_json_records(io.StringIO(lines))) == SLEEP
+    page = json.dumps({"data": SLEEP, "next_token": None})
+    assert list(iter_json_records(io.StringIO(page))) == SLEEP
+    assert list(iter_json_records(io.StringIO("  [ ]  "))) == []
+
+
+def test_member_names():
+    """Test that export files are matched on their name only."""
+    assert export_endpoint("export/Daily_Sleep.csv") == "daily_sleep"
+    assert export_endpoint("sleep.json") == "sleep_periods"
+    assert export_endpoint("workouts.jsonl") == "workouts"
+    assert export_endpoint("dailysleep.pdf") is None
+    assert export_endpoint("heartrate.json") is None
+
+
+def test_import_writes_models_and_coverage(test_db, tmp_path):
+    """Test a full import, in batches, and that re-importing changes nothing."""
+    path = write_export(tmp_path / "export.zip")
+
+    imported = import_export(path, batch_records=2)
+
+    assert [r.steps for r in DailyActivity.select().order_by(DailyActivity.day)] == [
+        8000,
+        12000,
+    ]
+    assert DailyActivity.get(DailyActivity.steps == 12000).score is None
+    assert DailySleep.select().count() == 3
+    period = SleepPeriod.get()
+    assert period.sleep_summary_id == "sleep-2"
+    assert [s.bpm for s in SleepHeartRate.select()] == [52, 48]
+    assert SleepHRV.select().count() == 2
+    assert SleepStageStats.get().sleep_period_id == "period-2"
+    workout = Workout.get()
+    assert (workout.activity, workout.max_heart_rate) == ("running", 170)
+
+    assert imported.results["daily_sleep"].inserted == [s["id"] for s in SLEEP]
+    assert imported.days["daily_sleep"] == (date(2024, 1, 1), date(2024, 1, 3))
+    assert imported.last_day == date(2024, 1, 3)
+    assert set(CoverageRange.select(CoverageRange.endpoint).scalars()) == {
+        "daily_activity",
+        "daily_sleep",
+        "sleep_periods",
+        "workouts",
+    }
+
+    again = import_export(path)
+    assert all(not result.changed for result in again.results.values())
@@ -0,0 +1,81 @@
+from datetime import date, datetime, timezone
+
+from src.models import (
+    DailyActivity,
+    DailyFact,
+    DailyReadiness,
+    DailySleep,
+    DailySpO2,
+    Workout,
+)
+from src.sync.facts import rebuild_daily_facts, refresh_facts
+from src.sync.writer import WriteResult
+
+TIMESTAMP = datetime(2024, 1, 2, tzinfo=timezone.utc)
+
+
+def add_workout(workout_id: str, day: str, minutes: int) -> None:
+    Workout.create(
+        workout_id=workout_id,
+        activity="running",
+        calories=100,
+        day=day,
+        start_datetime=datetime(2024, 1, 2, 10, tzinfo=timezone.utc),
+        end_datetime=datetime(2024, 1, 2, 10, minutes, tzinfo=timezone.utc),
+        source="manual",
+    )
+
+
+def test_fact_row_combines_every_daily_model(test_db):
+    """Test that Date and text `day` columns land on the same fact row."""
+    DailySleep.create(
+        sleep_summary_id="s1", day=date(2024, 1, 2), score=81, timestamp=TIMESTAMP
+    )
+    DailyActivity.create(
+        activity_summary_id="a1",
+        day=date(2024, 1, 2),
+        score=72,
+        steps=9000,
+        timestamp=TIMESTAMP,
+    )
+    DailyReadiness.create(
+        readiness_summary_id="r1", day=date(2024, 1, 2), score=65, timestamp=TIMESTAMP
+    )
+    DailySpO2.create(
+        daily_spo2_id="o1", day="2024-01-02", average=97.5, timestamp=TIMESTAMP
+    )
+    add_workout("w1", "2024-01-02", 30)
+    add_workout("w2", "2024-01-02", 15)
+
+    assert rebuild_daily_facts() == 1
+
+    fact = DailyFact.get(DailyFact.day == date(2024, 1, 2))
+    assert (fact.sleep_score, fact.activity_score, fact.readiness_score) == (81, 72, 65)
+    assert fact.steps == 9000
+    assert fact.spo2_average == 97.5
+    assert (fact.workout_count, fact.workout_duration) == (2, 45 * 60)
+
+
+def test_only_changed_days_are_refreshed(test_db):
+    """Test that a sync result refreshes just the days it touched."""
+    add_workout("w1", "2024-01-02", 30)
+    add_workout("w2", "2024-01-03", 30)
+
+    written = refresh_facts({"workouts": WriteResult("workouts", inserted=["w2"])})
+
+    assert written == 1
+    assert [fact.day for fact in DailyFact.select()] == [date(2024, 1, 3)]
+
+
+def test_days_of_deleted_rows_are_refreshed(test_db):
+    """Test that a day whose last source row was deleted loses its fact."""
+    add_workout("w1", "2024-01-02", 30)
+    rebuild_daily_facts()
+    Workout.delete().execute()
+
+    deleted = WriteResult(
+        "workouts", deleted=["w1"], deleted_days={"w1": date(2024, 1, 2)}
+    )
+    refresh_facts({"workouts": deleted})
+
+    assert DailyFact.select().count() == 0
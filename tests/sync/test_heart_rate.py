@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+
+from src.models import SleepHeartRate, SleepPeriod
+from src.sync.heart_rate import sync_sleep_heart_rate
+
+
+def utc(day, hour, minute=0):
+    return datetime(2024, 1, day, hour, minute, tzinfo=timezone.utc)
+
+
+class StubAPI:
+    """Serves heart rate samples and records the windows asked for."""
+
+    def __init__(self, samples):
+        self.samples = samples
+        self.windows = []
+
+    def get_sleep_heart_rate(self, windows):
+        self.windows.append(windows)
+        return [
+            sample
+            for sample in self.samples
+            if any(start <= sample["timestamp"] <= end for start, end in windows)
+        ]
+
+
+def add_period(period_id, start, end):
+    SleepPeriod.create(
+        sleep_period_id=period_id,
+        sleep_summary=period_id,
+        start_datetime=start,
+        end_datetime=end,
+        bedtime_start=start,
+        bedtime_end=end,
+    )
+
+
+def sample(timestamp, bpm):
+    return {"timestamp": timestamp, "bpm": bpm, "source": "sleep"}
+
+
+def test_overlapping_periods_share_one_window(test_db):
+    """Test that merged windows are fetched once and samples are linked."""
+    add_period("night-1", utc(1, 22), utc(2, 6))
+    add_period("nap-1", utc(2, 5, 30), utc(2, 7))  # Overlaps the night
+    add_period("night-2", utc(2, 22), utc(3, 6))
+    api = StubAPI(
+        [
+            sample(utc(1, 23), 50),
+            sample(utc(2, 6, 30), 55),
+            sample(utc(2, 12), 90),  # Awake, outside every window
+            sample(utc(3, 1), 48),
+        ]
+    )
+
+    stored = sync_sleep_heart_rate(api, utc(1, 0), utc(4, 0))
+
+    assert api.windows == [[(utc(1, 22), utc(2, 7)), (utc(2, 22), utc(3, 6))]]
+    assert stored == 3
+    rows = SleepHeartRate.select().order_by(SleepHeartRate.timestamp)
+    assert [(r.sleep_period_id, r.bpm) for r in rows] == [
+        ("night-1", 50),
+        ("nap-1", 55),
+        ("night-2", 48),
+    ]
+
+
+def test_resync_replaces_a_nights_samples(test_db):
+    """Test that re-syncing a night replaces its samples instead of adding."""
+    add_period("night-1", utc(1, 22), utc(2, 6))
+    add_period("night-2", utc(2, 22), utc(3, 6))
+    SleepHeartRate.create(sleep_period="night-1", timestamp=utc(1, 23), bpm=70)
+    SleepHeartRate.create(sleep_period="night-2", timestamp=utc(2, 23), bpm=60)
+
+    api = StubAPI([sample(utc(1, 23) + timedelta(minutes=m), 50) for m in (0, 5)])
+    sync_sleep_heart_rate(api, utc(1, 0), utc(2, 12))
+
+    assert api.windows == [[(utc(1, 22), utc(2, 6))]]
+    rows = SleepHeartRate.select().order_by(SleepHeartRate.timestamp)
+    assert [(r.sleep_period_id, r.bpm) for r in rows] == [
+        ("night-1", 50),
+        ("night-1", 50),
+        ("night-2", 60),  # Outside the range, untouched
+    ]
@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta, timezone
+
+from src.sync.intervals import IntervalIndex, merge_intervals
+
+
+def _at(hour, minute=0):
+    return datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(
+        hours=hour, minutes=minute
+    )
+
+
+def test_merge_intervals_joins_overlapping_and_adjacent():
+    """Test that touching windows collapse into one request window."""
+    merged = merge_intervals(
+        [(_at(5), _at(7)), (_at(0), _at(3)), (_at(3), _at(4)), (_at(2), _at(3))]
+    )
+
+    assert merged == [(_at(0), _at(4)), (_at(5), _at(7))]
+
+
+def test_lookup_returns_containing_interval():
+    """Test that samples map to the interval that contains them."""
+    index = IntervalIndex([(_at(0), _at(6), "night"), (_at(10), _at(11), "run")])
+
+    assert index.assign([_at(1), _at(6), _at(8), _at(10, 30), _at(12)]) == [
+        "night",
+        "night",
+        None,
+        "run",
+        None,
+    ]
+
+
+def test_overlapping_intervals_prefer_latest_start():
+    """Test that a nested interval wins inside its span only."""
+    index = IntervalIndex([(_at(0), _at(8), "sleep"), (_at(2), _at(3), "nap")])
+
+    assert index.lookup(_at(1)) == "sleep"
+    assert index.lookup(_at(2, 30)) == "nap"
+    assert index.lookup(_at(4)) == "sleep"
+    assert index.lookup(_at(8)) == "sleep"
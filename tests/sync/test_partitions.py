@@ -0,0 +1,82 @@
+from datetime import date, datetime, timedelta, timezone
+
+from src.models import SamplePartition, SleepHeartRate
+from src.sync.partitions import (
+    RetentionPolicy,
+    apply_retention,
+    delete_samples,
+    sample_tables,
+    select_samples,
+)
+
+TODAY = date(2024, 4, 15)
+
+
+def add_night(period_id, start, count=12, bpm=50):
+    """Store `count` 5-minute samples from `start`."""
+    for i in range(count):
+        SleepHeartRate.create(
+            sleep_period=period_id,
+            timestamp=start + timedelta(minutes=5 * i),
+            bpm=bpm + i,
+        )
+
+
+def bpms(**kwargs):
+    query = select_samples(SleepHeartRate, "bpm", **kwargs).order_by(SleepHeartRate.bpm)
+    return [bpm for (bpm,) in query.tuples()]
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_old_months_move_to_partitions_and_queries_are_routed(test_db):
+    """Test that old samples leave the hot table but stay queryable."""
+    add_night("january", utc(2024, 1, 10), bpm=40)
+    add_night("april", utc(2024, 4, 10), bpm=60)
+
+    stats = apply_retention(RetentionPolicy(hot_months=2), [SleepHeartRate], TODAY)
+
+    assert stats["moved"] == 12
+    assert SleepHeartRate.select().count() == 12
+    assert sample_tables(SleepHeartRate) == [
+        "sleep_heart_rates_2024_01",
+        "sleep_heart_rates",
+    ]
+    assert sample_tables(SleepHeartRate, utc(2024, 4, 1), utc(2024, 5, 1)) == [
+        "sleep_heart_rates"
+    ]
+    assert bpms(start=utc(2024, 1, 1), end=utc(2024, 2, 1)) == list(range(40, 52))
+    assert len(bpms()) == 24
+
+    # Re-syncing an old night deletes its partitioned samples too
+    delete_samples(SleepHeartRate, "sleep_period_id", ["january"])
+    assert len(bpms()) == 12
+
+
+def test_old_partitions_are_downsampled_then_dropped(test_db):
+    """Test that retention averages old partitions and drops expired ones."""
+    add_night("june", utc(2023, 6, 10), bpm=40)
+    add_night("december", utc(2023, 12, 10), bpm=40)
+
+    stats = apply_retention(
+        RetentionPolicy(hot_months=2, raw_months=6, keep_months=9),
+        [SleepHeartRate],
+        TODAY,
+    )
+
+    assert stats == {"moved": 24, "downsampled": 0, "dropped": 1}
+    partition = SamplePartition.get()
+    assert partition.month == "2023-12"
+
+    stats = apply_retention(
+        RetentionPolicy(hot_months=2, raw_months=3, resolution_minutes=30),
+        [SleepHeartRate],
+        TODAY,
+    )
+
+    assert stats["downsampled"] == 1
+    # 12 samples over an hour become two half-hour averages
+    assert bpms() == [round(sum(range(40, 46)) / 6), round(sum(range(46, 52)) / 6)]
+    assert SamplePartition.get().resolution_seconds == 1800
@@ -0,0 +1,192 @@
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from src.models import MODELS, CoverageRange, DailyActivity, db
+from src.sync import pipeline
+from src.sync.pipeline import SyncPipeline
+
+
+@pytest.fixture
+def file_db(tmp_path):
+    """Point the shared database at a file the writer thread can open."""
+    live, timeout = db.database, db._timeout
+    db.close()
+    db.init(str(tmp_path / "oura.db"), timeout=timeout)
+    db.create_tables(MODELS)
+    db.close()
+    yield tmp_path / "oura.db"
+    db.close()
+    db.init(live, timeout=timeout)
+
+
+def committed_rows(path):
+    """Activity rows visible to another connection, i.e. committed."""
+    with sqlite3.connect(str(path)) as conn:
+        table = DailyActivity._meta.table_name
+        return conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+
+
+def activity_batches(start_date):
+    return [
+        (
+            DailyActivity,
+            DailyActivity.activity_summary_id,
+            [
+                {
+                    "activity_summary_id": f"activity-{start_date}",
+                    "day": start_date,
+                    "timestamp": datetime(2024, 1, 1, tzinfo=timezone.utc),
+                }
+            ],
+        )
+    ]
+
+
+def use_fetcher(monkeypatch, fetch):
+    monkeypatch.setattr(pipeline, "FETCHERS", {"daily_activity": fetch})
+
+
+def run_with_timeout(sync, jobs, seconds=10):
+    """Run a pipeline in a thread, failing the test if it hangs."""
+    outcome = {}
+
+    def target():
+        try:
+            outcome["results"] = sync.run(jobs)
+        except Exception as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join(seconds)
+    assert not thread.is_alive(), "pipeline.run() hung"
+    return outcome
+
+
+def test_full_queue_blocks_fetch_workers(file_db, monkeypatch):
+    """Test that fetches stop at the queue bound while the writer is busy."""
+    fetched = []
+    use_fetcher(monkeypatch, lambda api, start, end: fetched.append(start) or [])
+    sync = SyncPipeline(api=None, workers=2, queue_size=1, chunk_days=1)
+    release = threading.Event()
+    write_job = sync._write_job
+
+    def slow_write_job(job, batches):
+        release.wait(10)
+        return write_job(job, batches)
+
+    sync._write_job = slow_write_job
+    jobs = sync.jobs(["daily_activity"], "2024-01-01", "2024-01-08")
+
+    runner = threading.Thread(target=sync.run, args=(jobs,))
+    runner.start()
+    time.sleep(0.5)
+    # One job in the writer, one queued and one blocked in each worker
+    assert len(fetched) == 4
+    assert sync._queue.full()
+
+    release.set()
+    runner.join(10)
+    assert not runner.is_alive()
+    assert len(fetched) == 8
+    assert CoverageRange.select().count() == 8
+
+
+def test_commits_every_n_rows(file_db, monkeypatch):
+    """Test that the writer commits once `commit_rows` rows are pending."""
+    use_fetcher(monkeypatch, lambda api, start, end: activity_batches(start))
+    sync = SyncPipeline(api=None, workers=1, commit_rows=2, chunk_days=1)
+    visible = {}
+    write_job = sync._write_job
+
+    def observed_write_job(job, batches):
+        visible[job[1]] = committed_rows(file_db)
+        return write_job(job, batches)
+
+    sync._write_job = observed_write_job
+    outcome = run_with_timeout(
+        sync, sync.jobs(["daily_activity"], "2024-01-01", "2024-01-05")
+    )
+
+    assert len(outcome["results"]["daily_activities"].inserted) == 5
+    assert [visible[f"2024-01-0{day}"] for day in range(1, 6)] == [0, 0, 2, 2, 4]
+    assert committed_rows(file_db) == 5
+
+
+def test_idle_writer_commits_pending_rows(file_db, monkeypatch):
+    """Test that pending rows are committed once the queue stays empty."""
+    seen = []
+
+    def slow_fetch(api, start, end):
+        deadline = time.monotonic() + 5
+        while committed_rows(file_db) < 1 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        seen.append(committed_rows(file_db))
+        return []
+
+    monkeypatch.setattr(
+        pipeline,
+        "FETCHERS",
+        {
+            "daily_activity": lambda api, start, end: activity_batches(start),
+            "daily_sleep": slow_fetch,
+        },
+    )
+    sync = SyncPipeline(api=None, workers=1, commit_rows=1000, chunk_days=1)
+
+    run_with_timeout(
+        sync,
+        [
+            ("daily_activity", "2024-02-01", "2024-02-01"),
+            ("daily_sleep", "2024-02-01", "2024-02-01"),
+        ],
+    )
+
+    # Committed while the second fetch was still running
+    assert seen == [1]
+
+
+def test_fetch_error_rolls_back_and_propagates(file_db, monkeypatch):
+    """Test that a failed fetch discards uncommitted rows and is raised."""
+
+    def fetch(api, start, end):
+        if start == "2024-01-03":
+            time.sleep(0.2)  # Let the earlier jobs reach the writer first
+            raise RuntimeError("API down")
+        return activity_batches(start)
+
+    use_fetcher(monkeypatch, fetch)
+    sync = SyncPipeline(api=None, workers=1, commit_rows=1000, chunk_days=1)
+
+    outcome = run_with_timeout(
+        sync, sync.jobs(["daily_activity"], "2024-01-01", "2024-01-05")
+    )
+
+    assert str(outcome["error"]) == "API down"
+    assert committed_rows(file_db) == 0
+
+
+def test_write_error_rolls_back_and_propagates(file_db, monkeypatch):
+    """Test that a failed write is raised without blocking the workers."""
+
+    def fetch(api, start, end):
+        batches = activity_batches(start)
+        if start == "2024-01-02":
+            del batches[0][2][0]["timestamp"]  # NOT NULL column
+        return batches
+
+    use_fetcher(monkeypatch, fetch)
+    sync = SyncPipeline(
+        api=None, workers=2, queue_size=1, commit_rows=1000, chunk_days=1
+    )
+
+    outcome = run_with_timeout(
+        sync, sync.jobs(["daily_activity"], "2024-01-01", "2024-01-20")
+    )
+
+    assert "NOT NULL" in str(outcome["error"])
+    assert committed_rows(file_db) == 0
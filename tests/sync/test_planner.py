@@ -0,0 +1,49 @@
+from datetime import date, datetime
+
+from src.sync.coverage import record_coverage
+from src.sync.planner import plan_backfill
+
+
+def test_plan_covers_exactly_the_missing_days(test_db):
+    """Test that a hole between synced ranges becomes one request."""
+    synced_at = datetime(2024, 3, 1)
+    record_coverage("daily_activity", date(2024, 1, 1), date(2024, 1, 10), synced_at)
+    record_coverage("daily_activity", date(2024, 1, 15), date(2024, 1, 31), synced_at)
+
+    plan = plan_backfill(date(2024, 1, 1), date(2024, 1, 31), ["daily_activity"])
+
+    assert [(r.start_day, r.end_day) for r in plan.requests] == [
+        (date(2024, 1, 11), date(2024, 1, 14))
+    ]
+    assert plan.requests[0].missing_days == 4
+
+
+def test_days_synced_before_settling_are_stale(test_db):
+    """Test that days synced too soon after they ended are re-planned."""
+    record_coverage(
+        "daily_sleep", date(2024, 1, 1), date(2024, 1, 10), datetime(2024, 1, 10, 8)
+    )
+
+    plan = plan_backfill(
+        date(2024, 1, 1), date(2024, 1, 10), ["daily_sleep"], settle_days=2
+    )
+
+    assert [(r.start_day, r.end_day) for r in plan.requests] == [
+        (date(2024, 1, 9), date(2024, 1, 10))
+    ]
+    assert plan.requests[0].stale_days == 2
+
+
+def test_sleep_period_requests_are_capped(test_db):
+    """Test that sleep period ranges are split and sized by their samples."""
+    plan = plan_backfill(date(2024, 1, 1), date(2024, 3, 10))
+
+    sleep_periods = [r for r in plan.requests if r.endpoint == "sleep_periods"]
+    assert [r.days for r in sleep_periods] == [30, 30, 10]
+    assert sleep_periods[0].estimated_records == 30 * 200
+    assert {r.endpoint for r in plan.requests} == {
+        "daily_activity",
+        "daily_sleep",
+        "sleep_periods",
+        "daily_readiness",
+    }
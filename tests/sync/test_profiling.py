@@ -0,0 +1,53 @@
+import json
+import time
+from contextlib import nullcontext
+
+from oura_ring import OuraClient
+
+from src.api import OuraAPI, SharedRateLimiter
+from src.sync.profiling import StageTimer, profile_run, stage
+
+
+def test_nested_stages_are_excluded_from_their_parent():
+    """Test that time in a nested stage is only counted once."""
+    timer = StageTimer()
+
+    with timer.stage("daily_sleep", "normalize"):
+        with timer.stage("daily_sleep", "fetch"):
+            time.sleep(0.05)
+
+    report = timer.report()["daily_sleep"]
+    assert report["fetch"]["seconds"] >= 0.05
+    assert report["normalize"]["seconds"] < 0.05
+    assert report["normalize"]["calls"] == 1
+
+
+class StubClient(OuraClient):
+    """Answers every request with one page of daily sleep."""
+
+    def _make_request(self, method, url_slug, **kwargs):
+        return {"data": [{"id": "s1", "day": "2024-01-01"}], "next_token": None}
+
+
+def test_report_counts_requests_and_waits(tmp_path):
+    """Test the JSON report, and that the client is restored afterwards."""
+    limiter = SharedRateLimiter(tmp_path / "limit.db", requests=1, seconds=0.1)
+    api = OuraAPI(client=StubClient("token"), coalesce_ttl=None, rate_limiter=limiter)
+    make_request = api.client._make_request
+
+    with profile_run(tmp_path / "sync.json", api):
+        with stage("daily_sleep", "normalize"):
+            api.get_daily_sleep("2024-01-01", "2024-01-01")
+            api.get_daily_sleep("2024-01-02", "2024-01-02")
+
+    report = json.loads((tmp_path / "sync.json").read_text())
+    assert report["stages"]["daily_sleep"]["fetch"]["calls"] == 2
+    assert report["stages"]["daily_sleep"]["normalize"]["calls"] == 1
+    assert report["rate_limit"]["acquired"] == 2
+    assert report["rate_limit"]["throttled"] == 1
+    assert report["rate_limit"]["wait_seconds"] > 0
+    assert report["memory"]["peak_bytes"] > 0
+    assert (tmp_path / "sync.prof").exists()
+
+    assert api.client._make_request is make_request
+    assert isinstance(stage("daily_sleep", "fetch"), nullcontext)
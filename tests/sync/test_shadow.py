@@ -0,0 +1,95 @@
+import sqlite3
+
+import pytest
+from peewee import CharField, Model, SqliteDatabase
+
+from src.sync.shadow import shadow_database
+
+
+class Note(Model):
+    text = CharField()
+
+
+@pytest.fixture
+def live_db(tmp_path):
+    """File-backed database with one committed row."""
+    database = SqliteDatabase(str(tmp_path / "live.db"))
+    with database.bind_ctx([Note]):
+        database.create_tables([Note])
+        Note.create(text="old")
+        database.close()
+        yield database
+    database.close()
+
+
+def count(path):
+    reader = sqlite3.connect(str(path), timeout=0)
+    try:
+        return reader.execute("SELECT COUNT(*) FROM note").fetchone()[0]
+    finally:
+        reader.close()
+
+
+def test_readers_see_the_old_data_until_the_swap(live_db):
+    """Test that writes go to the shadow and are published atomically."""
+    live = live_db.database
+    with shadow_database(live_db) as shadow:
+        with live_db.atomic():
+            Note.create(text="new")
+            # A reader of the live file neither waits nor sees the sync
+            assert count(live) == 1
+        assert count(shadow) == 2
+
+    assert not shadow.exists()
+    assert live_db.database == live
+    assert count(live) == 2
+
+
+def test_failed_sync_leaves_the_live_database_untouched(live_db):
+    """Test that an error discards the shadow copy."""
+    live = live_db.database
+    with pytest.raises(RuntimeError):
+        with shadow_database(live_db) as shadow:
+            Note.create(text="new")
+            raise RuntimeError("sync failed")
+
+    assert not shadow.exists()
+    assert live_db.database == live
+    assert Note.select().count() == 1
+
+
+def test_live_database_is_write_locked_until_the_swap(live_db):
+    """Test that other writers wait rather than commit a write the swap loses."""
+    live = live_db.database
+    with shadow_database(live_db):
+        writer = sqlite3.connect(live, timeout=0)
+        try:
+            with pytest.raises(sqlite3.OperationalError, match="locked"):
+                writer.execute("INSERT INTO note (text) VALUES ('lost')")
+                writer.commit()
+        finally:
+            writer.close()
+        assert count(live) == 1
+
+    assert count(live) == 1
+
+
+def test_shadow_keeps_the_database_settings(tmp_path):
+    """Test that pragmas and connect parameters survive the shadow sync."""
+    database = SqliteDatabase(
+        str(tmp_path / "live.db"),
+        pragmas={"cache_size": -4000},
+        timeout=7,
+        check_same_thread=False,
+    )
+    database.connect()
+    database.close()
+
+    with shadow_database(database):
+        assert database.execute_sql("PRAGMA cache_size").fetchone() == (-4000,)
+        assert database.connect_params == {"check_same_thread": False}
+    database.close()
+
+    assert database._timeout == 7
+    assert database.execute_sql("PRAGMA cache_size").fetchone() == (-4000,)
+    database.close()
@@ -0,0 +1,59 @@
+import random
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from src.models import (
+    DailyFact,
+    MetricSketch,
+    SleepHeartRate,
+)
+from src.sync.sketches import TDigest, percentile, rebuild_sketches
+
+
+def exact(values, q):
+    ordered = sorted(values)
+    return ordered[round(q * (len(ordered) - 1))]
+
+
+def test_digest_quantiles_merge_and_serialize():
+    """Test estimates against exact quantiles, across merges and a round trip."""
+    rng = random.Random(7)
+    first = [rng.gauss(60, 8) for _ in range(20000)]
+    second = [rng.gauss(50, 5) for _ in range(20000)]
+
+    merged = (
+        TDigest()
+        .extend(first)
+        .merge(TDigest.from_bytes(TDigest().extend(second).to_bytes()))
+    )
+
+    for q in (0.01, 0.5, 0.95, 0.99):
+        assert merged.quantile(q) == pytest.approx(exact(first + second, q), abs=0.5)
+    assert merged.count == 40000
+    assert len(merged.to_bytes()) < 8 * 1024
+
+
+def test_percentiles_over_monthly_sketches(test_db):
+    """Test that percentiles merge the sketches of the requested months."""
+    day = date(2024, 1, 1)
+    while day < date(2024, 3, 1):
+        DailyFact.create(day=day, steps=1000 if day.month == 1 else 9000)
+        day += timedelta(days=1)
+    start = datetime(2024, 2, 1, tzinfo=timezone.utc)
+    for minute in range(100):
+        SleepHeartRate.create(
+            sleep_period="period-1",
+            timestamp=start + timedelta(minutes=minute),
+            bpm=40 + minute,
+        )
+
+    assert rebuild_sketches() == 3
+    assert MetricSketch.select().count() == 3
+
+    assert percentile("steps", 50, date(2024, 1, 1), date(2024, 1, 31)) == 1000
+    assert percentile("steps", 90) == 9000
+    assert percentile("sleep_heart_rate", 95) == pytest.approx(134.5, abs=1)
+    assert percentile("sleep_hrv", 50) is None
+    with pytest.raises(ValueError):
+        percentile("nope", 50)
@@ -0,0 +1,172 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from src.models import (
+    DailySleep,
+    SleepHeartRate,
+    SleepHRV,
+    SleepPeriod,
+    SleepStageStats,
+)
+from src.sync import sleep_periods, sync_range, write_batches
+from src.sync.sleep_periods import decode_series, stage_statistics, sync_sleep_periods
+
+PERIOD = {
+    "id": "period-1",
+    "day": "2024-01-02",
+    "type": "long_sleep",
+    "bedtime_start": "2024-01-01T23:00:00-08:00",
+    "bedtime_end": "2024-01-02T00:00:00-08:00",
+    "average_hrv": 40,
+    "lowest_heart_rate": 48,
+    "heart_rate": {
+        "interval": 300,
+        "items": [None, 50, 48],
+        "timestamp": "2024-01-01T23:00:00.000-08:00",
+    },
+    "hrv": {
+        "interval": 300,
+        "items": [35, None, 41],
+        "timestamp": "2024-01-01T23:00:00.000-08:00",
+    },
+    "sleep_phase_5_min": "442211332244",
+}
+
+
+class StubAPI:
+    def __init__(self, periods):
+        self.periods = periods
+
+    def get_sleep_periods(self, start_date=None, end_date=None):
+        return self.periods
+
+    def get_daily_sleep(self, start_date=None, end_date=None):
+        return [
+            {
+                "sleep_summary_id": "daily-1",
+                "day": "2024-01-02",
+                "timestamp": datetime(2024, 1, 2, tzinfo=timezone.utc),
+                "periods": self.periods,
+            }
+        ]
+
+
+def test_decode_series_skips_missing_items():
+    """Test that series items are timed from the start in UTC."""
+    assert decode_series(PERIOD["heart_rate"]) == [
+        (datetime(2024, 1, 2, 7, 5, tzinfo=timezone.utc), 50),
+        (datetime(2024, 1, 2, 7, 10, tzinfo=timezone.utc), 48),
+    ]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_stage_statistics(monkeypatch, use_numpy):
+    """Test stage statistics with and without NumPy."""
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(sleep_periods, "np", None)
+
+    stats = stage_statistics(PERIOD["sleep_phase_5_min"])
+
+    assert stats == {
+        "deep_minutes": 10,
+        "light_minutes": 20,
+        "rem_minutes": 10,
+        "awake_minutes": 20,
+        "sleep_onset_minutes": 10,
+        "rem_latency_minutes": 20,
+        "stage_transitions": 5,
+        "awakenings": 0,
+        "longest_deep_minutes": 10,
+        "longest_awake_minutes": 10,
+    }
+    assert stage_statistics("2242")["awakenings"] == 1
+
+
+def test_sync_decodes_embedded_detail_once(test_db):
+    """Test that samples come from the document and are kept when unchanged."""
+    DailySleep.create(
+        sleep_summary_id="daily-1",
+        day=date(2024, 1, 2),
+        timestamp=datetime(2024, 1, 2, tzinfo=timezone.utc),
+    )
+
+    results = sync_sleep_periods(StubAPI([PERIOD]), "2024-01-02", "2024-01-02")
+
+    period = SleepPeriod.get()
+    assert period.sleep_summary_id == "daily-1"
+    assert period.hypnogram == PERIOD["sleep_phase_5_min"]
+    assert [s.bpm for s in SleepHeartRate.select()] == [50, 48]
+    assert [s.rmssd for s in SleepHRV.select()] == [35, 41]
+    assert SleepStageStats.get().rem_minutes == 10
+    assert results["sleep_periods"].inserted == ["period-1"]
+
+    results = sync_sleep_periods(StubAPI([PERIOD]), "2024-01-02", "2024-01-02")
+
+    assert results["sleep_periods"].unchanged == 1
+    assert SleepHeartRate.select().count() == 2
+
+
+def test_series_change_alone_rewrites_samples(test_db):
+    """Test that a period whose series changed gets its samples replaced."""
+    sync_sleep_periods(StubAPI([PERIOD]), "2024-01-02", "2024-01-02")
+    revised = {**PERIOD, "heart_rate": {**PERIOD["heart_rate"], "items": [55, 53]}}
+
+    results = sync_sleep_periods(StubAPI([revised]), "2024-01-02", "2024-01-02")
+
+    assert results["sleep_periods"].updated == ["period-1"]
+    assert [s.bpm for s in SleepHeartRate.select()] == [55, 53]
+    assert SleepHRV.select().count() == 2
+
+
+def test_period_is_linked_when_its_daily_sleep_arrives(test_db):
+    """Test that a period synced before its daily sleep is linked later."""
+    sync_sleep_periods(StubAPI([PERIOD]), "2024-01-02", "2024-01-02")
+    assert SleepPeriod.get().sleep_summary_id is None
+
+    write_batches(
+        [
+            (
+                DailySleep,
+                DailySleep.sleep_summary_id,
+                [
+                    {
+                        "sleep_summary_id": "daily-1",
+                        "day": date(2024, 1, 2),
+                        "timestamp": datetime(2024, 1, 2, tzinfo=timezone.utc),
+                    }
+                ],
+            )
+        ]
+    )
+
+    assert SleepPeriod.get().sleep_summary_id == "daily-1"
+
+
+def test_resync_of_both_endpoints_changes_nothing(test_db):
+    """Test that daily sleep and sleep periods do not rewrite each other."""
+    api = StubAPI([PERIOD])
+    for endpoint in ("daily_sleep", "sleep_periods"):
+        sync_range(api, endpoint, "2024-01-02", "2024-01-02")
+    assert SleepPeriod.get().sleep_summary_id == "daily-1"
+
+    for endpoint in ("daily_sleep", "sleep_periods"):
+        for result in sync_range(api, endpoint, "2024-01-02", "2024-01-02").values():
+            assert (result.inserted, result.updated) == ([], [])
+    assert SleepPeriod.get().sleep_summary_id == "daily-1"
+
+
+def test_period_gone_upstream_is_deleted_with_its_detail(test_db):
+    """Test that a resync without a period deletes it and its samples."""
+    api = StubAPI([PERIOD])
+    sync_range(api, "daily_sleep", "2024-01-02", "2024-01-02")
+    sync_range(api, "sleep_periods", "2024-01-02", "2024-01-02")
+
+    api.periods = []
+    results = sync_range(api, "sleep_periods", "2024-01-02", "2024-01-02")
+
+    assert results["sleep_periods"].deleted == ["period-1"]
+    for model in (SleepPeriod, SleepHeartRate, SleepHRV, SleepStageStats):
+        assert model.select().count() == 0
@@ -0,0 +1,56 @@
+from datetime import date, datetime
+
+from src.models import Workout
+from src.sync.writer import write_records
+
+
+def _workout(workout_id, calories):
+    return {
+        "workout_id": workout_id,
+        "activity": "running",
+        "calories": calories,
+        "day": "2024-01-01",
+        "start_datetime": datetime(2024, 1, 1, 10, 0),
+        "end_datetime": datetime(2024, 1, 1, 11, 0),
+        "source": "manual",
+    }
+
+
+def test_unchanged_rows_are_skipped(test_db):
+    """Test that re-writing identical rows performs no updates."""
+    rows = [_workout("w1", 300), _workout("w2", 400)]
+
+    first = write_records(Workout, rows)
+    second = write_records(Workout, rows)
+
+    assert sorted(first.inserted) == ["w1", "w2"]
+    assert second.inserted == []
+    assert second.updated == []
+    assert second.unchanged == 2
+
+
+def test_changed_rows_are_updated(test_db):
+    """Test that only rows whose content changed are rewritten."""
+    write_records(Workout, [_workout("w1", 300), _workout("w2", 400)])
+
+    result = write_records(Workout, [_workout("w1", 350), _workout("w2", 400)])
+
+    assert result.updated == ["w1"]
+    assert result.unchanged == 1
+    assert Workout.get_by_id("w1").calories == 350
+
+
+def test_rows_gone_upstream_are_deleted_within_the_days(test_db):
+    """Test that only missing rows of the synced days are deleted."""
+    earlier = {**_workout("w0", 200), "day": "2023-12-31"}
+    write_records(Workout, [earlier, _workout("w1", 300), _workout("w2", 400)])
+
+    result = write_records(
+        Workout, [_workout("w1", 300)], days=(date(2024, 1, 1), date(2024, 1, 1))
+    )
+
+    assert result.deleted == ["w2"]
+    assert result.deleted_days == {"w2": date(2024, 1, 1)}
+    assert result.unchanged == 1
+    assert sorted(w.workout_id for w in Workout.select()) == ["w0", "w1"]
+    assert write_records(Workout, [], days=(date(2024, 1, 1),) * 2).deleted == ["w1"]